@@ -1,20 +1,106 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, File, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from starlette.responses import HTMLResponse, RedirectResponse
+from starlette.responses import HTMLResponse, RedirectResponse, StreamingResponse
+from pydantic import ValidationError
 from uvicorn import run as app_run
+import numpy as np
 
-from typing import Optional
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
 
 # Importing constants and pipeline modules from the project
-from src.constants import APP_HOST, APP_PORT
-from src.pipline.prediction_pipeline import CreditCardDefaultData, CreditCardDefaultPredictor
-from src.pipline.training_pipeline import TrainPipeline
+from src.constants import (APP_HOST, APP_PORT, APP_WORKERS, APP_WORKERS_ENV_KEY, PREDICTION_CHUNK_SIZE,
+                           SHARED_MODEL_DIR, SHARED_MODEL_DIR_ENV_KEY, WARMUP_RETRY_SECONDS)
+from src.entity.config_entity import StreamAdmissionConfig
+from src.exception import MyException
+from src.logger import logging
+from src.entity.prediction_cache import get_prediction_cache
+from src.metrics import STAGE_LATENCY, registry, track_request
+from src.entity.request_schema import format_validation_error, parse_proba_request_json, parse_record, parse_records_json
+from src.pipline.prediction_pipeline import predict_records, score_records, warm_up
+from src.utils.http_utils import FastJSONResponse
+from src.pipline.batch_scoring import (SUPPORTED_OUTPUT_FORMATS, ChunkedFileScorer, detect_file_format,
+                                       iter_file_chunks)
+from src.pipline.admission import AdmissionController
+from src.pipline.executor import PipelineExecutor
+from src.pipline.micro_batching import MicroBatchScheduler
+from src.pipline.shadow_scoring import ShadowScorer
+from src.pipline.stream_scoring import NDJSONStreamScorer, RequestBodyStreamingResponse
+from src.pipline.training_jobs import TrainingJobManager
+
+# Thread/process pools that keep blocking prediction and training work off the event loop
+executor = PipelineExecutor()
+
+# Bounds concurrent prediction requests and sheds those that would miss their deadline
+admission = AdmissionController()
+# Separate pool for file and NDJSON stream scoring, which hold a slot for as long as they stream,
+# so a spike of uploads cannot take the slots of the short prediction routes
+stream_admission = AdmissionController(StreamAdmissionConfig(), name="stream")
+
+# Coalesces concurrent single-record form posts into one predict call
+micro_batcher = MicroBatchScheduler(executor=executor)
+
+# Runs training in a dedicated background process, one job at a time
+training_jobs = TrainingJobManager()
+
+# Replays live requests against a candidate model (SHADOW_MODEL_KEY) off the request path
+shadow_scorer = ShadowScorer()
+
+class ServiceReadiness:
+    """
+    Readiness state of the prediction service, set once the startup warm-up has succeeded.
+    """
+    def __init__(self):
+        self.ready: bool = False
+        self.model_version: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.attempts: int = 0
+        self.started_at: float = time.time()
+        self.ready_at: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"ready": self.ready, "model_version": self.model_version, "attempts": self.attempts,
+                "last_error": self.last_error,
+                "warmup_seconds": self.ready_at - self.started_at if self.ready_at else None}
+
+readiness = ServiceReadiness()
+
+async def warm_up_service():
+    """
+    Preloads the production model and runs synthetic predictions on the prediction executor,
+    retrying until it succeeds (e.g. while no model has been pushed yet).
+    """
+    while not readiness.ready:
+        readiness.attempts += 1
+        try:
+            readiness.model_version = await executor.run_prediction(warm_up)
+            readiness.ready_at = time.time()
+            readiness.last_error = None
+            readiness.ready = True
+        except Exception as e:
+            logging.error(f"Warm-up attempt {readiness.attempts} failed: {e}")
+            # The probe response only says what kind of error it was, details are in the logs
+            readiness.last_error = type(e).__name__
+            await asyncio.sleep(WARMUP_RETRY_SECONDS)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background so the server starts accepting liveness probes right away
+    warmup_task = asyncio.create_task(warm_up_service())
+    yield
+    warmup_task.cancel()
+    shadow_scorer.shutdown()
+    training_jobs.shutdown()
+    executor.shutdown()
 
 # Initialize FastAPI application
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # Mount the 'static' directory for serving static files (like CSS)
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -37,116 +123,240 @@ app.add_middleware(
 class DataForm:
     """
     DataForm class to handle and process incoming form data for credit default prediction.
+    All fields are validated and coerced in one pass by the CreditCardRecord model generated from
+    config/schema.yaml, so malformed input is rejected before any prediction work.
     """
     def __init__(self, request: Request):
         self.request: Request = request
-        self.LIMIT_BAL: Optional[int] = None
-        self.SEX: Optional[int] = None
-        self.EDUCATION: Optional[int] = None
-        self.MARRIAGE: Optional[int] = None
-        self.AGE: Optional[int] = None
-        self.PAY_0: Optional[int] = None
-        self.PAY_2: Optional[int] = None
-        self.PAY_3: Optional[int] = None
-        self.PAY_4: Optional[int] = None
-        self.PAY_5: Optional[int] = None
-        self.PAY_6: Optional[int] = None
-        self.BILL_AMT1: Optional[float] = None
-        self.BILL_AMT2: Optional[float] = None
-        self.BILL_AMT3: Optional[float] = None
-        self.BILL_AMT4: Optional[float] = None
-        self.BILL_AMT5: Optional[float] = None
-        self.BILL_AMT6: Optional[float] = None
-        self.PAY_AMT1: Optional[float] = None
-        self.PAY_AMT2: Optional[float] = None
-        self.PAY_AMT3: Optional[float] = None
-        self.PAY_AMT4: Optional[float] = None
-        self.PAY_AMT5: Optional[float] = None
-        self.PAY_AMT6: Optional[float] = None
+        self.record: Optional[Dict[str, Any]] = None
 
     async def get_credit_data(self):
         """
-        Method to retrieve and assign form data to class attributes.
+        Method to retrieve and validate the form data. Raises pydantic.ValidationError.
         """
         form = await self.request.form()
-        self.LIMIT_BAL = form.get("LIMIT_BAL")
-        self.SEX = form.get("SEX")
-        self.EDUCATION = form.get("EDUCATION")
-        self.MARRIAGE = form.get("MARRIAGE")
-        self.AGE = form.get("AGE")
-        self.PAY_0 = form.get("PAY_0")
-        self.PAY_2 = form.get("PAY_2")
-        self.PAY_3 = form.get("PAY_3")
-        self.PAY_4 = form.get("PAY_4")
-        self.PAY_5 = form.get("PAY_5")
-        self.PAY_6 = form.get("PAY_6")
-        self.BILL_AMT1 = form.get("BILL_AMT1")
-        self.BILL_AMT2 = form.get("BILL_AMT2")
-        self.BILL_AMT3 = form.get("BILL_AMT3")
-        self.BILL_AMT4 = form.get("BILL_AMT4")
-        self.BILL_AMT5 = form.get("BILL_AMT5")
-        self.BILL_AMT6 = form.get("BILL_AMT6")
-        self.PAY_AMT1 = form.get("PAY_AMT1")
-        self.PAY_AMT2 = form.get("PAY_AMT2")
-        self.PAY_AMT3 = form.get("PAY_AMT3")
-        self.PAY_AMT4 = form.get("PAY_AMT4")
-        self.PAY_AMT5 = form.get("PAY_AMT5")
-        self.PAY_AMT6 = form.get("PAY_AMT6")
+        self.record = parse_record(dict(form))
+
+    def as_record(self) -> Dict[str, Any]:
+        """
+        Returns the validated form fields as a record for the pandas-free prediction path.
+        """
+        return self.record
+
+def validation_error_response(error: ValidationError) -> FastJSONResponse:
+    return FastJSONResponse({"status": False, "error": "Invalid input",
+                             "details": format_validation_error(error)}, status_code=422)
+
+def input_error_response(message: str) -> FastJSONResponse:
+    return FastJSONResponse({"status": False, "error": message}, status_code=422)
+
+def error_response(route: str, error: Exception) -> FastJSONResponse:
+    """
+    Logs a failed request and returns the error payload without the exception text, which carries
+    server file paths and internals.
+    """
+    logging.error(f"Request to {route} failed: {error}")
+    return FastJSONResponse({"status": False, "error": "Internal error, the request could not be processed"},
+                            status_code=500)
 
 @app.get("/", tags=["authentication"])
 async def index(request: Request):
-    return templates.TemplateResponse("creditdata.html", {"request": request})
+    return templates.TemplateResponse(request, "creditdata.html", {"request": request})
 
 @app.get("/train")
+@track_request("train")
 async def trainRouteClient():
+    """
+    Queues a training run and returns its job id right away. While a run is queued or in progress
+    the existing job is returned instead of starting another one.
+    """
     try:
-        train_pipeline = TrainPipeline()
-        train_pipeline.run_pipeline()
-        return Response("Training successful!!!")
+        job, deduplicated = training_jobs.submit()
+        return {"job_id": job.job_id, "status": job.status, "deduplicated": deduplicated}
 
     except Exception as e:
-        return Response(f"Error Occurred! {e}")
+        return error_response("train", e)
+
+@app.get("/train/{job_id}")
+@track_request("train_status")
+async def trainStatusRouteClient(job_id: str):
+    """
+    Reports the status, current stage, elapsed time and stage artifacts of a training job.
+    """
+    job = training_jobs.get(job_id)
+    if job is None:
+        return {"status": False, "error": f"Unknown training job {job_id}"}
+    return job.as_dict()
 
 @app.post("/")
+@track_request("predict_form")
+@admission.limit("predict_form")
 async def predictRouteClient(request: Request):
     try:
         form = DataForm(request)
-        await form.get_credit_data()
-
-        credit_data = CreditCardDefaultData(
-            LIMIT_BAL=form.LIMIT_BAL,
-            SEX=form.SEX,
-            EDUCATION=form.EDUCATION,
-            MARRIAGE=form.MARRIAGE,
-            AGE=form.AGE,
-            PAY_0=form.PAY_0,
-            PAY_2=form.PAY_2,
-            PAY_3=form.PAY_3,
-            PAY_4=form.PAY_4,
-            PAY_5=form.PAY_5,
-            PAY_6=form.PAY_6,
-            BILL_AMT1=form.BILL_AMT1,
-            BILL_AMT2=form.BILL_AMT2,
-            BILL_AMT3=form.BILL_AMT3,
-            BILL_AMT4=form.BILL_AMT4,
-            BILL_AMT5=form.BILL_AMT5,
-            BILL_AMT6=form.BILL_AMT6,
-            PAY_AMT1=form.PAY_AMT1,
-            PAY_AMT2=form.PAY_AMT2,
-            PAY_AMT3=form.PAY_AMT3,
-            PAY_AMT4=form.PAY_AMT4,
-            PAY_AMT5=form.PAY_AMT5,
-            PAY_AMT6=form.PAY_AMT6
-        )
-
-        credit_df = credit_data.get_input_data_frame()
-        model_predictor = CreditCardDefaultPredictor()
-        value = model_predictor.predict(dataframe=credit_df)[0]
+        with STAGE_LATENCY.time(stage="form_parse"):
+            try:
+                await form.get_credit_data()
+            except ValidationError as e:
+                return validation_error_response(e)
+
+        record = form.as_record()
+        value = (await micro_batcher.predict([record]))[0]
+        shadow_scorer.submit([record], [value])
         status = "Default" if value == 1 else "No Default"
 
-        return templates.TemplateResponse("creditdata.html", {"request": request, "context": status})
+        return templates.TemplateResponse(request, "creditdata.html", {"request": request, "context": status})
+    except Exception as e:
+        return error_response("predict_form", e)
+
+@app.post("/predict/batch")
+@track_request("predict_batch")
+@admission.limit("predict_batch")
+async def batchPredictRouteClient(request: Request):
+    """
+    Scores a JSON array of records as a single batch and returns a JSON array of labels (1 = default).
+    """
+    try:
+        with STAGE_LATENCY.time(stage="json_parse"):
+            try:
+                records = parse_records_json(await request.body())
+            except ValidationError as e:
+                return validation_error_response(e)
+        if not records:
+            return FastJSONResponse([])
+        predictions = await executor.run_prediction(predict_records, records)
+        shadow_scorer.submit(records, predictions)
+        # The forest's classes are floats; the response contract is integer labels
+        return FastJSONResponse(np.asarray(predictions).astype(np.int64))
     except Exception as e:
-        return {"status": False, "error": f"{e}"}
+        return error_response("predict_batch", e)
+
+@app.post("/predict/proba")
+@track_request("predict_proba")
+@admission.limit("predict_proba")
+async def probaPredictRouteClient(request: Request):
+    """
+    Returns the probability of default for each record and a 0/1 decision per threshold, all from
+    one evaluation of the forest. Body: {"records": [...], "thresholds": [0.3, 0.5, 0.7]}
+    """
+    try:
+        with STAGE_LATENCY.time(stage="json_parse"):
+            try:
+                records, thresholds = parse_proba_request_json(await request.body())
+            except ValidationError as e:
+                return validation_error_response(e)
+        if not records:
+            return FastJSONResponse({"thresholds": thresholds, "probabilities": [], "decisions": []})
+        probabilities, decisions = await executor.run_prediction(score_records, records, thresholds)
+        return FastJSONResponse({"thresholds": thresholds,
+                                 "probabilities": probabilities,
+                                 "decisions": decisions})
+    except Exception as e:
+        return error_response("predict_proba", e)
+
+@app.post("/predict/file")
+@track_request("predict_file")
+@stream_admission.limit("predict_file", streaming=True)
+async def filePredictRouteClient(request: Request, file: UploadFile = File(...), output_format: str = "csv",
+                                 chunk_size: int = PREDICTION_CHUNK_SIZE):
+    """
+    Scores an uploaded CSV or Parquet file in fixed-size chunks and streams the predictions back
+    as CSV or NDJSON (output_format=csv|ndjson).
+    """
+    try:
+        try:
+            input_format = detect_file_format(file.filename)
+        except ValueError as e:
+            return input_error_response(f"{e}")
+        if output_format not in SUPPORTED_OUTPUT_FORMATS:
+            return input_error_response(f"Unsupported output format '{output_format}', "
+                                        f"expected one of {SUPPORTED_OUTPUT_FORMATS}")
+        scorer = ChunkedFileScorer()
+        try:
+            chunks = await executor.run_io(
+                scorer.peek, iter_file_chunks(file.file, file_format=input_format, chunk_size=chunk_size))
+        except MyException as e:
+            # peek raises the column check's own ValueError (no internals in its message) as the cause
+            if isinstance(e.__cause__, ValueError):
+                return input_error_response(f"{e.__cause__}")
+            raise
+        body = scorer.iter_output(chunks, output_format=output_format)
+        media_type = "text/csv" if output_format == "csv" else "application/x-ndjson"
+        return StreamingResponse(body, media_type=media_type)
+    except Exception as e:
+        return error_response("predict_file", e)
+
+@app.post("/predict/stream")
+@track_request("predict_stream")
+@stream_admission.limit("predict_stream", streaming=True)
+async def streamPredictRouteClient(request: Request):
+    """
+    Scores newline-delimited JSON records from the request body in rolling micro-batches and
+    streams back one NDJSON result line per input line as soon as its batch is scored.
+    """
+    try:
+        scorer = NDJSONStreamScorer(executor=executor)
+        return RequestBodyStreamingResponse(scorer.score(request.stream()), media_type="application/x-ndjson")
+    except Exception as e:
+        return error_response("predict_stream", e)
+
+@app.get("/health/live")
+async def livenessRouteClient():
+    """
+    Liveness probe: the process is up and the event loop is responsive.
+    """
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readinessRouteClient():
+    """
+    Readiness probe: 200 once the model is loaded and warmed up, 503 until then.
+    """
+    return JSONResponse(readiness.as_dict(), status_code=200 if readiness.ready else 503)
+
+@app.get("/metrics")
+async def metricsRouteClient():
+    """
+    Prometheus text-format metrics of this process: per-stage latency histograms, request counters
+    by outcome, model loads and the model version being served.
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/stats/batching")
+async def batchingStatsRouteClient():
+    """
+    Reports the batch sizes achieved by the single-record micro-batching scheduler.
+    """
+    return micro_batcher.stats.as_dict()
+
+@app.get("/stats/cache")
+async def cacheStatsRouteClient():
+    """
+    Reports hit/miss counters of the prediction result cache in this process.
+    """
+    return get_prediction_cache().as_dict()
+
+@app.get("/stats/admission")
+async def admissionStatsRouteClient():
+    """
+    Reports in-flight and waiting prediction requests, the service time estimate used for
+    deadline checks and how many requests were shed, by reason, for each admission pool.
+    """
+    return {"predict": admission.as_dict(), "stream": stream_admission.as_dict()}
+
+@app.get("/stats/shadow")
+async def shadowStatsRouteClient():
+    """
+    Reports how often the candidate model agrees with production, and how many shadowed
+    requests were dropped because the candidate could not keep up.
+    """
+    return {"enabled": shadow_scorer.enabled, **shadow_scorer.stats.as_dict()}
 
 if __name__ == "__main__":
-    app_run(app, host=APP_HOST, port=APP_PORT)
+    workers = int(os.getenv(APP_WORKERS_ENV_KEY, APP_WORKERS))
+    if workers > 1:
+        # Workers share one memory-mapped copy of the model instead of unpickling one each
+        os.environ.setdefault(SHARED_MODEL_DIR_ENV_KEY, SHARED_MODEL_DIR)
+        app_run("app:app", host=APP_HOST, port=APP_PORT, workers=workers)
+    else:
+        app_run(app, host=APP_HOST, port=APP_PORT)
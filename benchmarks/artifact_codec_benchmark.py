@@ -0,0 +1,67 @@
+"""
+Compares the model artifact codecs: file size, time to save (pickle and compress) and time to load
+(decompress and unpickle) a stand-in MyModel.
+
+Every codec installed here is measured: "none" (the memory-mappable format), zlib and lzma, and
+lz4 and zstd when those packages are installed ("fast" and "high" resolve to them). A plain dill
+file is included as the baseline. Times are the best of --repeats runs.
+
+Usage (from the repository root):
+    python -m benchmarks.artifact_codec_benchmark --n-estimators 500 --train-rows 50000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import train_standin_model
+from src.utils.artifact_utils import lz4, resolve_codec, zstandard
+from src.utils.main_utils import load_object, save_object
+
+
+def measure(model: object, file_path: str, artifact_format: str, codec: str, repeats: int) -> dict:
+    save_seconds, load_seconds = [], []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        save_object(file_path, model, artifact_format=artifact_format, codec=codec)
+        save_seconds.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        load_object(file_path)
+        load_seconds.append(time.perf_counter() - start)
+    return {"format": artifact_format, "codec": codec, "size_mb": os.path.getsize(file_path) / 1024 ** 2,
+            "save_seconds": min(save_seconds), "load_seconds": min(load_seconds)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n-estimators", type=int, default=500)
+    parser.add_argument("--max-depth", type=int, default=20)
+    parser.add_argument("--train-rows", type=int, default=50000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="artifact_codec_benchmark_")
+    model = train_standin_model(n_rows=args.train_rows, n_estimators=args.n_estimators,
+                                max_depth=args.max_depth, work_dir=work_dir)
+    codecs = ["none", "zlib", "lzma"] + (["lz4"] if lz4 is not None else []) + (["zstd"] if zstandard is not None else [])
+    runs = [("dill", "none")] + [("mmap", codec) for codec in codecs]
+    results = [measure(model, os.path.join(work_dir, f"model_{artifact_format}_{codec}.pkl"),
+                       artifact_format, codec, args.repeats) for artifact_format, codec in runs]
+
+    baseline_mb = results[0]["size_mb"]
+    print(f"fast -> {resolve_codec('fast')}, high -> {resolve_codec('high')}")
+    print(f"{'format':>7} {'codec':>6} {'size MB':>8} {'ratio':>6} {'save s':>7} {'load s':>7}")
+    for result in results:
+        print(f"{result['format']:>7} {result['codec']:>6} {result['size_mb']:>8.1f} "
+              f"{baseline_mb / result['size_mb']:>6.2f} {result['save_seconds']:>7.3f} {result['load_seconds']:>7.3f}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"n_estimators": args.n_estimators, "max_depth": args.max_depth,
+                       "train_rows": args.train_rows, "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmarks the array-packed forest engine against sklearn's RandomForestClassifier.predict.
+
+Usage (from the repository root):
+    python -m benchmarks.forest_engine_benchmark --n-estimators 500 --max-depth 20
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_synthetic_data, train_standin_model
+from src.entity.feature_encoder import OneHotFeatureEncoder
+from src.entity.forest_engine import PackedForest
+from src.pipline.prediction_pipeline import CreditCardDefaultPredictor
+
+BATCH_SIZES = (1, 32, 1000, 100000)
+
+
+def best_time(func, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n-estimators", type=int, default=500)
+    parser.add_argument("--max-depth", type=int, default=20)
+    parser.add_argument("--train-rows", type=int, default=10000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=list(BATCH_SIZES))
+    parser.add_argument("--output", help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    model = train_standin_model(n_rows=args.train_rows, n_estimators=args.n_estimators, max_depth=args.max_depth)
+    forest = model.trained_model_object
+    packed_forest = PackedForest.from_sklearn(forest)
+
+    predictor = CreditCardDefaultPredictor()
+    encoder = OneHotFeatureEncoder(feature_columns=model.get_feature_columns())
+    raw = make_synthetic_data(max(args.batch_sizes), seed=1, with_target=False)
+    raw = predictor._replace_values_in_features(predictor._drop_id_column(raw))
+    features = model.preprocessing_object.transform(
+        pd.DataFrame(encoder.transform(raw), columns=encoder.feature_columns))
+
+    results = []
+    print(f"{'batch':>8} {'sklearn ms':>12} {'packed ms':>12} {'speedup':>8} {'identical':>10}")
+    for batch_size in args.batch_sizes:
+        batch = features[:batch_size]
+        repeats = 20 if batch_size <= 1000 else 3
+        identical = bool(np.array_equal(forest.predict(batch), packed_forest.predict(batch)))
+        sklearn_seconds = best_time(lambda: forest.predict(batch), repeats)
+        packed_seconds = best_time(lambda: packed_forest.predict(batch), repeats)
+        results.append({"batch_size": batch_size, "sklearn_ms": sklearn_seconds * 1000,
+                        "packed_ms": packed_seconds * 1000, "speedup": sklearn_seconds / packed_seconds,
+                        "identical": identical})
+        print(f"{batch_size:>8} {sklearn_seconds * 1000:>12.3f} {packed_seconds * 1000:>12.3f} "
+              f"{sklearn_seconds / packed_seconds:>8.2f} {str(identical):>10}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"n_estimators": args.n_estimators, "max_depth": args.max_depth,
+                       "node_count": packed_forest.n_nodes, "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
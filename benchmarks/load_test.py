@@ -0,0 +1,172 @@
+"""
+Load test for app.py, run in-process against a locally trained stand-in model.
+
+The app is driven through httpx's ASGI transport (no network, no S3, no MongoDB): a MyModel is
+trained on synthetic data, served from a local directory through LocalModelStorage, and each
+scenario is run at every requested concurrency level. Latency percentiles and throughput are
+printed and, with --output, written as JSON so runs on different commits can be compared.
+
+Usage (from the repository root):
+    python -m benchmarks.load_test --concurrency 1 8 32 --requests 500 --output results.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import numpy as np
+import sklearn
+
+from benchmarks.local_storage import LocalModelStorage
+from benchmarks.synthetic import make_synthetic_data, train_standin_model
+from src.constants import MODEL_BUCKET_NAME, MODEL_FILE_NAME
+from src.entity.config_entity import CreditCardDefaultPredictorConfig
+from src.entity.model_holder import get_model_holder
+from src.pipline.prediction_pipeline import CreditCardDefaultPredictor
+
+SCENARIOS = ("form", "batch", "proba")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def is_error(response: httpx.Response) -> bool:
+    if response.status_code != 200:
+        return True
+    if response.headers.get("content-type", "").startswith("application/json"):
+        body = response.json()
+        return isinstance(body, dict) and body.get("status") is False
+    return False
+
+
+def build_request(scenario: str, records: list, index: int, batch_size: int, thresholds: list) -> dict:
+    if scenario == "form":
+        record = records[index % len(records)]
+        return {"method": "POST", "url": "/", "data": {key: str(value) for key, value in record.items()}}
+    start = (index * batch_size) % len(records)
+    batch = (records[start:] + records[:start])[:batch_size]
+    if scenario == "batch":
+        return {"method": "POST", "url": "/predict/batch", "json": batch}
+    return {"method": "POST", "url": "/predict/proba", "json": {"records": batch, "thresholds": thresholds}}
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: str, concurrency: int, n_requests: int,
+                       records: list, batch_size: int, thresholds: list) -> dict:
+    latencies, errors = [], 0
+    next_index = iter(range(n_requests))
+
+    async def worker():
+        nonlocal errors
+        for index in next_index:
+            request = build_request(scenario, records, index, batch_size, thresholds)
+            start = time.perf_counter()
+            response = await client.request(**request)
+            latencies.append(time.perf_counter() - start)
+            errors += is_error(response)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.asarray(latencies) * 1000
+    rows_per_request = 1 if scenario == "form" else batch_size
+    return {
+        "scenario": scenario,
+        "concurrency": concurrency,
+        "requests": n_requests,
+        "rows_per_request": rows_per_request,
+        "errors": int(errors),
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p95_ms": float(np.percentile(latencies_ms, 95)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+        "mean_ms": float(latencies_ms.mean()),
+        "requests_per_second": n_requests / elapsed,
+        "rows_per_second": n_requests * rows_per_request / elapsed,
+    }
+
+
+async def run(args, app_module) -> list:
+    app = app_module.app
+    records = make_synthetic_data(args.records, seed=args.seed, with_target=False).drop(columns=["ID"])
+    records = records.to_dict(orient="records")
+    transport = httpx.ASGITransport(app=app)
+    results = []
+    async with app.router.lifespan_context(app):
+        while not app_module.readiness.ready:
+            await asyncio.sleep(0.05)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+            for scenario in args.scenarios:
+                for concurrency in args.concurrency:
+                    # Short warm-up so first-call costs do not land in the percentiles
+                    await run_scenario(client, scenario, concurrency, min(args.requests, 2 * concurrency),
+                                       records, args.batch_size, args.thresholds)
+                    result = await run_scenario(client, scenario, concurrency, args.requests, records,
+                                                args.batch_size, args.thresholds)
+                    results.append(result)
+                    print(f"{scenario:>6} c={concurrency:<4} p50={result['p50_ms']:8.2f}ms "
+                          f"p95={result['p95_ms']:8.2f}ms p99={result['p99_ms']:8.2f}ms "
+                          f"{result['requests_per_second']:9.1f} req/s {result['rows_per_second']:10.1f} rows/s "
+                          f"errors={result['errors']}")
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=500, help="Measured requests per scenario and concurrency")
+    parser.add_argument("--batch-size", type=int, default=32, help="Records per batch/proba request")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=[0.3, 0.5, 0.7])
+    parser.add_argument("--records", type=int, default=5000, help="Distinct synthetic records to cycle through")
+    parser.add_argument("--n-estimators", type=int, default=500)
+    parser.add_argument("--max-depth", type=int, default=20)
+    parser.add_argument("--train-rows", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="load_test_")
+    model = train_standin_model(n_rows=args.train_rows, n_estimators=args.n_estimators,
+                                max_depth=args.max_depth, work_dir=work_dir)
+    storage = LocalModelStorage(os.path.join(work_dir, "storage"))
+    storage.put_model(model, MODEL_BUCKET_NAME, MODEL_FILE_NAME)
+    del model
+
+    # Register the holder the app will use before it is imported, so it loads from local storage
+    predictor_config = CreditCardDefaultPredictorConfig()
+    get_model_holder(bucket_name=predictor_config.model_bucket_name, model_path=predictor_config.model_file_path,
+                     reload_interval_seconds=0, inference_engine=predictor_config.inference_engine,
+                     shared_model_dir=predictor_config.shared_model_dir,
+                     shared_model_sklearn_fallback=predictor_config.shared_model_sklearn_fallback,
+                     replace_values=CreditCardDefaultPredictor(predictor_config)._replace_values_in_features,
+                     storage=storage)
+    import app as app_module
+
+    results = asyncio.run(run(args, app_module))
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({
+                "commit": git_commit(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "sklearn": sklearn.__version__,
+                "parameters": {key: value for key, value in vars(args).items() if key != "output"},
+                "results": results,
+            }, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Local-directory stand-in for SimpleStorageService, so benchmarks can serve a model without S3.
+"""
+import os
+
+from src.utils.main_utils import load_object, save_object
+
+
+class LocalModelStorage:
+    """
+    Implements the parts of the SimpleStorageService interface the serving path uses, reading
+    objects from root_dir/<bucket_name>/<key>.
+    """
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+
+    def _path(self, bucket_name: str, s3_key: str) -> str:
+        return os.path.join(self.root_dir, bucket_name, s3_key)
+
+    def put_model(self, model: object, bucket_name: str, s3_key: str) -> None:
+        save_object(self._path(bucket_name, s3_key), model)
+
+    def s3_key_path_available(self, bucket_name, s3_key) -> bool:
+        return os.path.exists(self._path(bucket_name, s3_key))
+
+    def get_object_version(self, bucket_name: str, s3_key: str):
+        path = self._path(bucket_name, s3_key)
+        if not os.path.exists(path):
+            return None
+        stat = os.stat(path)
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def load_model(self, model_name: str, bucket_name: str, model_dir: str = None, mmap_mode: str = None) -> object:
+        model_file = model_dir + "/" + model_name if model_dir else model_name
+        return load_object(self._path(bucket_name, model_file), mmap_mode=mmap_mode)
@@ -0,0 +1,116 @@
+"""
+Measures the time and peak memory of loading a model artifact the ways a server can:
+
+- bytes:  the whole object read into memory and unpickled from the bytes (the former S3 path)
+- dill:   a plain dill pickle unpickled straight from the file
+- mmap:   an artifact_format="mmap" file with its arrays memory-mapped read-only
+- packed: as mmap, for a model whose packed inference engine was built before saving
+
+Each mode runs in a fresh process. The peak RSS mark is reset after the imports, so the peak
+reported is the growth of the process during the load, including any transient copy made on the
+way. sklearn trees copy their arrays when they are unpickled, so for them mmap mostly saves the
+extra in-memory copy of the file; the PackedForest arrays stay mapped and are only paged in as
+predictions touch them. Linux only (reads /proc).
+
+Usage (from the repository root):
+    python -m benchmarks.model_load_benchmark --n-estimators 500 --train-rows 50000
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import pickle
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import train_standin_model
+from src.utils.main_utils import load_object, save_object
+
+LOAD_MODES = ("bytes", "dill", "mmap", "packed")
+
+
+def read_memory_kb() -> dict:
+    memory = {}
+    with open("/proc/self/status") as file:
+        for line in file:
+            if line.startswith(("VmRSS:", "VmHWM:")):
+                memory[line.split(":")[0]] = int(line.split()[1])
+    return memory
+
+
+def reset_peak_rss() -> None:
+    # Writing 5 to clear_refs resets VmHWM, the peak RSS, to the current RSS
+    with open("/proc/self/clear_refs", "w") as file:
+        file.write("5")
+
+
+def worker(mode: str, model_path: str, n_rows: int, results) -> None:
+    reset_peak_rss()
+    baseline_kb = read_memory_kb()["VmRSS"]
+    start = time.perf_counter()
+    if mode == "bytes":
+        with open(model_path, "rb") as file:
+            model = pickle.loads(file.read())
+    elif mode == "dill":
+        model = load_object(model_path)
+    else:
+        model = load_object(model_path, mmap_mode="r")
+    load_seconds = time.perf_counter() - start
+    after_load = read_memory_kb()
+
+    features = np.random.default_rng(0).normal(size=(n_rows, len(model.get_feature_columns())))
+    start = time.perf_counter()
+    model.predict_features(features)
+    predict_seconds = time.perf_counter() - start
+    results.put({"mode": mode, "file_mb": os.path.getsize(model_path) / 1024 / 1024,
+                 "load_seconds": load_seconds, "predict_seconds": predict_seconds,
+                 "load_rss_mb": (after_load["VmRSS"] - baseline_kb) / 1024,
+                 "peak_load_rss_mb": (after_load["VmHWM"] - baseline_kb) / 1024})
+
+
+def run_mode(mode: str, model_path: str, n_rows: int) -> dict:
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=worker, args=(mode, model_path, n_rows, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n-estimators", type=int, default=500)
+    parser.add_argument("--max-depth", type=int, default=20)
+    parser.add_argument("--train-rows", type=int, default=50000)
+    parser.add_argument("--predict-rows", type=int, default=100)
+    parser.add_argument("--output", help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="model_load_benchmark_")
+    model = train_standin_model(n_rows=args.train_rows, n_estimators=args.n_estimators,
+                                max_depth=args.max_depth, work_dir=work_dir)
+    model_paths = {mode: os.path.join(work_dir, f"model_{mode}.pkl") for mode in LOAD_MODES}
+    save_object(model_paths["bytes"], model)
+    save_object(model_paths["dill"], model)
+    save_object(model_paths["mmap"], model, artifact_format="mmap")
+    model.set_inference_engine("packed")
+    save_object(model_paths["packed"], model, artifact_format="mmap")
+    del model
+
+    results = [run_mode(mode, model_paths[mode], args.predict_rows) for mode in LOAD_MODES]
+    print(f"{'mode':>8} {'file MB':>8} {'load s':>8} {'predict s':>10} {'rss after load':>15} {'peak during load':>17}  (MB)")
+    for result in results:
+        print(f"{result['mode']:>8} {result['file_mb']:>8.1f} {result['load_seconds']:>8.3f} "
+              f"{result['predict_seconds']:>10.4f} {result['load_rss_mb']:>15.1f} {result['peak_load_rss_mb']:>17.1f}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"n_estimators": args.n_estimators, "max_depth": args.max_depth,
+                       "train_rows": args.train_rows, "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
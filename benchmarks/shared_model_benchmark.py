@@ -0,0 +1,156 @@
+"""
+Measures per-worker memory and prediction throughput when every worker unpickles its own model
+versus when workers share one memory-mapped copy through SharedModelStore:
+
+- pickle:        every worker unpickles the whole model (APP_WORKERS=1 behaviour, per worker)
+- shared:        SharedModelStore default, packed forest shared and the sklearn forest loaded by a
+                 worker the first time it gets a batch above PACKED_FOREST_MAX_BATCH_ROWS
+- shared-packed: SharedModelStore(sklearn_fallback=False), every batch on the shared packed forest
+
+Each worker first scores small batches (--predict-rows), then large ones (--large-batch-rows, the
+/predict/file chunk size by default); memory is measured after each phase, so the table shows what
+the workers cost on small-batch traffic alone and once they have served large batches. Times are
+the best of --repeats predict_features calls.
+
+RSS counts shared pages in full for every process, so the proportional set size (PSS, shared pages
+divided among the processes mapping them) is reported as well; the PSS total across workers is the
+memory the workers actually cost together. Linux only (reads /proc).
+
+Usage (from the repository root):
+    python -m benchmarks.shared_model_benchmark --workers 4 --n-estimators 500
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import train_standin_model
+from src.entity.shared_model import SharedModelStore
+from src.utils.main_utils import load_object, save_object
+
+MODEL_VERSION = "benchmark"
+SHARED_MODES = {"shared": True, "shared-packed": False}
+
+
+def read_memory_kb() -> dict:
+    memory = {}
+    with open("/proc/self/status") as file:
+        for line in file:
+            if line.startswith("VmRSS:"):
+                memory["rss_kb"] = int(line.split()[1])
+    with open("/proc/self/smaps_rollup") as file:
+        for line in file:
+            if line.startswith("Pss:"):
+                memory["pss_kb"] = int(line.split()[1])
+    return memory
+
+
+def time_predict(model: object, n_rows: int, repeats: int) -> float:
+    features = np.random.default_rng(os.getpid()).normal(size=(n_rows, len(model.get_feature_columns())))
+    seconds = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        model.predict_features(features)
+        seconds.append(time.perf_counter() - start)
+    return min(seconds)
+
+
+def worker(mode: str, model_path: str, shared_dir: str, n_rows: int, large_batch_rows: int, repeats: int,
+           barrier, results) -> None:
+    report = {"before": read_memory_kb()}
+    if mode == "pickle":
+        model = load_object(model_path)
+    else:
+        model = SharedModelStore(shared_dir, sklearn_fallback=SHARED_MODES[mode]).load(MODEL_VERSION)
+    report["after_load"] = read_memory_kb()
+
+    # Measure PSS while every worker has the model mapped, so shared pages are split between them
+    report["small_batch_seconds"] = time_predict(model, n_rows, repeats)
+    barrier.wait()
+    report["after_small_batches"] = read_memory_kb()
+    barrier.wait()
+    report["large_batch_seconds"] = time_predict(model, large_batch_rows, repeats)
+    barrier.wait()
+    report["after_large_batches"] = read_memory_kb()
+    results.put(report)
+    barrier.wait()
+
+
+def run_mode(mode: str, workers: int, model_path: str, shared_dir: str, n_rows: int, large_batch_rows: int,
+             repeats: int) -> dict:
+    context = multiprocessing.get_context("spawn")
+    barrier, results = context.Barrier(workers), context.Queue()
+    processes = [context.Process(target=worker, args=(mode, model_path, shared_dir, n_rows, large_batch_rows,
+                                                      repeats, barrier, results))
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    def mean_mb(stage: str, key: str) -> float:
+        return float(np.mean([report[stage][key] for report in reports])) / 1024
+
+    def total_mb(stage: str, key: str) -> float:
+        return sum(report[stage][key] for report in reports) / 1024
+
+    return {
+        "mode": mode,
+        "workers": workers,
+        "rss_before_mb": mean_mb("before", "rss_kb"),
+        "rss_after_load_mb": mean_mb("after_load", "rss_kb"),
+        "pss_total_small_batches_mb": total_mb("after_small_batches", "pss_kb"),
+        "pss_total_large_batches_mb": total_mb("after_large_batches", "pss_kb"),
+        # Workers time their batches concurrently, so these include contention for the cores
+        "small_batch_ms": float(np.median([report["small_batch_seconds"] for report in reports])) * 1000,
+        "large_batch_ms": float(np.median([report["large_batch_seconds"] for report in reports])) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--n-estimators", type=int, default=500)
+    parser.add_argument("--max-depth", type=int, default=20)
+    parser.add_argument("--train-rows", type=int, default=10000)
+    parser.add_argument("--predict-rows", type=int, default=100)
+    parser.add_argument("--large-batch-rows", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="shared_model_benchmark_")
+    model = train_standin_model(n_rows=args.train_rows, n_estimators=args.n_estimators,
+                                max_depth=args.max_depth, work_dir=work_dir)
+    model_path = os.path.join(work_dir, "model.pkl")
+    save_object(model_path, model)
+    shared_dir = os.path.join(work_dir, "shared_model")
+    SharedModelStore(shared_dir).export(model, MODEL_VERSION)
+    del model
+
+    results = [run_mode(mode, args.workers, model_path, shared_dir, args.predict_rows, args.large_batch_rows,
+                        args.repeats)
+               for mode in ("pickle", *SHARED_MODES)]
+    print(f"{'':>13} {'':>8} {'rss/worker':>23} {'pss total after':>23}")
+    print(f"{'mode':>13} {'workers':>8} {'before':>11} {'after load':>11} {'small':>11} {'large':>11}  (MB) "
+          f"{f'{args.predict_rows} rows':>11} {f'{args.large_batch_rows} rows':>11}  (ms)")
+    for result in results:
+        print(f"{result['mode']:>13} {result['workers']:>8} {result['rss_before_mb']:>11.1f} "
+              f"{result['rss_after_load_mb']:>11.1f} {result['pss_total_small_batches_mb']:>11.1f} "
+              f"{result['pss_total_large_batches_mb']:>11.1f}       "
+              f"{result['small_batch_ms']:>11.1f} {result['large_batch_ms']:>11.1f}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"n_estimators": args.n_estimators, "max_depth": args.max_depth,
+                       "predict_rows": args.predict_rows, "large_batch_rows": args.large_batch_rows,
+                       "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Synthetic credit card data and a locally trained stand-in model for benchmarks.
+
+The stand-in model is trained through the real DataTransformation and ModelTrainer components on
+generated data shaped like config/schema.yaml, so benchmarks exercise the same MyModel structure
+as production without MongoDB or S3.
+"""
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from src.constants import TARGET_COLUMN
+from src.components.data_transformation import DataTransformation
+from src.components.model_trainer import ModelTrainer
+from src.entity.artifact_entity import DataIngestionArtifact, DataValidationArtifact
+from src.entity.config_entity import DataTransformationConfig, ModelTrainerConfig
+from src.entity.estimator import MyModel
+from src.utils.main_utils import load_object
+
+# Category codes as they occur in the source data set
+CATEGORY_CODES = {
+    "SEX": [1, 2],
+    "EDUCATION": [0, 1, 2, 3, 4, 5, 6],
+    "MARRIAGE": [0, 1, 2, 3],
+    "PAY_0": list(range(-2, 9)),
+    "PAY_2": list(range(-2, 8)),
+    "PAY_3": list(range(-2, 9)),
+    "PAY_4": list(range(-2, 9)),
+    "PAY_5": [-2, -1, 0, 2, 3, 4, 5, 6, 7],
+    "PAY_6": [-2, -1, 0, 2, 3, 4, 5, 6, 7, 8],
+}
+
+
+def make_synthetic_data(n_rows: int, seed: int = 0, with_target: bool = True) -> pd.DataFrame:
+    """
+    Generates credit card records with the raw schema columns (plus ID and, optionally, the target).
+    """
+    rng = np.random.default_rng(seed)
+    data = {"ID": np.arange(1, n_rows + 1), "LIMIT_BAL": rng.integers(1, 80, n_rows) * 10000}
+    for col in ("SEX", "EDUCATION", "MARRIAGE"):
+        data[col] = rng.choice(CATEGORY_CODES[col], n_rows)
+    data["AGE"] = rng.integers(21, 75, n_rows)
+    for col in ("PAY_0", "PAY_2", "PAY_3", "PAY_4", "PAY_5", "PAY_6"):
+        data[col] = rng.choice(CATEGORY_CODES[col], n_rows)
+    for month in range(1, 7):
+        data[f"BILL_AMT{month}"] = np.round(rng.normal(50000, 40000, n_rows))
+    for month in range(1, 7):
+        data[f"PAY_AMT{month}"] = np.round(rng.exponential(5000, n_rows))
+    dataframe = pd.DataFrame(data)
+    if with_target:
+        risk = (dataframe["PAY_0"] >= 2).astype(int) + (dataframe["PAY_2"] >= 2).astype(int)
+        noise = rng.random(n_rows) < 0.1
+        dataframe[TARGET_COLUMN] = ((risk > 0) ^ noise).astype(int)
+    return dataframe
+
+
+def train_standin_model(n_rows: int = 5000, n_estimators: int = 500, max_depth: int = 20,
+                        seed: int = 0, work_dir: str = None) -> MyModel:
+    """
+    Trains a MyModel on synthetic data through DataTransformation and ModelTrainer.
+    """
+    work_dir = work_dir or tempfile.mkdtemp(prefix="standin_model_")
+    os.makedirs(work_dir, exist_ok=True)
+    dataframe = make_synthetic_data(n_rows, seed=seed)
+    split = int(n_rows * 0.75)
+    train_file_path = os.path.join(work_dir, "train.csv")
+    test_file_path = os.path.join(work_dir, "test.csv")
+    dataframe.iloc[:split].to_csv(train_file_path, index=False)
+    dataframe.iloc[split:].to_csv(test_file_path, index=False)
+
+    transformation_dir = os.path.join(work_dir, "data_transformation")
+    data_transformation = DataTransformation(
+        data_ingestion_artifact=DataIngestionArtifact(trained_file_path=train_file_path, test_file_path=test_file_path),
+        data_transformation_config=DataTransformationConfig(
+            data_transformation_dir=transformation_dir,
+            transformed_train_file_path=os.path.join(transformation_dir, "train.npy"),
+            transformed_test_file_path=os.path.join(transformation_dir, "test.npy"),
+            transformed_object_file_path=os.path.join(transformation_dir, "preprocessing.pkl"),
+            all_columns_path=os.path.join(transformation_dir, "all_columns.npy")),
+        data_validation_artifact=DataValidationArtifact(validation_status=True, message="",
+                                                        validation_report_file_path=""))
+    data_transformation_artifact = data_transformation.initiate_data_transformation()
+
+    model_trainer_config = ModelTrainerConfig(
+        model_trainer_dir=os.path.join(work_dir, "model_trainer"),
+        trained_model_file_path=os.path.join(work_dir, "model_trainer", "model.pkl"))
+    model_trainer_config._n_estimators = n_estimators
+    model_trainer_config._max_depth = max_depth
+    model_trainer_artifact = ModelTrainer(data_transformation_artifact=data_transformation_artifact,
+                                          model_trainer_config=model_trainer_config).initiate_model_trainer()
+    return load_object(model_trainer_artifact.trained_model_file_path)
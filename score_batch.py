@@ -0,0 +1,58 @@
+"""
+Offline batch scoring with the production model, for rescoring large sets of accounts without
+going through the web app.
+
+Records are read from a MongoDB collection (through Proj1Data) or from a local CSV/Parquet file,
+split into chunks and scored on a pool of worker processes that each load the model once. Every
+chunk is written to its own prediction file in the output directory, next to a manifest of the
+chunks done. Running the same command again resumes after the last completed chunk.
+
+Usage (from the repository root):
+    python score_batch.py --input accounts.parquet --output-dir artifact/batch_scores/accounts
+    python score_batch.py --mongo-collection Proj1-Data --output-dir artifact/batch_scores/full --workers 8
+"""
+import argparse
+import os
+
+from src.constants import DATA_INGESTION_COLLECTION_NAME, OFFLINE_SCORING_OUTPUT_DIR
+from src.entity.config_entity import OfflineScoringConfig
+from src.pipline.offline_scoring import (OFFLINE_OUTPUT_FORMATS, OfflineBatchScorer, iter_file_source,
+                                         iter_mongo_source)
+
+
+def main() -> None:
+    defaults = OfflineScoringConfig()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", help="Local CSV or Parquet file to score")
+    source.add_argument("--mongo-collection", nargs="?", const=DATA_INGESTION_COLLECTION_NAME,
+                        help=f"MongoDB collection to score (default {DATA_INGESTION_COLLECTION_NAME})")
+    parser.add_argument("--database", help="MongoDB database, defaults to the project database")
+    parser.add_argument("--output-dir", default=OFFLINE_SCORING_OUTPUT_DIR,
+                        help=f"Directory for the prediction files and manifest (default {OFFLINE_SCORING_OUTPUT_DIR})")
+    parser.add_argument("--output-format", choices=OFFLINE_OUTPUT_FORMATS, default=defaults.output_format)
+    parser.add_argument("--chunk-size", type=int, default=defaults.chunk_size, help="Records per chunk")
+    parser.add_argument("--workers", type=int, default=defaults.workers, help="Scoring processes")
+    args = parser.parse_args()
+
+    scorer = OfflineBatchScorer(output_dir=args.output_dir, offline_scoring_config=OfflineScoringConfig(
+        chunk_size=args.chunk_size, workers=args.workers, output_format=args.output_format))
+    if args.input:
+        source_description = {"type": "file", "path": os.path.abspath(args.input)}
+    else:
+        source_description = {"type": "mongodb", "database": args.database, "collection": args.mongo_collection}
+    manifest = scorer.load_manifest(source_description)
+
+    skip_chunks = scorer.completed_prefix(manifest)
+    if args.input:
+        chunks = iter_file_source(args.input, chunk_size=args.chunk_size, skip_chunks=skip_chunks)
+    else:
+        chunks = iter_mongo_source(args.mongo_collection, chunk_size=args.chunk_size, skip_chunks=skip_chunks,
+                                   database_name=args.database)
+
+    manifest = scorer.run(chunks, manifest)
+    print(f"Scored {manifest['rows']} rows into {len(manifest['chunks'])} files in {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,23 @@
 import boto3
 from src.configuration.aws_connection import S3Client
+from src.cloud_storage.model_cache import LocalModelCache, get_model_cache
+from src.cloud_storage.object_metadata import ObjectMetadata, S3MetadataIndex, get_metadata_index
+from boto3.s3.transfer import TransferConfig
 from io import StringIO
-from typing import Union,List
+from typing import Dict,Union,Optional
 import os,sys
+import contextlib
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from src.logger import logging
 from mypy_boto3_s3.service_resource import Bucket
+from src.entity.config_entity import S3TransferConfig
 from src.exception import MyException
+from src.metrics import S3_TRANSFER_BYTES, S3_TRANSFER_LATENCY
 from botocore.exceptions import ClientError
 from pandas import DataFrame,read_csv
-import pickle
+from src.utils.main_utils import load_object
 
 
 class SimpleStorageService:
@@ -17,18 +26,35 @@ class SimpleStorageService:
     data uploads, and data retrieval in S3 buckets.
     """
 
-    def __init__(self):
+    def __init__(self, model_cache: Optional[LocalModelCache] = None,
+                 metadata_index: Optional[S3MetadataIndex] = None,
+                 s3_transfer_config: S3TransferConfig = S3TransferConfig()):
         """
         Initializes the SimpleStorageService instance with S3 resource and client
         from the S3Client class.
+
+        Args:
+            model_cache (Optional[LocalModelCache]): Local cache for load_model; defaults to the
+                shared cache configured by MODEL_CACHE_DIR / MODEL_CACHE_MAX_BYTES (None if disabled).
+            metadata_index (Optional[S3MetadataIndex]): Cache of HEAD results; defaults to the
+                process-wide index.
+            s3_transfer_config (S3TransferConfig): Multipart part size and concurrency of file
+                uploads and downloads.
         """
         s3_client = S3Client()
         self.s3_resource = s3_client.s3_resource
         self.s3_client = s3_client.s3_client
+        self.model_cache = model_cache if model_cache is not None else get_model_cache()
+        self.metadata_index = metadata_index if metadata_index is not None else get_metadata_index()
+        self.s3_transfer_config = s3_transfer_config
+        self.transfer_config = TransferConfig(multipart_threshold=s3_transfer_config.multipart_threshold,
+                                              multipart_chunksize=s3_transfer_config.multipart_chunksize,
+                                              max_concurrency=s3_transfer_config.max_concurrency)
 
     def s3_key_path_available(self, bucket_name, s3_key) -> bool:
         """
-        Checks if a specified S3 key path (file path) is available in the specified bucket.
+        Checks if an object with exactly the specified key exists in the specified bucket, with
+        at most one HEAD request (none while the metadata index has a live entry for the key).
 
         Args:
             bucket_name (str): Name of the S3 bucket.
@@ -38,12 +64,57 @@ class SimpleStorageService:
             bool: True if the file exists, False otherwise.
         """
         try:
-            bucket = self.get_bucket(bucket_name)
-            file_objects = [file_object for file_object in bucket.objects.filter(Prefix=s3_key)]
-            return len(file_objects) > 0
+            return self.head_object_metadata(bucket_name, s3_key) is not None
         except Exception as e:
             raise MyException(e, sys)
 
+    def head_object_metadata(self, bucket_name: str, s3_key: str, refresh: bool = False) -> Optional[ObjectMetadata]:
+        """
+        Returns the metadata of an S3 object from the metadata index, or from a HEAD request
+        when the index has no live entry for it.
+
+        Args:
+            bucket_name (str): Name of the S3 bucket.
+            s3_key (str): Key of the object.
+            refresh (bool): Always send the HEAD request (and update the index).
+
+        Returns:
+            Optional[ObjectMetadata]: The object's metadata, None if the object does not exist.
+        """
+        try:
+            if not refresh:
+                cached, metadata = self.metadata_index.lookup(bucket_name, s3_key)
+                if cached:
+                    return metadata
+            try:
+                metadata = ObjectMetadata.from_head(self.s3_client.head_object(Bucket=bucket_name, Key=s3_key))
+            except ClientError as e:
+                if e.response["Error"]["Code"] not in ("404", "NoSuchKey", "NotFound"):
+                    raise
+                metadata = None
+            self.metadata_index.record(bucket_name, s3_key, metadata)
+            return metadata
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def get_object_version(self, bucket_name: str, s3_key: str) -> Optional[str]:
+        """
+        Returns the version identifier of an S3 object using at most one HEAD request.
+
+        Args:
+            bucket_name (str): Name of the S3 bucket.
+            s3_key (str): Key of the object.
+
+        Returns:
+            Optional[str]: The object's VersionId when versioning is enabled, otherwise its ETag.
+                           None if the object does not exist.
+        """
+        try:
+            metadata = self.head_object_metadata(bucket_name, s3_key)
+            return metadata.version if metadata is not None else None
+        except Exception as e:
+            raise MyException(e, sys) from e
+
     @staticmethod
     def read_object(object_name: str, decode: bool = True, make_readable: bool = False) -> Union[StringIO, str]:
         """
@@ -89,50 +160,109 @@ class SimpleStorageService:
         except Exception as e:
             raise MyException(e, sys) from e
 
-    def get_file_object(self, filename: str, bucket_name: str) -> Union[List[object], object]:
+    def get_file_object(self, filename: str, bucket_name: str) -> object:
         """
-        Retrieves the file object(s) from the specified bucket based on the filename.
+        Retrieves the file object with exactly the given key from the specified bucket.
 
         Args:
             filename (str): The name of the file to retrieve.
             bucket_name (str): The name of the S3 bucket.
 
         Returns:
-            Union[List[object], object]: The S3 file object or list of file objects.
+            object: The S3 file object.
         """
         logging.info("Entered the get_file_object method of SimpleStorageService class")
         try:
-            bucket = self.get_bucket(bucket_name)
-            file_objects = [file_object for file_object in bucket.objects.filter(Prefix=filename)]
-            func = lambda x: x[0] if len(x) == 1 else x
-            file_objs = func(file_objects)
+            if not self.s3_key_path_available(bucket_name, filename):
+                raise FileNotFoundError(f"s3://{bucket_name}/{filename} does not exist")
+            file_obj = self.s3_resource.Object(bucket_name, filename)
             logging.info("Exited the get_file_object method of SimpleStorageService class")
-            return file_objs
+            return file_obj
         except Exception as e:
             raise MyException(e, sys) from e
 
-    def load_model(self, model_name: str, bucket_name: str, model_dir: str = None) -> object:
+    def load_model(self, model_name: str, bucket_name: str, model_dir: str = None,
+                   mmap_mode: Optional[str] = None) -> object:
         """
-        Loads a serialized model from the specified S3 bucket.
+        Loads a serialized model from the specified S3 bucket. The object is streamed to a local
+        file (in the model cache when it is enabled) and deserialized from there, so the whole
+        object is never held in memory as bytes.
 
         Args:
             model_name (str): Name of the model file in the bucket.
             bucket_name (str): Name of the S3 bucket.
             model_dir (str): Directory path within the bucket.
+            mmap_mode (Optional[str]): "r" or "c" to memory-map the arrays of models saved with
+                artifact_format="mmap"; ignored for plain pickles and compressed artifacts, whose
+                codec is read from the artifact header.
 
         Returns:
             object: The deserialized model object.
         """
         try:
             model_file = model_dir + "/" + model_name if model_dir else model_name
-            file_object = self.get_file_object(model_file, bucket_name)
-            model_obj = self.read_object(file_object, decode=False)
-            model = pickle.loads(model_obj)
+            if self.model_cache is not None:
+                model = load_object(self.download_cached(model_file, bucket_name), mmap_mode=mmap_mode)
+                logging.info("Production model loaded from the local model cache.")
+                return model
+            handle, temp_path = tempfile.mkstemp(prefix="model-", suffix=".pkl")
+            os.close(handle)
+            try:
+                self.download_file(bucket_name, model_file, temp_path)
+                model = load_object(temp_path, mmap_mode=mmap_mode)
+            finally:
+                # Memory-mapped arrays keep the unlinked file's data alive
+                with contextlib.suppress(OSError):
+                    os.remove(temp_path)
             logging.info("Production model loaded from S3 bucket.")
             return model
         except Exception as e:
             raise MyException(e, sys) from e
 
+    def download_cached(self, s3_key: str, bucket_name: str) -> str:
+        """
+        Returns the path of a local copy of an S3 object in the model cache. A cache hit costs at
+        most one HEAD request; on a miss the current version is downloaded once per host, even when
+        several processes ask for it at the same time.
+
+        Args:
+            s3_key (str): Key of the object.
+            bucket_name (str): Name of the S3 bucket.
+
+        Returns:
+            str: Path of the cached file.
+        """
+        try:
+            metadata = self.head_object_metadata(bucket_name, s3_key)
+            if metadata is None:
+                raise FileNotFoundError(f"s3://{bucket_name}/{s3_key} does not exist")
+            version = metadata.version
+            cached_path = self.model_cache.lookup(bucket_name, s3_key, version)
+            if cached_path is not None:
+                return cached_path
+            with self.model_cache.lock(bucket_name, s3_key, version):
+                # Another process may have downloaded it while this one waited for the lock
+                cached_path = self.model_cache.lookup(bucket_name, s3_key, version)
+                if cached_path is not None:
+                    return cached_path
+                extra_args = {"VersionId": metadata.version_id} if metadata.version_id else None
+                etag = metadata.etag
+                temp_path = self.model_cache.temp_path()
+                logging.info(f"Downloading s3://{bucket_name}/{s3_key} ({version}) into the model cache")
+                self.download_file(bucket_name, s3_key, temp_path, extra_args=extra_args)
+                if extra_args is None:
+                    # Without a VersionId to pin, check the object did not change while downloading
+                    # (or since the metadata index saw it); the refresh lets a retry pick up the new version
+                    current = self.head_object_metadata(bucket_name, s3_key, refresh=True)
+                    if current is None or current.version != version:
+                        os.remove(temp_path)
+                        raise ValueError(f"s3://{bucket_name}/{s3_key} changed during the download, try again")
+                # Single-part uploads have the MD5 of the content as ETag, multipart ones "<md5>-<parts>"
+                expected_md5 = etag if etag and "-" not in etag else None
+                return self.model_cache.insert(bucket_name, s3_key, version, temp_path, expected_md5=expected_md5)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
     def create_folder(self, folder_name: str, bucket_name: str) -> None:
         """
         Creates a folder in the specified S3 bucket.
@@ -150,6 +280,7 @@ class SimpleStorageService:
             if e.response["Error"]["Code"] == "404":
                 folder_obj = folder_name + "/"
                 self.s3_client.put_object(Bucket=bucket_name, Key=folder_obj)
+                self.metadata_index.invalidate(bucket_name, folder_obj)
             logging.info("Exited the create_folder method of SimpleStorageService class")
 
     def upload_file(self, from_filename: str, to_filename: str, bucket_name: str, remove: bool = True):
@@ -165,8 +296,12 @@ class SimpleStorageService:
         logging.info("Entered the upload_file method of SimpleStorageService class")
         try:
             logging.info(f"Uploading {from_filename} to {to_filename} in {bucket_name}")
-            self.s3_resource.meta.client.upload_file(from_filename, bucket_name, to_filename)
-            logging.info(f"Uploaded {from_filename} to {to_filename} in {bucket_name}")
+            start = time.perf_counter()
+            self.s3_resource.meta.client.upload_file(from_filename, bucket_name, to_filename,
+                                                     Config=self.transfer_config)
+            self.metadata_index.invalidate(bucket_name, to_filename)
+            self._log_transfer("upload", from_filename, f"s3://{bucket_name}/{to_filename}",
+                               time.perf_counter() - start)
 
             # Delete the local file if remove is True
             if remove:
@@ -176,6 +311,66 @@ class SimpleStorageService:
         except Exception as e:
             raise MyException(e, sys) from e
 
+    def upload_files(self, files: Dict[str, str], bucket_name: str, remove: bool = False) -> None:
+        """
+        Uploads a set of local files to the specified S3 bucket in parallel, each of them with the
+        multipart settings of upload_file.
+
+        Args:
+            files (Dict[str, str]): Local path -> target file path in the bucket.
+            bucket_name (str): Name of the S3 bucket.
+            remove (bool): If True, deletes the local files after all of them are uploaded.
+        """
+        logging.info("Entered the upload_files method of SimpleStorageService class")
+        try:
+            start = time.perf_counter()
+            workers = max(1, min(self.s3_transfer_config.artifact_upload_workers, len(files)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="s3-upload") as pool:
+                futures = [pool.submit(self.upload_file, from_filename, to_filename, bucket_name, remove=False)
+                           for from_filename, to_filename in files.items()]
+                # Wait for every upload before raising, so none is left running on failure
+                errors = [future.exception() for future in futures]
+            for error in errors:
+                if error is not None:
+                    raise error
+            total_bytes = sum(os.path.getsize(from_filename) for from_filename in files)
+            elapsed = time.perf_counter() - start
+            logging.info(f"Uploaded {len(files)} files, {total_bytes} bytes to {bucket_name} in {elapsed:.2f} s "
+                         f"({total_bytes / max(elapsed, 1e-9) / 1024 ** 2:.1f} MB/s)")
+            if remove:
+                for from_filename in files:
+                    os.remove(from_filename)
+            logging.info("Exited the upload_files method of SimpleStorageService class")
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def download_file(self, bucket_name: str, s3_key: str, to_filename: str, extra_args: Optional[dict] = None) -> None:
+        """
+        Downloads an S3 object to a local file with the configured multipart settings.
+
+        Args:
+            bucket_name (str): Name of the S3 bucket.
+            s3_key (str): Key of the object.
+            to_filename (str): Path of the local file.
+            extra_args (Optional[dict]): Extra arguments of the GET requests, such as VersionId.
+        """
+        try:
+            start = time.perf_counter()
+            self.s3_client.download_file(bucket_name, s3_key, to_filename, ExtraArgs=extra_args,
+                                         Config=self.transfer_config)
+            self._log_transfer("download", to_filename, f"s3://{bucket_name}/{s3_key}", time.perf_counter() - start)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @staticmethod
+    def _log_transfer(direction: str, local_path: str, s3_uri: str, elapsed: float) -> None:
+        size = os.path.getsize(local_path)
+        S3_TRANSFER_BYTES.inc(size, direction=direction)
+        S3_TRANSFER_LATENCY.observe(elapsed, direction=direction)
+        arrow = "->" if direction == "upload" else "<-"
+        logging.info(f"{direction.capitalize()}ed {local_path} {arrow} {s3_uri}: {size} bytes in {elapsed:.2f} s "
+                     f"({size / max(elapsed, 1e-9) / 1024 ** 2:.1f} MB/s)")
+
     def upload_df_as_csv(self, data_frame: DataFrame, local_filename: str, bucket_filename: str, bucket_name: str) -> None:
         """
         Uploads a DataFrame as a CSV file to the specified S3 bucket.
@@ -0,0 +1,219 @@
+import contextlib
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+from typing import Iterator, Optional, Set, Tuple
+
+from src.entity.config_entity import ModelCacheConfig
+from src.exception import MyException
+from src.logger import logging
+from src.metrics import MODEL_CACHE_LOOKUPS
+
+try:
+    import fcntl
+except ImportError:  # No cross-process locking (Windows); writes are still atomic renames
+    fcntl = None
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_digests(file_path: str) -> Tuple[str, str]:
+    """
+    Returns the SHA-256 and MD5 hex digests of a file, read once.
+    """
+    sha256, md5 = hashlib.sha256(), hashlib.md5()
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+            sha256.update(block)
+            md5.update(block)
+    return sha256.hexdigest(), md5.hexdigest()
+
+
+class LocalModelCache:
+    """
+    Content-addressed on-disk cache of objects downloaded from S3, shared by every process on the
+    host that uses the same cache_dir (serving workers, model evaluation, batch scoring).
+
+    Files are stored once under objects/ by their SHA-256, and refs/ maps a bucket, key and S3
+    version (VersionId or ETag) to a file, so a cache hit needs only the HEAD request that yields
+    the version. Each file is hashed once, when it is inserted: the MD5 is checked against the S3
+    ETag and the SHA-256 becomes its name. A hit checks the file's size, and re-hashes it only with
+    verify_on_load (MODEL_CACHE_VERIFY_ON_LOAD). Files and refs are written under a temporary
+    name and renamed into place, and a per-object file lock keeps several processes from
+    downloading the same version at once. When the cache grows past max_bytes, the least recently
+    used files are deleted; processes that still have one open keep reading it.
+    """
+
+    def __init__(self, model_cache_config: ModelCacheConfig = ModelCacheConfig()):
+        """
+        :param model_cache_config: Cache directory, size limit and hit verification
+        """
+        try:
+            self.model_cache_config = model_cache_config
+            self.cache_dir = model_cache_config.cache_dir
+            for name in ("objects", "refs", "tmp", "locks"):
+                os.makedirs(os.path.join(self.cache_dir, name), exist_ok=True)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @staticmethod
+    def _ref_name(bucket_name: str, s3_key: str, version: str) -> str:
+        return hashlib.sha1(f"{bucket_name}\0{s3_key}\0{version}".encode()).hexdigest()
+
+    def _ref_path(self, ref_name: str) -> str:
+        return os.path.join(self.cache_dir, "refs", ref_name + ".json")
+
+    def _object_path(self, sha256: str) -> str:
+        return os.path.join(self.cache_dir, "objects", sha256[:2], sha256)
+
+    def temp_path(self) -> str:
+        """
+        Returns a new temporary file name inside the cache, on the same file system as the cached
+        files so insert() can rename it into place.
+        """
+        handle, path = tempfile.mkstemp(prefix="download-", dir=os.path.join(self.cache_dir, "tmp"))
+        os.close(handle)
+        return path
+
+    @contextlib.contextmanager
+    def lock(self, bucket_name: str, s3_key: str, version: str) -> Iterator[None]:
+        """
+        Cross-process lock for downloading one object version.
+        """
+        with self._file_lock(self._ref_name(bucket_name, s3_key, version)):
+            yield
+
+    @contextlib.contextmanager
+    def _file_lock(self, name: str) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.cache_dir, "locks", name + ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def lookup(self, bucket_name: str, s3_key: str, version: Optional[str]) -> Optional[str]:
+        """
+        Returns the local path of a cached object version, or None on a miss. A cached file that
+        fails its size check (or checksum check, with verify_on_load) is removed and reported as a miss.
+        """
+        if version is None:
+            return None
+        ref_path = self._ref_path(self._ref_name(bucket_name, s3_key, version))
+        try:
+            with open(ref_path) as file:
+                ref = json.load(file)
+        except (OSError, ValueError):
+            MODEL_CACHE_LOOKUPS.inc(outcome="miss")
+            return None
+        object_path = self._object_path(ref["sha256"])
+        try:
+            valid = os.path.getsize(object_path) == ref["size"]
+            if valid and self.model_cache_config.verify_on_load:
+                valid = file_digests(object_path)[0] == ref["sha256"]
+        except OSError:
+            # Evicted by another process
+            MODEL_CACHE_LOOKUPS.inc(outcome="miss")
+            self._remove(ref_path)
+            return None
+        if not valid:
+            logging.warning(f"Cached copy of s3://{bucket_name}/{s3_key} ({version}) is corrupt, removing it")
+            MODEL_CACHE_LOOKUPS.inc(outcome="corrupt")
+            self._remove(object_path)
+            self._remove(ref_path)
+            return None
+        MODEL_CACHE_LOOKUPS.inc(outcome="hit")
+        # The modification time is the last use, for eviction
+        os.utime(object_path)
+        return object_path
+
+    def insert(self, bucket_name: str, s3_key: str, version: str, file_path: str,
+               expected_md5: Optional[str] = None) -> str:
+        """
+        Moves a downloaded file into the cache and records it as bucket/key/version.
+        :param file_path: Downloaded file, from temp_path()
+        :param expected_md5: MD5 the file must have (the ETag of a single-part upload)
+        :return: the cached file's path
+        """
+        try:
+            sha256, md5 = file_digests(file_path)
+            if expected_md5 is not None and md5 != expected_md5:
+                os.remove(file_path)
+                raise ValueError(f"Download of s3://{bucket_name}/{s3_key} is corrupt: "
+                                 f"MD5 {md5} does not match ETag {expected_md5}")
+            size = os.path.getsize(file_path)
+            object_path = self._object_path(sha256)
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            os.replace(file_path, object_path)
+
+            ref = {"bucket": bucket_name, "key": s3_key, "version": version, "sha256": sha256, "size": size}
+            ref_temp_path = self.temp_path()
+            with open(ref_temp_path, "w") as file:
+                json.dump(ref, file)
+            os.replace(ref_temp_path, self._ref_path(self._ref_name(bucket_name, s3_key, version)))
+            logging.info(f"Cached s3://{bucket_name}/{s3_key} ({version}) as {sha256[:12]}, {size} bytes")
+
+            self.evict(keep={sha256})
+            return object_path
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def evict(self, keep: Set[str] = frozenset()) -> int:
+        """
+        Deletes least recently used files until the cache is within max_bytes.
+        :param keep: SHA-256 digests that must not be evicted
+        :return: number of files deleted
+        """
+        with self._file_lock("evict"):
+            entries = []
+            objects_dir = os.path.join(self.cache_dir, "objects")
+            for prefix in os.listdir(objects_dir):
+                for name in os.listdir(os.path.join(objects_dir, prefix)):
+                    path = os.path.join(objects_dir, prefix, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, name, path))
+            total = sum(size for _, size, _, _ in entries)
+            evicted = 0
+            for _, size, name, path in sorted(entries):
+                if total <= self.model_cache_config.max_bytes:
+                    break
+                if name in keep:
+                    continue
+                self._remove(path)
+                total -= size
+                evicted += 1
+            if evicted:
+                logging.info(f"Evicted {evicted} files from the model cache, {total} bytes left")
+            return evicted
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        with contextlib.suppress(OSError):
+            os.remove(path)
+
+
+_model_cache: Optional[LocalModelCache] = None
+_model_cache_lock = threading.Lock()
+
+
+def get_model_cache() -> Optional[LocalModelCache]:
+    """
+    Returns the process-wide model cache, or None when it is disabled (MODEL_CACHE_MAX_BYTES=0).
+    """
+    global _model_cache
+    config = ModelCacheConfig()
+    if config.max_bytes <= 0:
+        return None
+    with _model_cache_lock:
+        if _model_cache is None:
+            _model_cache = LocalModelCache(config)
+        return _model_cache
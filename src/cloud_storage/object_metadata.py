@@ -0,0 +1,96 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from src.entity.config_entity import S3MetadataConfig
+from src.metrics import S3_METADATA_LOOKUPS
+
+
+@dataclass(frozen=True)
+class ObjectMetadata:
+    """
+    The fields of a HEAD response that the model registry uses.
+    """
+    etag: str
+    size: int
+    version_id: Optional[str] = None
+
+    @classmethod
+    def from_head(cls, response: dict) -> "ObjectMetadata":
+        version_id = response.get("VersionId")
+        return cls(etag=response.get("ETag", "").strip('"'), size=response.get("ContentLength", 0),
+                   version_id=version_id if version_id and version_id != "null" else None)
+
+    @property
+    def version(self) -> Optional[str]:
+        """
+        The VersionId when bucket versioning is enabled, otherwise the ETag.
+        """
+        return self.version_id or self.etag or None
+
+
+class S3MetadataIndex:
+    """
+    In-memory index of the S3 keys a process has looked up, with the result of their last HEAD
+    request: the object's metadata, or None for a key that does not exist.
+
+    Results are reused for ttl_seconds (negative_ttl_seconds for missing keys), so existence and
+    version checks of the registry keys made in quick succession (model evaluation, the pusher,
+    the serving version watcher) cost one HEAD request between them. Writes made through
+    SimpleStorageService invalidate the key; writes by other processes are seen once the entry
+    expires. Thread-safe.
+    """
+
+    def __init__(self, s3_metadata_config: S3MetadataConfig = S3MetadataConfig()):
+        """
+        :param s3_metadata_config: Time to live of positive and negative results
+        """
+        self.s3_metadata_config = s3_metadata_config
+        self._entries: Dict[Tuple[str, str], Tuple[float, Optional[ObjectMetadata]]] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, bucket_name: str, s3_key: str) -> Tuple[bool, Optional[ObjectMetadata]]:
+        """
+        :return: (True, metadata or None if the key is missing) for a live entry, (False, None) otherwise
+        """
+        with self._lock:
+            entry = self._entries.get((bucket_name, s3_key))
+            if entry is not None and entry[0] > time.monotonic():
+                S3_METADATA_LOOKUPS.inc(outcome="hit")
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[(bucket_name, s3_key)]
+        S3_METADATA_LOOKUPS.inc(outcome="miss")
+        return False, None
+
+    def record(self, bucket_name: str, s3_key: str, metadata: Optional[ObjectMetadata]) -> None:
+        """
+        Stores the result of a HEAD request, None meaning the key does not exist.
+        """
+        ttl = (self.s3_metadata_config.ttl_seconds if metadata is not None
+               else self.s3_metadata_config.negative_ttl_seconds)
+        with self._lock:
+            if ttl > 0:
+                self._entries[(bucket_name, s3_key)] = (time.monotonic() + ttl, metadata)
+            else:
+                self._entries.pop((bucket_name, s3_key), None)
+
+    def invalidate(self, bucket_name: str, s3_key: str) -> None:
+        with self._lock:
+            self._entries.pop((bucket_name, s3_key), None)
+
+
+_metadata_index: Optional[S3MetadataIndex] = None
+_metadata_index_lock = threading.Lock()
+
+
+def get_metadata_index() -> S3MetadataIndex:
+    """
+    Returns the process-wide metadata index shared by every SimpleStorageService.
+    """
+    global _metadata_index
+    with _metadata_index_lock:
+        if _metadata_index is None:
+            _metadata_index = S3MetadataIndex()
+        return _metadata_index
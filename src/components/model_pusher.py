@@ -1,25 +1,79 @@
+import json
+import os
 import sys
+from dataclasses import asdict
+from typing import Dict, Optional
 
 from src.cloud_storage.aws_storage import SimpleStorageService
 from src.exception import MyException
 from src.logger import logging
-from src.entity.artifact_entity import ModelPusherArtifact, ModelEvaluationArtifact
+from src.entity.artifact_entity import (DataTransformationArtifact, ModelEvaluationArtifact, ModelPusherArtifact,
+                                        ModelTrainerArtifact)
 from src.entity.config_entity import ModelPusherConfig
-from src.entity.s3_estimator import Proj1Estimator
 
 
 class ModelPusher:
     def __init__(self, model_evaluation_artifact: ModelEvaluationArtifact,
-                 model_pusher_config: ModelPusherConfig):
+                 model_pusher_config: ModelPusherConfig,
+                 data_transformation_artifact: Optional[DataTransformationArtifact] = None,
+                 model_trainer_artifact: Optional[ModelTrainerArtifact] = None):
         """
         :param model_evaluation_artifact: Output reference of data evaluation artifact stage
         :param model_pusher_config: Configuration for model pusher
+        :param data_transformation_artifact: Preprocessing object and column list to push with the model
+        :param model_trainer_artifact: Metrics of the trained model to push with it
         """
         self.s3 = SimpleStorageService()
         self.model_evaluation_artifact = model_evaluation_artifact
         self.model_pusher_config = model_pusher_config
-        self.proj1_estimator = Proj1Estimator(bucket_name=model_pusher_config.bucket_name,
-                                model_path=model_pusher_config.s3_model_key_path)
+        self.data_transformation_artifact = data_transformation_artifact
+        self.model_trainer_artifact = model_trainer_artifact
+
+    def get_metrics_file_path(self) -> Optional[str]:
+        """
+        Returns where the trained model's metrics are written, next to the model file, or None when
+        there is no model trainer artifact.
+        """
+        if self.model_trainer_artifact is None:
+            return None
+        return os.path.join(os.path.dirname(self.model_trainer_artifact.trained_model_file_path),
+                            self.model_pusher_config.metrics_file_name)
+
+    def write_metrics_file(self) -> Optional[str]:
+        """
+        Method Name :   write_metrics_file
+        Description :   Dumps the trained model's metrics to a JSON file so they can be pushed with it
+
+        Output      :   Returns the metrics file path, None when there are no metrics to write
+        """
+        try:
+            metrics_file_path = self.get_metrics_file_path()
+            if metrics_file_path is not None:
+                with open(metrics_file_path, "w") as file:
+                    json.dump(asdict(self.model_trainer_artifact.metric_artifact), file, indent=2)
+            return metrics_file_path
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def get_artifact_files(self) -> Dict[str, str]:
+        """
+        Method Name :   get_artifact_files
+        Description :   Collects the local files to push and their keys in the model bucket: the model
+                        at s3_model_key_path, the rest under s3_artifact_dir. The metrics file is
+                        written by write_metrics_file
+
+        Output      :   Returns a dict of local path -> S3 key
+        """
+        config = self.model_pusher_config
+        files = {self.model_evaluation_artifact.trained_model_path: config.s3_model_key_path}
+        if self.data_transformation_artifact is not None:
+            for file_path in (self.data_transformation_artifact.transformed_object_file_path,
+                              self.data_transformation_artifact.all_columns_file_path):
+                files[file_path] = f"{config.s3_artifact_dir}/{os.path.basename(file_path)}"
+        metrics_file_path = self.get_metrics_file_path()
+        if metrics_file_path is not None:
+            files[metrics_file_path] = f"{config.s3_artifact_dir}/{config.metrics_file_name}"
+        return files
 
     def initiate_model_pusher(self) -> ModelPusherArtifact:
         """
@@ -36,9 +90,12 @@ class ModelPusher:
             logging.info("Uploading artifacts folder to s3 bucket")
             
             logging.info("Uploading new model to S3 bucket....")
-            self.proj1_estimator.save_model(from_file=self.model_evaluation_artifact.trained_model_path)
+            self.write_metrics_file()
+            artifact_files = self.get_artifact_files()
+            self.s3.upload_files(artifact_files, bucket_name=self.model_pusher_config.bucket_name)
             model_pusher_artifact = ModelPusherArtifact(bucket_name=self.model_pusher_config.bucket_name,
-                                                        s3_model_path=self.model_pusher_config.s3_model_key_path)
+                                                        s3_model_path=self.model_pusher_config.s3_model_key_path,
+                                                        s3_artifact_paths=artifact_files)
 
             logging.info("Uploaded artifacts folder to s3 bucket")
             logging.info(f"Model pusher artifact: [{model_pusher_artifact}]")
@@ -99,6 +99,10 @@ class ModelTrainer:
             preprocessing_obj = load_object(file_path=self.data_transformation_artifact.transformed_object_file_path)
             logging.info("Preprocessing obj loaded.")
 
+            # Load training-time column order so serving can encode features without pd.get_dummies
+            all_columns = load_numpy_array_data(file_path=self.data_transformation_artifact.all_columns_file_path)
+            all_columns = [str(col) for col in all_columns]
+
             # Check if the model's accuracy meets the expected threshold
             if accuracy_score(train_arr[:, -1], trained_model.predict(train_arr[:, :-1])) < self.model_trainer_config.expected_accuracy:
                 logging.info("No model found with score above the base score")
@@ -106,8 +110,12 @@ class ModelTrainer:
 
             # Save the final model object that includes both preprocessing and the trained model
             logging.info("Saving new model as performace is better than previous one.")
-            my_model = MyModel(preprocessing_object=preprocessing_obj, trained_model_object=trained_model)
-            save_object(self.model_trainer_config.trained_model_file_path, my_model)
+            my_model = MyModel(preprocessing_object=preprocessing_obj, trained_model_object=trained_model,
+                               feature_columns=all_columns,
+                               inference_engine=self.model_trainer_config.inference_engine)
+            save_object(self.model_trainer_config.trained_model_file_path, my_model,
+                        artifact_format=self.model_trainer_config.artifact_format,
+                        codec=self.model_trainer_config.artifact_codec)
             logging.info("Saved final model object that includes both preprocessing and the trained model")
 
             # Create and return the ModelTrainerArtifact
@@ -63,6 +63,13 @@ MODEL_TRAINER_MIN_SAMPLES_LEAF: int = 1
 MIN_SAMPLES_SPLIT_MAX_DEPTH: int = 20
 MIN_SAMPLES_SPLIT_CRITERION: str = 'entropy'
 MIN_SAMPLES_SPLIT_RANDOM_STATE: int = 42
+MODEL_TRAINER_INFERENCE_ENGINE: str = "sklearn"
+MODEL_INFERENCE_ENGINE_ENV_KEY = "MODEL_INFERENCE_ENGINE"
+MODEL_ARTIFACT_FORMAT_ENV_KEY = "MODEL_ARTIFACT_FORMAT"
+MODEL_ARTIFACT_FORMAT: str = "mmap"
+MODEL_ARTIFACT_CODEC_ENV_KEY = "MODEL_ARTIFACT_CODEC"
+MODEL_ARTIFACT_CODEC: str = "none"
+MODEL_LOAD_MMAP_MODE: str = "r"
 
 """
 MODEL Evaluation related constants
@@ -70,7 +77,125 @@ MODEL Evaluation related constants
 MODEL_EVALUATION_CHANGED_THRESHOLD_SCORE: float = 0.02
 MODEL_BUCKET_NAME = "my-model-proj1"
 MODEL_PUSHER_S3_KEY = "model-registry"
+MODEL_RELOAD_INTERVAL_SECONDS: int = 60
+PREDICTION_CHUNK_SIZE: int = 10000
 
 
+"""
+Executor related constants used by the web app to keep blocking work off the event loop
+"""
+EXECUTOR_IO_WORKERS_ENV_KEY = "EXECUTOR_IO_WORKERS"
+EXECUTOR_CPU_WORKERS_ENV_KEY = "EXECUTOR_CPU_WORKERS"
+PREDICTION_EXECUTOR_ENV_KEY = "PREDICTION_EXECUTOR"
+EXECUTOR_IO_WORKERS: int = 8
+EXECUTOR_CPU_WORKERS: int = 2
+PREDICTION_EXECUTOR: str = "thread"
+
+"""
+Micro-batching related constants for coalescing concurrent single-record predictions
+"""
+MICRO_BATCH_MAX_SIZE_ENV_KEY = "MICRO_BATCH_MAX_SIZE"
+MICRO_BATCH_MAX_WAIT_MS_ENV_KEY = "MICRO_BATCH_MAX_WAIT_MS"
+MICRO_BATCH_MAX_SIZE: int = 64
+MICRO_BATCH_MAX_WAIT_MS: float = 5.0
+
+"""
+NDJSON stream scoring related constants
+"""
+STREAM_BATCH_MAX_SIZE: int = 256
+STREAM_BATCH_MAX_WAIT_MS: float = 20.0
+STREAM_MAX_PENDING_RECORDS: int = 1024
+STREAM_MAX_LINE_BYTES: int = 64 * 1024
+
+"""
+Prediction cache related constants for repeated applicant profiles
+"""
+PREDICTION_CACHE_MAX_ENTRIES_ENV_KEY = "PREDICTION_CACHE_MAX_ENTRIES"
+PREDICTION_CACHE_TTL_SECONDS_ENV_KEY = "PREDICTION_CACHE_TTL_SECONDS"
+PREDICTION_CACHE_MAX_ENTRIES: int = 10000
+PREDICTION_CACHE_TTL_SECONDS: float = 300.0
+PREDICTION_CACHE_MAX_BATCH_ROWS: int = 1000
+
+"""
+Startup warm-up related constants
+"""
+WARMUP_RECORDS: int = 32
+WARMUP_RETRY_SECONDS: float = 30.0
+
+"""
+Multi-worker serving related constants
+"""
+APP_WORKERS_ENV_KEY = "APP_WORKERS"
+APP_WORKERS: int = 1
+SHARED_MODEL_DIR_ENV_KEY = "SHARED_MODEL_DIR"
+SHARED_MODEL_DIR: str = os.path.join("artifact", "shared_model")
+# Workers load the sklearn forest on demand for batches above PACKED_FOREST_MAX_BATCH_ROWS; "false"
+# runs those on the packed engine too, keeping memory at the shared forest at the cost of throughput
+SHARED_MODEL_SKLEARN_FALLBACK_ENV_KEY = "SHARED_MODEL_SKLEARN_FALLBACK"
+SHARED_MODEL_SKLEARN_FALLBACK: str = "true"
+
+"""
+Shadow scoring related constants for comparing a candidate model against live traffic
+"""
+SHADOW_MODEL_KEY_ENV_KEY = "SHADOW_MODEL_KEY"
+SHADOW_MAX_QUEUE_SIZE_ENV_KEY = "SHADOW_MAX_QUEUE_SIZE"
+SHADOW_MAX_QUEUE_SIZE: int = 1000
+
+"""
+Admission control related constants for shedding prediction load under traffic spikes
+"""
+ADMISSION_MAX_CONCURRENT_ENV_KEY = "ADMISSION_MAX_CONCURRENT"
+ADMISSION_MAX_QUEUE_ENV_KEY = "ADMISSION_MAX_QUEUE"
+ADMISSION_DEADLINE_MS_ENV_KEY = "ADMISSION_DEADLINE_MS"
+ADMISSION_MAX_CONCURRENT: int = 32
+ADMISSION_MAX_QUEUE: int = 256
+ADMISSION_DEADLINE_MS: float = 2000.0
+ADMISSION_DEADLINE_HEADER: str = "X-Request-Timeout-Ms"
+# File and NDJSON stream scoring hold their slot until the response is sent, so they get their own pool
+ADMISSION_STREAM_MAX_CONCURRENT_ENV_KEY = "ADMISSION_STREAM_MAX_CONCURRENT"
+ADMISSION_STREAM_MAX_QUEUE_ENV_KEY = "ADMISSION_STREAM_MAX_QUEUE"
+ADMISSION_STREAM_MAX_CONCURRENT: int = 4
+ADMISSION_STREAM_MAX_QUEUE: int = 16
+
+"""
+Offline batch scoring related constants for score_batch.py
+"""
+OFFLINE_SCORING_OUTPUT_DIR: str = os.path.join("artifact", "batch_scores")
+OFFLINE_SCORING_CHUNK_SIZE: int = 100000
+OFFLINE_SCORING_OUTPUT_FORMAT: str = "csv"
+OFFLINE_SCORING_MANIFEST_FILE_NAME: str = "manifest.json"
+OFFLINE_SCORING_PENDING_CHUNKS_PER_WORKER: int = 2
+
+"""
+Local model cache related constants for models downloaded from S3
+"""
+MODEL_CACHE_DIR_ENV_KEY = "MODEL_CACHE_DIR"
+MODEL_CACHE_MAX_BYTES_ENV_KEY = "MODEL_CACHE_MAX_BYTES"
+MODEL_CACHE_DIR: str = os.path.join("artifact", "model_cache")
+MODEL_CACHE_MAX_BYTES: int = 2 * 1024 ** 3
+# "true" re-hashes a cached file on every hit; by default it is hashed once, when it is inserted
+MODEL_CACHE_VERIFY_ON_LOAD_ENV_KEY = "MODEL_CACHE_VERIFY_ON_LOAD"
+MODEL_CACHE_VERIFY_ON_LOAD: str = "false"
+
+"""
+S3 object metadata cache related constants (existence checks and versions of registry keys)
+"""
+S3_METADATA_TTL_SECONDS_ENV_KEY = "S3_METADATA_TTL_SECONDS"
+S3_METADATA_NEGATIVE_TTL_SECONDS_ENV_KEY = "S3_METADATA_NEGATIVE_TTL_SECONDS"
+S3_METADATA_TTL_SECONDS: float = 5.0
+S3_METADATA_NEGATIVE_TTL_SECONDS: float = 2.0
+
+"""
+S3 transfer related constants for uploads and downloads through SimpleStorageService
+"""
+S3_MULTIPART_THRESHOLD_ENV_KEY = "S3_MULTIPART_THRESHOLD"
+S3_MULTIPART_CHUNK_SIZE_ENV_KEY = "S3_MULTIPART_CHUNK_SIZE"
+S3_MAX_CONCURRENCY_ENV_KEY = "S3_MAX_CONCURRENCY"
+S3_MULTIPART_THRESHOLD: int = 16 * 1024 ** 2
+S3_MULTIPART_CHUNK_SIZE: int = 16 * 1024 ** 2
+S3_MAX_CONCURRENCY: int = 10
+S3_ARTIFACT_UPLOAD_WORKERS: int = 4
+MODEL_PUSHER_METRICS_FILE_NAME: str = "metrics.json"
+
 APP_HOST = "0.0.0.0"
 APP_PORT = 5001
\ No newline at end of file
@@ -1,7 +1,7 @@
 import sys
 import pandas as pd
 import numpy as np
-from typing import Optional
+from typing import Iterator, Optional
 
 from src.configuration.mongo_db_connection import MongoDBClient
 from src.constants import DATABASE_NAME
@@ -54,4 +54,51 @@ class Proj1Data:
             return df
 
         except Exception as e:
-            raise MyException(e, sys)
\ No newline at end of file
+            raise MyException(e, sys)
+
+    def iter_collection_chunks(self, collection_name: str, chunk_size: int, skip_rows: int = 0,
+                               database_name: Optional[str] = None) -> Iterator[pd.DataFrame]:
+        """
+        Streams a MongoDB collection as DataFrame chunks of chunk_size documents, in _id order so
+        that a run can be resumed by skipping the rows already processed.
+
+        Parameters:
+        ----------
+        collection_name : str
+            The name of the MongoDB collection to read.
+        chunk_size : int
+            Number of documents per chunk.
+        skip_rows : int
+            Number of documents (in _id order) to skip before the first chunk.
+        database_name : Optional[str]
+            Name of the database (optional). Defaults to DATABASE_NAME.
+
+        Yields:
+        ------
+        pd.DataFrame
+            One chunk, preprocessed the same way as export_collection_as_dataframe.
+        """
+        try:
+            if database_name is None:
+                collection = self.mongo_client.database[collection_name]
+            else:
+                collection = self.mongo_client.client[database_name][collection_name]
+
+            cursor = collection.find().sort("_id", 1).skip(skip_rows).batch_size(min(chunk_size, 10000))
+            documents = []
+            for document in cursor:
+                documents.append(document)
+                if len(documents) == chunk_size:
+                    yield self._documents_to_dataframe(documents)
+                    documents = []
+            if documents:
+                yield self._documents_to_dataframe(documents)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @staticmethod
+    def _documents_to_dataframe(documents: list) -> pd.DataFrame:
+        df = pd.DataFrame(documents)
+        if "id" in df.columns.to_list():
+            df = df.drop(columns=["id"])
+        return df.replace({"na": np.nan})
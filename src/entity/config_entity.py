@@ -1,6 +1,7 @@
 import os
 from src.constants import *
 from dataclasses import dataclass
+from typing import Optional
 from datetime import datetime
 
 TIMESTAMP: str = datetime.now().strftime("%m_%d_%Y_%H_%M_%S")
@@ -55,6 +56,11 @@ class ModelTrainerConfig:
     _max_depth = MIN_SAMPLES_SPLIT_MAX_DEPTH
     _criterion = MIN_SAMPLES_SPLIT_CRITERION
     _random_state = MIN_SAMPLES_SPLIT_RANDOM_STATE
+    inference_engine: str = MODEL_TRAINER_INFERENCE_ENGINE
+    # "mmap" lets servers memory-map the model's arrays, "dill" writes the previous plain pickle
+    artifact_format: str = os.getenv(MODEL_ARTIFACT_FORMAT_ENV_KEY, MODEL_ARTIFACT_FORMAT)
+    # Compression of "mmap" artifacts: "none" keeps them memory-mappable, "fast" or "high" trade load time for size
+    artifact_codec: str = os.getenv(MODEL_ARTIFACT_CODEC_ENV_KEY, MODEL_ARTIFACT_CODEC)
 
 @dataclass
 class ModelEvaluationConfig:
@@ -66,9 +72,111 @@ class ModelEvaluationConfig:
 class ModelPusherConfig:
     bucket_name: str = MODEL_BUCKET_NAME
     s3_model_key_path: str = MODEL_FILE_NAME
+    # Prefix of the artifacts pushed next to the model (preprocessing object, metrics, column list)
+    s3_artifact_dir: str = MODEL_PUSHER_S3_KEY
+    metrics_file_name: str = MODEL_PUSHER_METRICS_FILE_NAME
 
 
 @dataclass
 class CreditCardDefaultPredictorConfig:
     model_file_path: str = MODEL_FILE_NAME
-    model_bucket_name: str = MODEL_BUCKET_NAME
\ No newline at end of file
+    model_bucket_name: str = MODEL_BUCKET_NAME
+    model_reload_interval_seconds: int = MODEL_RELOAD_INTERVAL_SECONDS
+    inference_engine: Optional[str] = os.getenv(MODEL_INFERENCE_ENGINE_ENV_KEY)
+    # Set to share one memory-mapped copy of the model between server workers
+    shared_model_dir: Optional[str] = os.getenv(SHARED_MODEL_DIR_ENV_KEY)
+    shared_model_sklearn_fallback: bool = (os.getenv(SHARED_MODEL_SKLEARN_FALLBACK_ENV_KEY, SHARED_MODEL_SKLEARN_FALLBACK)
+                                           .lower() == "true")
+
+@dataclass
+class ExecutorConfig:
+    io_workers: int = int(os.getenv(EXECUTOR_IO_WORKERS_ENV_KEY, EXECUTOR_IO_WORKERS))
+    cpu_workers: int = int(os.getenv(EXECUTOR_CPU_WORKERS_ENV_KEY, EXECUTOR_CPU_WORKERS))
+    prediction_executor: str = os.getenv(PREDICTION_EXECUTOR_ENV_KEY, PREDICTION_EXECUTOR)
+
+
+@dataclass
+class MicroBatchConfig:
+    max_batch_size: int = int(os.getenv(MICRO_BATCH_MAX_SIZE_ENV_KEY, MICRO_BATCH_MAX_SIZE))
+    max_wait_ms: float = float(os.getenv(MICRO_BATCH_MAX_WAIT_MS_ENV_KEY, MICRO_BATCH_MAX_WAIT_MS))
+
+
+@dataclass
+class StreamScoringConfig:
+    max_batch_size: int = STREAM_BATCH_MAX_SIZE
+    max_wait_ms: float = STREAM_BATCH_MAX_WAIT_MS
+    max_pending_records: int = STREAM_MAX_PENDING_RECORDS
+    max_line_bytes: int = STREAM_MAX_LINE_BYTES
+
+
+@dataclass
+class PredictionCacheConfig:
+    max_entries: int = int(os.getenv(PREDICTION_CACHE_MAX_ENTRIES_ENV_KEY, PREDICTION_CACHE_MAX_ENTRIES))
+    ttl_seconds: float = float(os.getenv(PREDICTION_CACHE_TTL_SECONDS_ENV_KEY, PREDICTION_CACHE_TTL_SECONDS))
+    # Larger batches (bulk/file scoring) bypass the cache so they do not flush the hot entries
+    max_batch_rows: int = PREDICTION_CACHE_MAX_BATCH_ROWS
+
+
+@dataclass
+class ShadowScoringConfig:
+    # S3 key of the candidate model, shadow scoring is off while it is not set
+    model_file_path: Optional[str] = os.getenv(SHADOW_MODEL_KEY_ENV_KEY)
+    model_bucket_name: str = MODEL_BUCKET_NAME
+    model_reload_interval_seconds: int = MODEL_RELOAD_INTERVAL_SECONDS
+    # Requests waiting for the candidate model; more are dropped instead of queued
+    max_queue_size: int = int(os.getenv(SHADOW_MAX_QUEUE_SIZE_ENV_KEY, SHADOW_MAX_QUEUE_SIZE))
+
+
+@dataclass
+class AdmissionConfig:
+    max_concurrent: int = int(os.getenv(ADMISSION_MAX_CONCURRENT_ENV_KEY, ADMISSION_MAX_CONCURRENT))
+    max_queue: int = int(os.getenv(ADMISSION_MAX_QUEUE_ENV_KEY, ADMISSION_MAX_QUEUE))
+    # Default deadline; a client can ask for a shorter one with the ADMISSION_DEADLINE_HEADER header
+    deadline_ms: float = float(os.getenv(ADMISSION_DEADLINE_MS_ENV_KEY, ADMISSION_DEADLINE_MS))
+    deadline_header: str = ADMISSION_DEADLINE_HEADER
+
+
+@dataclass
+class StreamAdmissionConfig(AdmissionConfig):
+    # Limits of the pool for /predict/file and /predict/stream; the deadline only bounds the wait for a slot
+    max_concurrent: int = int(os.getenv(ADMISSION_STREAM_MAX_CONCURRENT_ENV_KEY, ADMISSION_STREAM_MAX_CONCURRENT))
+    max_queue: int = int(os.getenv(ADMISSION_STREAM_MAX_QUEUE_ENV_KEY, ADMISSION_STREAM_MAX_QUEUE))
+
+
+@dataclass
+class OfflineScoringConfig:
+    chunk_size: int = OFFLINE_SCORING_CHUNK_SIZE
+    workers: int = os.cpu_count() or 1
+    output_format: str = OFFLINE_SCORING_OUTPUT_FORMAT
+    manifest_file_name: str = OFFLINE_SCORING_MANIFEST_FILE_NAME
+    # Chunks read ahead of the pool, per worker; bounds the memory of the reading process
+    pending_chunks_per_worker: int = OFFLINE_SCORING_PENDING_CHUNKS_PER_WORKER
+
+
+@dataclass
+class ModelCacheConfig:
+    cache_dir: str = os.getenv(MODEL_CACHE_DIR_ENV_KEY, MODEL_CACHE_DIR)
+    # Total size of the cached models; 0 disables the cache
+    max_bytes: int = int(os.getenv(MODEL_CACHE_MAX_BYTES_ENV_KEY, MODEL_CACHE_MAX_BYTES))
+    # Re-hash cached files on every hit to catch corrupted copies; hits otherwise check the size only
+    verify_on_load: bool = os.getenv(MODEL_CACHE_VERIFY_ON_LOAD_ENV_KEY, MODEL_CACHE_VERIFY_ON_LOAD).lower() == "true"
+
+
+@dataclass
+class S3MetadataConfig:
+    # How long a HEAD result is reused for an existing key; 0 disables the cache
+    ttl_seconds: float = float(os.getenv(S3_METADATA_TTL_SECONDS_ENV_KEY, S3_METADATA_TTL_SECONDS))
+    # Kept shorter, so a newly pushed model is seen soon even by processes that did not upload it
+    negative_ttl_seconds: float = float(os.getenv(S3_METADATA_NEGATIVE_TTL_SECONDS_ENV_KEY,
+                                                  S3_METADATA_NEGATIVE_TTL_SECONDS))
+
+
+@dataclass
+class S3TransferConfig:
+    # Files larger than this are transferred in parts of multipart_chunksize bytes
+    multipart_threshold: int = int(os.getenv(S3_MULTIPART_THRESHOLD_ENV_KEY, S3_MULTIPART_THRESHOLD))
+    multipart_chunksize: int = int(os.getenv(S3_MULTIPART_CHUNK_SIZE_ENV_KEY, S3_MULTIPART_CHUNK_SIZE))
+    # Parts of one file transferred at once
+    max_concurrency: int = int(os.getenv(S3_MAX_CONCURRENCY_ENV_KEY, S3_MAX_CONCURRENCY))
+    # Files of an artifact set uploaded at once by upload_files
+    artifact_upload_workers: int = S3_ARTIFACT_UPLOAD_WORKERS
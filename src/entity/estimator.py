@@ -1,9 +1,12 @@
 import sys
+from typing import Callable, List, Optional
 
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
 from sklearn.pipeline import Pipeline
 
+from src.entity.forest_engine import PACKED_FOREST_MAX_BATCH_ROWS, PackedForest
 from src.exception import MyException
 from src.logger import logging
 
@@ -17,14 +20,83 @@ from src.logger import logging
 #         mapping_response = self._asdict()
 #         return dict(zip(mapping_response.values(),mapping_response.keys()))
 
+INFERENCE_ENGINES = ("sklearn", "packed")
+
+
 class MyModel:
-    def __init__(self, preprocessing_object: Pipeline, trained_model_object: object):
+    def __init__(self, preprocessing_object: Pipeline, trained_model_object: object,
+                 feature_columns: Optional[List[str]] = None, inference_engine: str = "sklearn"):
         """
         :param preprocessing_object: Input Object of preprocesser
         :param trained_model_object: Input Object of trained model 
+        :param feature_columns: Training-time column order after dummy encoding (all_columns artifact)
+        :param inference_engine: "sklearn" to call the trained model directly, "packed" to evaluate
+                                 small batches with the array-packed PackedForest engine
         """
         self.preprocessing_object = preprocessing_object
         self.trained_model_object = trained_model_object
+        self.feature_columns = feature_columns
+        self.inference_engine = "sklearn"
+        self.packed_forest: Optional[PackedForest] = None
+        # Set by SharedModelStore.load on models whose sklearn forest is loaded on demand
+        self.sklearn_forest_loader: Optional[Callable[[], object]] = None
+        self.set_inference_engine(inference_engine)
+
+    def set_inference_engine(self, inference_engine: str) -> None:
+        """
+        Selects the engine used to evaluate the trained model, building the packed arrays if needed.
+        """
+        try:
+            if inference_engine not in INFERENCE_ENGINES:
+                raise ValueError(f"Unknown inference engine '{inference_engine}', expected one of {INFERENCE_ENGINES}")
+            if inference_engine == "packed" and getattr(self, "packed_forest", None) is None:
+                self.packed_forest = PackedForest.from_sklearn(self.trained_model_object)
+            self.inference_engine = inference_engine
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def _use_packed_forest(self, n_rows: int) -> bool:
+        # Models pickled before inference_engine existed always use sklearn; large batches are
+        # faster through sklearn's compiled traversal, so the packed engine only takes small ones
+        # unless there is no sklearn forest to fall back to
+        if getattr(self, "inference_engine", "sklearn") != "packed":
+            return False
+        has_sklearn_forest = (self.trained_model_object is not None
+                              or getattr(self, "sklearn_forest_loader", None) is not None)
+        return n_rows <= PACKED_FOREST_MAX_BATCH_ROWS or not has_sklearn_forest
+
+    def _get_sklearn_forest(self) -> object:
+        # Shared models load the sklearn forest on the first batch that needs it
+        if self.trained_model_object is None:
+            self.trained_model_object = self.sklearn_forest_loader()
+        return self.trained_model_object
+
+    def _predict_transformed(self, transformed_feature: np.ndarray) -> np.ndarray:
+        if self._use_packed_forest(len(transformed_feature)):
+            return self.packed_forest.predict(transformed_feature)
+        return self._get_sklearn_forest().predict(transformed_feature)
+
+    def _predict_proba_transformed(self, transformed_feature: np.ndarray) -> np.ndarray:
+        if self._use_packed_forest(len(transformed_feature)):
+            return self.packed_forest.predict_proba(transformed_feature)
+        return self._get_sklearn_forest().predict_proba(transformed_feature)
+
+    @property
+    def classes(self) -> np.ndarray:
+        if self.trained_model_object is None:
+            return self.packed_forest.classes
+        return self.trained_model_object.classes_
+
+    def get_feature_columns(self) -> List[str]:
+        """
+        Returns the training-time feature columns the preprocessing object expects, in order.
+        Models saved before feature_columns was recorded fall back to the columns the
+        preprocessing object was fitted on.
+        """
+        feature_columns = getattr(self, "feature_columns", None)
+        if feature_columns is None:
+            feature_columns = self.preprocessing_object.feature_names_in_
+        return [str(col) for col in feature_columns]
 
     def predict(self, dataframe: pd.DataFrame) -> DataFrame:
         """
@@ -39,7 +111,7 @@ class MyModel:
 
             # Step 2: Perform prediction using the trained model
             logging.info("Using the trained model to get predictions")
-            predictions = self.trained_model_object.predict(transformed_feature)
+            predictions = self._predict_transformed(transformed_feature)
 
             return predictions
 
@@ -48,8 +120,42 @@ class MyModel:
             raise MyException(e, sys) from e
 
 
+    def predict_features(self, features: np.ndarray) -> np.ndarray:
+        """
+        Predicts on features that are already encoded and scaled (e.g. by FeatureVectorizer),
+        skipping preprocessing_object.
+        """
+        try:
+            return self._predict_transformed(features)
+        except Exception as e:
+            logging.error("Error occurred in predict_features method", exc_info=True)
+            raise MyException(e, sys) from e
+
+    def predict_proba(self, dataframe: pd.DataFrame) -> np.ndarray:
+        """
+        Same as predict, but returns the class probabilities of the forest, one column per entry
+        of classes, in a single evaluation of the trees.
+        """
+        try:
+            logging.info("Starting probability prediction process.")
+            transformed_feature = self.preprocessing_object.transform(dataframe)
+            return self._predict_proba_transformed(transformed_feature)
+        except Exception as e:
+            logging.error("Error occurred in predict_proba method", exc_info=True)
+            raise MyException(e, sys) from e
+
+    def predict_proba_features(self, features: np.ndarray) -> np.ndarray:
+        """
+        predict_proba on features that are already encoded and scaled.
+        """
+        try:
+            return self._predict_proba_transformed(features)
+        except Exception as e:
+            logging.error("Error occurred in predict_proba_features method", exc_info=True)
+            raise MyException(e, sys) from e
+
     def __repr__(self):
-        return f"{type(self.trained_model_object).__name__}()"
+        return f"{type(self.trained_model_object or self.packed_forest).__name__}()"
 
     def __str__(self):
-        return f"{type(self.trained_model_object).__name__}()"
\ No newline at end of file
+        return f"{type(self.trained_model_object or self.packed_forest).__name__}()"
\ No newline at end of file
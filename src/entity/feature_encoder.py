@@ -0,0 +1,248 @@
+import sys
+from typing import Callable, Dict, List, Mapping, Optional
+
+import numpy as np
+from pandas import DataFrame
+
+from src.constants import SCHEMA_FILE_PATH
+from src.exception import MyException
+from src.utils.main_utils import read_yaml_file
+
+
+class OneHotFeatureEncoder:
+    """
+    Precompiled replacement for pd.get_dummies(drop_first=True) followed by reindexing against
+    the training-time column list.
+
+    The encoder is built once from the model's feature columns. Every raw categorical code is
+    mapped straight to its output column index, and rows are written into a preallocated float
+    array. Codes that have no column (the dropped first level or unseen values) leave the row at
+    zero, the same as reindexing a get_dummies frame with fill value 0.
+    """
+
+    def __init__(self, feature_columns: List[str], categorical_columns: Optional[List[str]] = None):
+        """
+        :param feature_columns: Training-time column order (the all_columns artifact)
+        :param categorical_columns: Raw categorical columns; read from schema.yaml if not given
+        """
+        try:
+            if categorical_columns is None:
+                categorical_columns = read_yaml_file(file_path=SCHEMA_FILE_PATH)['categorical_columns']
+            self.feature_columns = [str(col) for col in feature_columns]
+            self.categorical_columns = list(categorical_columns)
+            column_index = {col: index for index, col in enumerate(self.feature_columns)}
+
+            # Non-dummy columns are copied through as they are
+            self.numeric_columns: Dict[str, int] = {
+                col: index for col, index in column_index.items()
+                if not any(col.startswith(f"{cat}_") for cat in self.categorical_columns)
+            }
+
+            # Per categorical column a lookup table: lookup[code - offset] -> output index, -1 if none
+            self.code_lookups: Dict[str, tuple] = {}
+            for cat in self.categorical_columns:
+                codes = {}
+                for col, index in column_index.items():
+                    if col.startswith(f"{cat}_") and col not in self.numeric_columns:
+                        code = col[len(cat) + 1:]
+                        if code.lstrip("-").isdigit():
+                            codes[int(code)] = index
+                if not codes:
+                    continue
+                offset = min(codes)
+                lookup = np.full(max(codes) - offset + 1, -1, dtype=np.int64)
+                for code, index in codes.items():
+                    lookup[code - offset] = index
+                self.code_lookups[cat] = (offset, lookup)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @property
+    def n_features(self) -> int:
+        return len(self.feature_columns)
+
+    def transform(self, dataframe: DataFrame) -> np.ndarray:
+        """
+        Encodes a frame of raw features (after value replacement) into a float64 array whose columns
+        follow feature_columns.
+        """
+        try:
+            n_rows = len(dataframe)
+            features = np.zeros((n_rows, self.n_features), dtype=np.float64)
+            for col, index in self.numeric_columns.items():
+                features[:, index] = dataframe[col].to_numpy(dtype=np.float64)
+
+            rows = np.arange(n_rows)
+            for cat, (offset, lookup) in self.code_lookups.items():
+                values = dataframe[cat].to_numpy(dtype=np.float64)
+                codes = values.astype(np.int64) - offset
+                known = (values == np.floor(values)) & (codes >= 0) & (codes < len(lookup))
+                target = np.where(known, lookup[np.clip(codes, 0, len(lookup) - 1)], -1)
+                hit = target >= 0
+                features[rows[hit], target[hit]] = 1.0
+            return features
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+
+class FeatureVectorizer:
+    """
+    Single-pass fast path from raw request fields to the model's input vector.
+
+    Value replacement, one-hot encoding and the fitted StandardScaler are folded into one walk over
+    the record, writing straight into a contiguous float64 vector in the ColumnTransformer's output
+    order. The arithmetic matches StandardScaler.transform, (x - mean_) / scale_, so the result is
+    bit-for-bit the same as the pandas path; verify() checks this before the fast path is used.
+
+    The value replacement rules are not written out here: they are read off the pandas path's own
+    replacement function by running it over every categorical code, and verify() compares against
+    that function, so a change to the rules cannot leave the fast path silently stale.
+    """
+
+    # Codes below and above the encoded range that are probed for replacements and sampled by
+    # sample_records(); value replacement may map them into the range (EDUCATION 0 -> 4)
+    UNSEEN_CODE_MARGIN = 8
+
+    def __init__(self, preprocessing_object: object, encoder: OneHotFeatureEncoder,
+                 replace_values: Callable[[DataFrame], DataFrame]):
+        """
+        :param preprocessing_object: Fitted preprocessing Pipeline/ColumnTransformer of the model
+        :param encoder: One-hot encoder built from the same feature columns
+        :param replace_values: Value replacement of the pandas path
+                               (CreditCardDefaultPredictor._replace_values_in_features)
+        """
+        try:
+            self.encoder = encoder
+            self.replace_values = replace_values
+            self.value_replacements = self._derive_value_replacements(replace_values, encoder)
+            n_features = encoder.n_features
+            output_source, output_mean, output_scale = self._get_output_layout(preprocessing_object, encoder.feature_columns)
+            if sorted(output_source) != list(range(n_features)):
+                raise ValueError("Preprocessing output does not map one-to-one onto the feature columns")
+
+            # position[i] is where input feature i lands in the output vector
+            self.position = np.empty(n_features, dtype=np.int64)
+            self.position[output_source] = np.arange(n_features)
+            self.mean = np.asarray(output_mean, dtype=np.float64)
+            self.scale = np.asarray(output_scale, dtype=np.float64)
+            # Output for an all-zero input, and the value a one-hot position takes when it is set
+            self.base_vector = (np.zeros(n_features) - self.mean) / self.scale
+            self.one_values = (np.ones(n_features) - self.mean) / self.scale
+
+            self.numeric_fields = [(col, int(self.position[index]), float(self.mean[self.position[index]]),
+                                    float(self.scale[self.position[index]]))
+                                   for col, index in encoder.numeric_columns.items()]
+            self.categorical_fields = [(cat, offset, [int(self.position[i]) if i >= 0 else -1 for i in lookup],
+                                        self.value_replacements.get(cat, {}))
+                                       for cat, (offset, lookup) in encoder.code_lookups.items()]
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @classmethod
+    def _probe_codes(cls, offset: int, lookup) -> np.ndarray:
+        return np.arange(offset - cls.UNSEEN_CODE_MARGIN, offset + len(lookup) + cls.UNSEEN_CODE_MARGIN)
+
+    @classmethod
+    def _derive_value_replacements(cls, replace_values: Callable[[DataFrame], DataFrame],
+                                   encoder: OneHotFeatureEncoder) -> Dict[str, Dict[int, int]]:
+        """
+        Runs replace_values over the probed codes of each categorical column (the codes
+        sample_records() covers) and returns the ones it changes.
+        """
+        probe_codes = {cat: cls._probe_codes(*encoder.code_lookups.get(cat, (0, ())))
+                       for cat in encoder.categorical_columns}
+        n_rows = max((len(codes) for codes in probe_codes.values()), default=1)
+        frame = DataFrame({col: np.zeros(n_rows) for col in encoder.numeric_columns})
+        for cat, codes in probe_codes.items():
+            frame[cat] = codes[np.arange(n_rows) % len(codes)]
+        replaced = replace_values(frame.copy())
+
+        value_replacements = {}
+        for cat in encoder.code_lookups:
+            changed = {int(code): new for code, new in zip(frame[cat], replaced[cat]) if new != code}
+            if any(new != int(new) for new in changed.values()):
+                raise ValueError(f"Value replacement of '{cat}' produces non-integer codes")
+            if changed:
+                value_replacements[cat] = {code: int(new) for code, new in changed.items()}
+        return value_replacements
+
+    @staticmethod
+    def _get_output_layout(preprocessing_object: object, feature_columns: List[str]):
+        """
+        Walks the fitted ColumnTransformer and returns, per output column, the input feature index
+        and the mean/scale applied to it. Only StandardScaler and passthrough are supported.
+        """
+        column_transformer = preprocessing_object
+        if hasattr(column_transformer, "steps"):
+            if len(column_transformer.steps) != 1:
+                raise ValueError("Only single-step preprocessing pipelines can be vectorized")
+            column_transformer = column_transformer.steps[0][1]
+
+        output_source, output_mean, output_scale = [], [], []
+        for name, transformer, columns in column_transformer.transformers_:
+            if transformer == "drop" or len(columns) == 0:
+                continue
+            indices = [feature_columns.index(col) if isinstance(col, str) else int(col) for col in columns]
+            if transformer == "passthrough" or (type(transformer).__name__ == "FunctionTransformer"
+                                                and transformer.func is None):
+                means, scales = [0.0] * len(indices), [1.0] * len(indices)
+            elif type(transformer).__name__ == "StandardScaler":
+                means = transformer.mean_ if transformer.mean_ is not None else [0.0] * len(indices)
+                scales = transformer.scale_ if transformer.scale_ is not None else [1.0] * len(indices)
+            else:
+                raise ValueError(f"Cannot vectorize transformer '{name}' of type {type(transformer).__name__}")
+            output_source.extend(indices)
+            output_mean.extend(means)
+            output_scale.extend(scales)
+        return output_source, output_mean, output_scale
+
+    def transform_record(self, record: Mapping) -> np.ndarray:
+        """
+        Turns one record of raw fields (numbers or numeric strings) into the model's input vector.
+        """
+        vector = self.base_vector.copy()
+        for col, position, mean, scale in self.numeric_fields:
+            vector[position] = (float(record[col]) - mean) / scale
+        for cat, offset, lookup, replacements in self.categorical_fields:
+            value = float(record[cat])
+            if value != value or value != int(value):
+                continue
+            code = replacements.get(int(value), int(value)) - offset
+            if 0 <= code < len(lookup) and lookup[code] >= 0:
+                vector[lookup[code]] = self.one_values[lookup[code]]
+        return vector
+
+    def transform_records(self, records: List[Mapping]) -> np.ndarray:
+        features = np.empty((len(records), self.encoder.n_features), dtype=np.float64)
+        for row, record in enumerate(records):
+            features[row] = self.transform_record(record)
+        return features
+
+    def sample_records(self, n_records: int = 32, seed: int = 0) -> List[dict]:
+        """
+        Generates synthetic raw records covering every known categorical code, for verification
+        and warm-up.
+        """
+        rng = np.random.default_rng(seed)
+        records = []
+        for row in range(n_records):
+            record = {}
+            for col, position, mean, scale in self.numeric_fields:
+                record[col] = float(np.round(mean + scale * rng.normal()))
+            for cat, offset, lookup, replacements in self.categorical_fields:
+                # Walk the codes in order, including unseen codes below and above the known range
+                codes = self._probe_codes(offset, lookup)
+                record[cat] = int(codes[row % len(codes)])
+            records.append(record)
+        return records
+
+    def verify(self, preprocessing_object: object, records: List[Mapping]) -> bool:
+        """
+        Checks that the fast path reproduces the pandas path (replace_values, one-hot encoding,
+        preprocessing_object.transform) bit-for-bit on the given records.
+        """
+        frame = self.replace_values(DataFrame.from_records(records))
+        encoded = DataFrame(self.encoder.transform(frame), columns=self.encoder.feature_columns)
+        expected = np.asarray(preprocessing_object.transform(encoded), dtype=np.float64)
+        actual = self.transform_records(records)
+        return expected.shape == actual.shape and expected.tobytes() == actual.tobytes()
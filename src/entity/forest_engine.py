@@ -0,0 +1,166 @@
+import json
+import os
+import sys
+from typing import Optional
+
+import numpy as np
+
+from src.exception import MyException
+
+# Rows per vectorized step; bounds the (n_trees, n_rows) node-index working set
+PACKED_FOREST_CHUNK_SIZE = 1024
+# Above this many rows sklearn's compiled per-tree traversal is faster than the packed arrays
+PACKED_FOREST_MAX_BATCH_ROWS = 256
+
+
+class PackedForest:
+    """
+    Array-packed inference engine for a fitted RandomForestClassifier.
+
+    All trees are flattened into contiguous NumPy arrays (feature, threshold, children, leaf value)
+    and evaluated together: every step moves the current node of every (tree, row) pair one
+    level down, so a batch costs max_depth vectorized steps instead of one Python/joblib call per
+    tree. Leaves point to themselves, so rows that reach a leaf early simply stay there.
+
+    Comparisons are done on float32 inputs against float64 thresholds and leaf probabilities are
+    accumulated tree by tree, exactly as sklearn does, so predictions are identical.
+    """
+
+    # Arrays written by save() and memory-mapped by load()
+    ARRAY_NAMES = ("node_feature", "threshold", "children", "missing_left", "value", "roots", "classes")
+
+    def __init__(self, node_feature: np.ndarray, threshold: np.ndarray, children: np.ndarray,
+                 missing_left: np.ndarray, value: np.ndarray, roots: np.ndarray, classes: np.ndarray,
+                 max_depth: int):
+        """
+        :param node_feature: Feature index tested at each node (0 for leaves)
+        :param threshold: Split threshold at each node
+        :param children: Interleaved [right, left] child of each node, so 2 * node + go_left is the
+                         next node in one gather; leaves point to themselves
+        :param missing_left: Whether NaN goes to the left child at each node
+        :param value: Normalised class probabilities at each node
+        :param roots: Root node index of each tree
+        :param classes: Class labels of the forest
+        :param max_depth: Depth of the deepest tree
+        """
+        self.node_feature = node_feature
+        self.threshold = threshold
+        self.children = children
+        self.missing_left = missing_left
+        self.value = value
+        self.roots = roots
+        self.classes = classes
+        self.max_depth = max_depth
+
+    @classmethod
+    def from_sklearn(cls, forest: object) -> "PackedForest":
+        """
+        Flattens the trees of a fitted RandomForestClassifier into one set of node arrays.
+        """
+        try:
+            if getattr(forest, "n_outputs_", 1) != 1:
+                raise ValueError("PackedForest only supports single-output classifiers")
+            features, thresholds, children, missing_lefts, values, roots = [], [], [], [], [], []
+            offset, max_depth = 0, 0
+            for estimator in forest.estimators_:
+                tree = estimator.tree_
+                node_ids = np.arange(tree.node_count, dtype=np.int64)
+                is_leaf = tree.children_left == -1
+                roots.append(offset)
+                features.append(np.where(is_leaf, 0, tree.feature))
+                thresholds.append(tree.threshold.astype(np.float64))
+                left = np.where(is_leaf, node_ids, tree.children_left) + offset
+                right = np.where(is_leaf, node_ids, tree.children_right) + offset
+                children.append(np.stack([right, left], axis=1).ravel())
+                missing_go_to_left = getattr(tree, "missing_go_to_left", None)
+                missing_lefts.append(np.zeros(tree.node_count, dtype=bool) if missing_go_to_left is None
+                                     else np.asarray(missing_go_to_left, dtype=bool))
+                # Same normalisation as DecisionTreeClassifier.predict_proba
+                proba = tree.value[:, 0, :].astype(np.float64)
+                normalizer = proba.sum(axis=1)
+                normalizer[normalizer == 0.0] = 1.0
+                values.append(proba / normalizer[:, np.newaxis])
+                offset += tree.node_count
+                max_depth = max(max_depth, tree.max_depth)
+            if 2 * offset > np.iinfo(np.int32).max:
+                raise ValueError(f"Forest has too many nodes ({offset}) for int32 node indices")
+            return cls(node_feature=np.concatenate(features).astype(np.int32),
+                       threshold=np.concatenate(thresholds),
+                       children=np.concatenate(children).astype(np.int32),
+                       missing_left=np.concatenate(missing_lefts), value=np.concatenate(values),
+                       roots=np.asarray(roots, dtype=np.int32), classes=np.asarray(forest.classes_),
+                       max_depth=max_depth)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def save(self, directory: str) -> None:
+        """
+        Writes the node arrays as .npy files (plus max_depth) into directory.
+        """
+        try:
+            os.makedirs(directory, exist_ok=True)
+            for name in self.ARRAY_NAMES:
+                np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(getattr(self, name)))
+            with open(os.path.join(directory, "forest.json"), "w") as file:
+                json.dump({"max_depth": int(self.max_depth)}, file)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @classmethod
+    def load(cls, directory: str, mmap_mode: Optional[str] = "r") -> "PackedForest":
+        """
+        Loads arrays written by save(). With mmap_mode="r" the arrays are read-only memory maps,
+        so every process that loads the same directory shares one copy in the page cache.
+        """
+        try:
+            with open(os.path.join(directory, "forest.json")) as file:
+                meta = json.load(file)
+            arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+                      for name in cls.ARRAY_NAMES}
+            return cls(max_depth=meta["max_depth"], **arrays)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.threshold)
+
+    def apply(self, features: np.ndarray) -> np.ndarray:
+        """
+        Returns the leaf node index reached in every tree, shape (n_trees, n_rows).
+        """
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        n_rows, n_cols = features.shape
+        flat_features = features.ravel()
+        nodes = np.repeat(np.asarray(self.roots)[:, np.newaxis], n_rows, axis=1)
+        row_offsets = (np.arange(n_rows, dtype=np.int32) * n_cols)[np.newaxis, :]
+        has_missing = bool(np.isnan(flat_features).any())
+        for _ in range(self.max_depth):
+            values = flat_features[row_offsets + self.node_feature[nodes]]
+            go_left = values <= self.threshold[nodes]
+            if has_missing:
+                go_left |= np.isnan(values) & self.missing_left[nodes]
+            nodes = self.children[2 * nodes + go_left]
+        return nodes
+
+    def predict_proba(self, features: np.ndarray, chunk_size: int = PACKED_FOREST_CHUNK_SIZE) -> np.ndarray:
+        try:
+            features = np.asarray(features)
+            proba = np.empty((features.shape[0], len(self.classes)), dtype=np.float64)
+            for start in range(0, features.shape[0], chunk_size):
+                leaves = self.apply(features[start:start + chunk_size])
+                chunk_proba = np.zeros((leaves.shape[1], len(self.classes)), dtype=np.float64)
+                for tree_leaves in leaves:
+                    chunk_proba += self.value[tree_leaves]
+                chunk_proba /= self.n_trees
+                proba[start:start + chunk_size] = chunk_proba
+            return proba
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def predict(self, features: np.ndarray, chunk_size: int = PACKED_FOREST_CHUNK_SIZE) -> np.ndarray:
+        return np.asarray(self.classes).take(np.argmax(self.predict_proba(features, chunk_size=chunk_size), axis=1), axis=0)
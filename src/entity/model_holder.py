@@ -0,0 +1,199 @@
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from pandas import DataFrame
+
+from src.constants import MODEL_LOAD_MMAP_MODE, MODEL_RELOAD_INTERVAL_SECONDS
+from src.entity.estimator import MyModel
+from src.entity.feature_encoder import FeatureVectorizer, OneHotFeatureEncoder
+from src.entity.s3_estimator import Proj1Estimator
+from src.entity.shared_model import SharedModelStore
+from src.exception import MyException
+from src.logger import logging
+from src.metrics import MODEL_INFO, MODEL_LOAD_LATENCY, MODEL_LOADS
+
+
+@dataclass(frozen=True)
+class ModelSnapshot:
+    model: MyModel
+    version: Optional[str]
+    loaded_at: float
+    encoder: OneHotFeatureEncoder
+    vectorizer: Optional[FeatureVectorizer]
+
+
+class ModelHolder:
+    """
+    Process-wide holder of the production model.
+
+    The model is downloaded from S3 once and shared by every request in the process. A daemon
+    thread polls the object's ETag/VersionId and swaps in a new snapshot when it changes.
+    Callers take a reference to the current snapshot, so in-flight requests keep using the old
+    model until they finish.
+    """
+
+    def __init__(self, bucket_name: str, model_path: str,
+                 reload_interval_seconds: int = MODEL_RELOAD_INTERVAL_SECONDS,
+                 inference_engine: Optional[str] = None, shared_model_dir: Optional[str] = None,
+                 shared_model_sklearn_fallback: bool = True,
+                 replace_values: Optional[Callable[[DataFrame], DataFrame]] = None,
+                 storage: Optional[object] = None):
+        """
+        :param bucket_name: Name of your model bucket
+        :param model_path: Location of your model in bucket
+        :param reload_interval_seconds: How often to check S3 for a new model version (0 disables it)
+        :param inference_engine: Engine to switch loaded models to ("sklearn"/"packed"), None keeps the saved one
+        :param shared_model_dir: Load the model through a SharedModelStore in this directory, with
+                                 the forest memory-mapped and the packed engine (None disables it)
+        :param shared_model_sklearn_fallback: Let shared models load the sklearn forest for large batches
+        :param replace_values: Value replacement of the pandas path, which the single-record fast
+                               path is built from and verified against (None disables the fast path)
+        :param storage: Storage to load the model from instead of S3 (see Proj1Estimator)
+        """
+        self.estimator = Proj1Estimator(bucket_name=bucket_name, model_path=model_path, storage=storage)
+        self.reload_interval_seconds = reload_interval_seconds
+        self.inference_engine = inference_engine
+        self.replace_values = replace_values
+        self.shared_model_store = (SharedModelStore(shared_model_dir, sklearn_fallback=shared_model_sklearn_fallback)
+                                   if shared_model_dir else None)
+        self._snapshot: Optional[ModelSnapshot] = None
+        self._load_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    def get_snapshot(self) -> ModelSnapshot:
+        """
+        Returns the current model snapshot, loading it on first use.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        try:
+            with self._load_lock:
+                if self._snapshot is None:
+                    self._snapshot = self._load_snapshot(self.estimator.get_model_version())
+                    self._start_watcher()
+                return self._snapshot
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def refresh(self) -> bool:
+        """
+        Checks the model version in S3 and swaps in the new model if it has changed.
+        :return: True if a new model was loaded
+        """
+        try:
+            version = self.estimator.get_model_version()
+            if version is None:
+                logging.warning(f"Model {self.estimator.model_path} not found in {self.estimator.bucket_name}, keeping current model")
+                return False
+            current = self._snapshot
+            if current is not None and current.version == version:
+                return False
+            with self._load_lock:
+                current = self._snapshot
+                if current is not None and current.version == version:
+                    return False
+                # Load outside of any reader path; the assignment below is the atomic swap.
+                self._snapshot = self._load_snapshot(version)
+            logging.info(f"Swapped production model from version {current.version if current else None} to {version}")
+            return True
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def stop(self) -> None:
+        """
+        Stops the background version watcher.
+        """
+        self._stop_event.set()
+
+    def _load_snapshot(self, version: Optional[str]) -> ModelSnapshot:
+        logging.info(f"Loading production model version {version}")
+        start = time.perf_counter()
+        try:
+            if self.shared_model_store is not None:
+                model = self.shared_model_store.load_or_export(version, self._load_model)
+            else:
+                model = self._load_model()
+                if self.inference_engine:
+                    model.set_inference_engine(self.inference_engine)
+            encoder = OneHotFeatureEncoder(feature_columns=model.get_feature_columns())
+            snapshot = ModelSnapshot(model=model, version=version, loaded_at=time.time(), encoder=encoder,
+                                     vectorizer=self._build_vectorizer(model, encoder))
+        except Exception:
+            MODEL_LOADS.inc(outcome="error")
+            raise
+        MODEL_LOADS.inc(outcome="success")
+        MODEL_LOAD_LATENCY.observe(time.perf_counter() - start)
+        MODEL_INFO.replace(1, version=version)
+        return snapshot
+
+    def _load_model(self) -> MyModel:
+        # Arrays of "mmap" artifacts are mapped read-only instead of copied out of the file
+        return self.estimator.load_model(mmap_mode=MODEL_LOAD_MMAP_MODE)
+
+    def _build_vectorizer(self, model: MyModel, encoder: OneHotFeatureEncoder) -> Optional[FeatureVectorizer]:
+        """
+        Builds the single-record fast path and checks it against the pandas path.
+        Returns None (pandas path only) if the preprocessing cannot be folded or does not match.
+        """
+        if self.replace_values is None:
+            logging.info("No value replacement function given, the fast path is disabled")
+            return None
+        try:
+            vectorizer = FeatureVectorizer(preprocessing_object=model.preprocessing_object, encoder=encoder,
+                                           replace_values=self.replace_values)
+            if not vectorizer.verify(model.preprocessing_object, vectorizer.sample_records()):
+                logging.warning("Fast path does not match the pandas path bit-for-bit, it is disabled for this model")
+                return None
+            return vectorizer
+        except Exception as e:
+            logging.warning(f"Fast path is not available for this model: {e}")
+            return None
+
+    def _start_watcher(self) -> None:
+        if self.reload_interval_seconds <= 0 or self._watcher is not None:
+            return
+        self._watcher = threading.Thread(target=self._watch, name="model-version-watcher", daemon=True)
+        self._watcher.start()
+
+    def _watch(self) -> None:
+        while not self._stop_event.wait(self.reload_interval_seconds):
+            try:
+                self.refresh()
+            except Exception as e:
+                logging.error(f"Model version check failed, keeping current model: {e}")
+
+
+_model_holders: Dict[Tuple[str, str], ModelHolder] = {}
+_model_holders_lock = threading.Lock()
+
+
+def get_model_holder(bucket_name: str, model_path: str,
+                     reload_interval_seconds: int = MODEL_RELOAD_INTERVAL_SECONDS,
+                     inference_engine: Optional[str] = None,
+                     shared_model_dir: Optional[str] = None,
+                     shared_model_sklearn_fallback: bool = True,
+                     replace_values: Optional[Callable[[DataFrame], DataFrame]] = None,
+                     storage: Optional[object] = None) -> ModelHolder:
+    """
+    Returns the shared ModelHolder for a bucket/key pair, creating it on first use.
+    """
+    key = (bucket_name, model_path)
+    holder = _model_holders.get(key)
+    if holder is None:
+        with _model_holders_lock:
+            holder = _model_holders.get(key)
+            if holder is None:
+                holder = ModelHolder(bucket_name=bucket_name, model_path=model_path,
+                                     reload_interval_seconds=reload_interval_seconds,
+                                     inference_engine=inference_engine,
+                                     shared_model_dir=shared_model_dir,
+                                     shared_model_sklearn_fallback=shared_model_sklearn_fallback,
+                                     replace_values=replace_values,
+                                     storage=storage)
+                _model_holders[key] = holder
+    return holder
@@ -0,0 +1,136 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.entity.config_entity import PredictionCacheConfig
+
+
+class PredictionCache:
+    """
+    Bounded in-process cache of predictions, keyed by the model input vector.
+
+    Keys are a hash of the model version and the row of the scaled feature matrix the model sees,
+    so records that differ only in formatting ("1" vs 1.0, codes remapped by value replacement,
+    unseen categories) share an entry. Entries are evicted least-recently-used once max_entries is
+    reached and expire ttl_seconds after they were stored. The whole cache is dropped as soon as a
+    lookup comes in for a different model version, i.e. when the model has been swapped.
+
+    Each process has its own cache; with the process-pool prediction executor the counters only
+    cover the worker they are read from.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, max_batch_rows: int):
+        """
+        :param max_entries: Maximum number of cached rows (0 disables the cache)
+        :param ttl_seconds: How long a cached prediction stays valid
+        :param max_batch_rows: Batches with more rows than this bypass the cache
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_batch_rows = max_batch_rows
+        self._entries: "OrderedDict[bytes, Tuple[float, object]]" = OrderedDict()
+        self._model_version: Optional[str] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def accepts(self, n_rows: int) -> bool:
+        return self.enabled and 0 < n_rows <= self.max_batch_rows
+
+    @staticmethod
+    def make_keys(model_version: Optional[str], features: np.ndarray) -> List[bytes]:
+        """
+        Hashes every row of the model input matrix together with the model version.
+        """
+        # Adding 0.0 folds -0.0 into 0.0 so both hash the same
+        features = np.ascontiguousarray(features, dtype=np.float64) + 0.0
+        prefix = str(model_version).encode()
+        return [hashlib.blake2b(prefix + row.tobytes(), digest_size=16).digest() for row in features]
+
+    def get_many(self, model_version: Optional[str], keys: List[bytes]) -> List[Optional[object]]:
+        """
+        Looks up the keys; misses and expired entries come back as None.
+        """
+        now = time.monotonic()
+        results = []
+        with self._lock:
+            self._check_version(model_version)
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and now - entry[0] > self.ttl_seconds:
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+                if entry is None:
+                    self.misses += 1
+                    results.append(None)
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    results.append(entry[1])
+        return results
+
+    def put_many(self, model_version: Optional[str], keys: List[bytes], values) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._check_version(model_version)
+            for key, value in zip(keys, values):
+                self._entries[key] = (now, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _check_version(self, model_version: Optional[str]) -> None:
+        # Called with the lock held
+        if model_version != self._model_version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._model_version = model_version
+
+    def as_dict(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "model_version": self._model_version,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+_prediction_cache: Optional[PredictionCache] = None
+_prediction_cache_lock = threading.Lock()
+
+
+def get_prediction_cache(prediction_cache_config: PredictionCacheConfig = PredictionCacheConfig()) -> PredictionCache:
+    """
+    Returns the process-wide prediction cache, creating it on first use.
+    """
+    global _prediction_cache
+    if _prediction_cache is None:
+        with _prediction_cache_lock:
+            if _prediction_cache is None:
+                _prediction_cache = PredictionCache(max_entries=prediction_cache_config.max_entries,
+                                                    ttl_seconds=prediction_cache_config.ttl_seconds,
+                                                    max_batch_rows=prediction_cache_config.max_batch_rows)
+    return _prediction_cache
@@ -0,0 +1,89 @@
+import sys
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError, confloat, create_model
+
+from src.constants import SCHEMA_FILE_PATH, TARGET_COLUMN
+from src.exception import MyException
+from src.utils.main_utils import read_yaml_file
+
+# Python type each schema.yaml column type is coerced to
+SCHEMA_TYPES = {"int": int, "category": int, "float": float}
+
+
+def build_record_model(schema_config: dict, model_name: str = "CreditCardRecord") -> Type[BaseModel]:
+    """
+    Generates a pydantic model for one input record from the schema.yaml columns.
+
+    Feature columns are required and coerced to their schema type ("2" -> 2, "1000.5" -> 1000.5).
+    Drop columns such as ID are optional and passed through. Unknown fields are ignored.
+    """
+    try:
+        drop_columns = set(schema_config["drop_columns"])
+        fields: Dict[str, Any] = {}
+        for column in schema_config["columns"]:
+            name, column_type = list(column.items())[0]
+            if name == TARGET_COLUMN or name.startswith("_"):
+                continue
+            if column_type not in SCHEMA_TYPES:
+                raise ValueError(f"Unsupported schema type '{column_type}' for column {name}")
+            python_type = SCHEMA_TYPES[column_type]
+            if name in drop_columns:
+                fields[name] = (Optional[python_type], Field(default=None))
+            else:
+                fields[name] = (python_type, ...)
+        return create_model(model_name, __config__=ConfigDict(extra="ignore"), **fields)
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+CreditCardRecord = build_record_model(read_yaml_file(file_path=SCHEMA_FILE_PATH))
+
+
+class ProbaRequest(BaseModel):
+    records: List[CreditCardRecord]
+    # Checked here so out-of-range thresholds are rejected with a 422 before any scoring
+    thresholds: List[confloat(ge=0, le=1, allow_inf_nan=False)] = Field(default_factory=lambda: [0.5], min_length=1)
+
+
+_records_adapter = TypeAdapter(List[CreditCardRecord])
+
+
+def _dump(record: BaseModel) -> Dict[str, Any]:
+    return record.model_dump(exclude_none=True)
+
+
+def parse_record(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validates and coerces one record (e.g. form fields). Raises pydantic.ValidationError.
+    """
+    return _dump(CreditCardRecord.model_validate(data))
+
+
+def parse_record_json(raw: bytes) -> Dict[str, Any]:
+    """
+    Parses and validates one JSON object in a single pass. Raises pydantic.ValidationError.
+    """
+    return _dump(CreditCardRecord.model_validate_json(raw))
+
+
+def parse_records_json(raw: bytes) -> List[Dict[str, Any]]:
+    """
+    Parses and validates a JSON array of records in a single pass. Raises pydantic.ValidationError.
+    """
+    return [_dump(record) for record in _records_adapter.validate_json(raw)]
+
+
+def parse_proba_request_json(raw: bytes) -> Tuple[List[Dict[str, Any]], List[float]]:
+    """
+    Parses {"records": [...], "thresholds": [...]} in a single pass. Raises pydantic.ValidationError.
+    """
+    request = ProbaRequest.model_validate_json(raw)
+    return [_dump(record) for record in request.records], request.thresholds
+
+
+def format_validation_error(error: ValidationError, limit: int = 20) -> List[Dict[str, Any]]:
+    """
+    Turns a ValidationError into a short list of {"loc", "msg"} entries for the response.
+    """
+    return [{"loc": list(item["loc"]), "msg": item["msg"]} for item in error.errors()[:limit]]
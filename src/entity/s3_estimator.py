@@ -2,6 +2,7 @@ from src.cloud_storage.aws_storage import SimpleStorageService
 from src.exception import MyException
 from src.entity.estimator import MyModel
 import sys
+from typing import Optional
 from pandas import DataFrame
 
 
@@ -10,13 +11,14 @@ class Proj1Estimator:
     This class is used to save and retrieve our model from s3 bucket and to do prediction
     """
 
-    def __init__(self,bucket_name,model_path,):
+    def __init__(self,bucket_name,model_path,storage=None):
         """
         :param bucket_name: Name of your model bucket
         :param model_path: Location of your model in bucket
+        :param storage: Object with the SimpleStorageService interface to use instead of S3
         """
         self.bucket_name = bucket_name
-        self.s3 = SimpleStorageService()
+        self.s3 = storage if storage is not None else SimpleStorageService()
         self.model_path = model_path
         self.loaded_model:MyModel=None
 
@@ -28,13 +30,23 @@ class Proj1Estimator:
             print(e)
             return False
 
-    def load_model(self,)->MyModel:
+    def get_model_version(self):
+        """
+        Returns the ETag/VersionId of the model object in the bucket, or None if it is absent
+        """
+        try:
+            return self.s3.get_object_version(bucket_name=self.bucket_name, s3_key=self.model_path)
+        except Exception as e:
+            raise MyException(e, sys)
+
+    def load_model(self, mmap_mode: Optional[str] = None)->MyModel:
         """
         Load the model from the model_path
+        :param mmap_mode: "r" or "c" to memory-map the arrays of models saved with artifact_format="mmap"
         :return:
         """
 
-        return self.s3.load_model(self.model_path,bucket_name=self.bucket_name)
+        return self.s3.load_model(self.model_path,bucket_name=self.bucket_name,mmap_mode=mmap_mode)
 
     def save_model(self,from_file,remove:bool=False)->None:
         """
@@ -0,0 +1,148 @@
+import copy
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from typing import Callable, Optional
+
+from src.entity.estimator import MyModel
+from src.entity.forest_engine import PackedForest
+from src.exception import MyException
+from src.logger import logging
+from src.utils.main_utils import load_object, save_object
+
+
+class LazySklearnForest:
+    """
+    Loads the sklearn forest of an exported version the first time it is called and keeps it for
+    the life of the process. Thread-safe, so concurrent large batches load it once.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._forest: Optional[object] = None
+        self._lock = threading.Lock()
+
+    def __call__(self) -> object:
+        if self._forest is None:
+            with self._lock:
+                if self._forest is None:
+                    logging.info(f"Loading the sklearn forest from {self.file_path} for a large batch")
+                    self._forest = load_object(self.file_path)
+        return self._forest
+
+
+class SharedModelStore:
+    """
+    Local on-disk copy of the production model that several server workers can share.
+
+    A model is exported once per version as a directory holding the packed forest node arrays as
+    .npy files, a small pickle of the rest of MyModel (preprocessing object, feature columns) and
+    the sklearn forest in a file of its own. Workers load the model with the node arrays
+    memory-mapped read-only, so the forest lives once in the OS page cache instead of once per
+    worker.
+
+    The packed engine is several times slower than sklearn above PACKED_FOREST_MAX_BATCH_ROWS. With
+    sklearn_fallback (the default) a worker loads the sklearn forest the first time it gets such a
+    batch (file chunks, large /predict/batch requests) and uses it for large batches from then on,
+    so only workers that serve large batches pay its memory. With sklearn_fallback=False every
+    batch runs on the packed engine and memory stays at the shared forest (see
+    benchmarks/shared_model_benchmark.py). Exports are written
+    to a temporary directory and renamed into place, so a worker never sees a half-written model
+    and concurrent exports of the same version are harmless.
+    """
+
+    MODEL_FILE_NAME = "model.pkl"
+    FOREST_DIR_NAME = "forest"
+    SKLEARN_FOREST_FILE_NAME = "sklearn_forest.pkl"
+
+    def __init__(self, root_dir: str, keep_versions: int = 2, sklearn_fallback: bool = True):
+        """
+        :param root_dir: Directory the exported model versions are kept in
+        :param keep_versions: Number of most recent versions kept on disk
+        :param sklearn_fallback: Load the sklearn forest on demand for batches too large for the
+                                 packed engine (False runs every batch on the packed engine)
+        """
+        self.root_dir = root_dir
+        self.keep_versions = keep_versions
+        self.sklearn_fallback = sklearn_fallback
+
+    def get_version_dir(self, version: Optional[str]) -> str:
+        # Version ids may contain characters that are not valid in file names
+        digest = hashlib.sha1(str(version).encode()).hexdigest()[:16]
+        return os.path.join(self.root_dir, digest)
+
+    def has_version(self, version: Optional[str]) -> bool:
+        return os.path.exists(os.path.join(self.get_version_dir(version), self.MODEL_FILE_NAME))
+
+    def export(self, model: MyModel, version: Optional[str]) -> str:
+        """
+        Writes model as a shared version directory, unless it already exists.
+        :return: the version directory
+        """
+        try:
+            version_dir = self.get_version_dir(version)
+            if self.has_version(version):
+                return version_dir
+            os.makedirs(self.root_dir, exist_ok=True)
+            packed_forest = getattr(model, "packed_forest", None) or PackedForest.from_sklearn(model.trained_model_object)
+
+            staging_dir = tempfile.mkdtemp(prefix=".export-", dir=self.root_dir)
+            try:
+                packed_forest.save(os.path.join(staging_dir, self.FOREST_DIR_NAME))
+                if model.trained_model_object is not None:
+                    save_object(os.path.join(staging_dir, self.SKLEARN_FOREST_FILE_NAME), model.trained_model_object)
+                light_model = copy.copy(model)
+                light_model.trained_model_object = None
+                light_model.packed_forest = None
+                light_model.inference_engine = "packed"
+                save_object(os.path.join(staging_dir, self.MODEL_FILE_NAME), light_model)
+                os.rename(staging_dir, version_dir)
+                logging.info(f"Exported shared model version {version} to {version_dir}")
+            except OSError:
+                # Another worker renamed the same version into place first
+                shutil.rmtree(staging_dir, ignore_errors=True)
+                if not self.has_version(version):
+                    raise
+            self._remove_old_versions(keep=version_dir)
+            return version_dir
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def load(self, version: Optional[str]) -> MyModel:
+        """
+        Loads an exported version with the forest arrays memory-mapped read-only. The sklearn forest
+        is not loaded until a batch needs it, see sklearn_fallback.
+        """
+        try:
+            version_dir = self.get_version_dir(version)
+            model: MyModel = load_object(os.path.join(version_dir, self.MODEL_FILE_NAME))
+            model.packed_forest = PackedForest.load(os.path.join(version_dir, self.FOREST_DIR_NAME), mmap_mode="r")
+            sklearn_forest_path = os.path.join(version_dir, self.SKLEARN_FOREST_FILE_NAME)
+            if self.sklearn_fallback and os.path.exists(sklearn_forest_path):
+                model.sklearn_forest_loader = LazySklearnForest(sklearn_forest_path)
+            return model
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def load_or_export(self, version: Optional[str], load_model: Callable[[], MyModel]) -> MyModel:
+        """
+        Loads version from the store, exporting it from load_model() first if it is not there yet.
+        """
+        try:
+            if not self.has_version(version):
+                self.export(load_model(), version)
+            return self.load(version)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def _remove_old_versions(self, keep: str) -> None:
+        # Workers still mapping a removed version keep reading it until they unmap it
+        version_dirs = [os.path.join(self.root_dir, name) for name in os.listdir(self.root_dir)
+                        if not name.startswith(".")]
+        version_dirs.sort(key=os.path.getmtime, reverse=True)
+        for version_dir in version_dirs[self.keep_versions:]:
+            if version_dir != keep:
+                shutil.rmtree(version_dir, ignore_errors=True)
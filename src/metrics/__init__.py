@@ -0,0 +1,227 @@
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Latency buckets in seconds, from the fast record path (tens of microseconds) to an S3 model load
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+def _format_labels(label_names: Sequence[str], label_values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class _Metric:
+    TYPE = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.TYPE}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    TYPE = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.label_names, key)} {value}"
+                    for key, value in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    TYPE = "gauge"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def replace(self, value: float, **labels) -> None:
+        """
+        Sets the gauge for labels and drops every other label set (e.g. the previous model version).
+        """
+        with self._lock:
+            self._values = {self._key(labels): value}
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.label_names, key)} {value}"
+                    for key, value in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    TYPE = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (last one is +Inf), sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(float(bound))
+                    labels = _format_labels(self.label_names, key, 'le="' + le + '"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Minimal in-process metrics registry rendering the Prometheus text exposition format.
+
+    Recording a value is a dictionary lookup and an increment under a lock, so the
+    instrumentation can stay on in production. Metrics are per process: with several server
+    workers or the process-pool prediction executor each process reports its own numbers.
+    """
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, label_names))
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, label_names, buckets))
+
+    def _register(self, metric: _Metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+STAGE_LATENCY = registry.histogram(
+    "credit_prediction_stage_seconds", "Time spent in each stage of the prediction path", ("stage",))
+REQUEST_LATENCY = registry.histogram(
+    "credit_http_request_seconds", "End-to-end latency of prediction service routes", ("route",))
+REQUESTS = registry.counter(
+    "credit_http_requests_total", "Requests to prediction service routes by outcome", ("route", "outcome"))
+MODEL_LOADS = registry.counter(
+    "credit_model_loads_total", "Production model loads by outcome", ("outcome",))
+MODEL_LOAD_LATENCY = registry.histogram(
+    "credit_model_load_seconds", "Time to download, unpickle and prepare the production model")
+MODEL_INFO = registry.gauge(
+    "credit_model_info", "Version of the production model currently served", ("version",))
+MICRO_BATCH_SIZE = registry.histogram(
+    "credit_micro_batch_size", "Rows per micro-batch scored by the single-record scheduler",
+    buckets=BATCH_SIZE_BUCKETS)
+MODEL_CACHE_LOOKUPS = registry.counter(
+    "credit_model_cache_lookups_total", "Local model cache lookups by outcome (hit, miss, corrupt)", ("outcome",))
+S3_METADATA_LOOKUPS = registry.counter(
+    "credit_s3_metadata_lookups_total", "S3 object metadata lookups by outcome (hit, miss)", ("outcome",))
+S3_TRANSFER_BYTES = registry.counter(
+    "credit_s3_transfer_bytes_total", "Bytes transferred to and from S3 by direction", ("direction",))
+S3_TRANSFER_LATENCY = registry.histogram(
+    "credit_s3_transfer_seconds", "Duration of S3 file transfers by direction", ("direction",))
+ADMISSION_IN_FLIGHT = registry.gauge(
+    "credit_admission_in_flight", "Prediction requests currently running, by admission pool", ("pool",))
+ADMISSION_QUEUE_DEPTH = registry.gauge(
+    "credit_admission_queue_depth", "Prediction requests waiting for a concurrency slot", ("route",))
+ADMISSION_WAIT = registry.histogram(
+    "credit_admission_wait_seconds", "Time admitted prediction requests waited for a slot", ("route",))
+ADMISSION_SHED = registry.counter(
+    "credit_admission_shed_total", "Prediction requests rejected without being run, by reason",
+    ("route", "reason"))
+SHADOW_RECORDS = registry.counter(
+    "credit_shadow_records_total",
+    "Records sent to the candidate model by outcome (agree, disagree, dropped, error)", ("outcome",))
+SHADOW_LATENCY = registry.histogram(
+    "credit_shadow_batch_seconds", "Time the candidate model takes to score one shadowed request")
+SHADOW_QUEUE_DEPTH = registry.gauge(
+    "credit_shadow_queue_depth", "Shadowed requests waiting for the candidate model")
+
+
+def track_request(route: str) -> Callable:
+    """
+    Decorator for async FastAPI routes: records latency and counts the request as "success", or as
+    "error" when the route raises, returns the repo's {"status": False, ...} error payload or a
+    response with a 4xx/5xx status code.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                result = await func(*args, **kwargs)
+                failed = ((isinstance(result, dict) and result.get("status") is False)
+                          or getattr(result, "status_code", 200) >= 400)
+                if not failed:
+                    outcome = "success"
+                return result
+            finally:
+                REQUEST_LATENCY.observe(time.perf_counter() - start, route=route)
+                REQUESTS.inc(route=route, outcome=outcome)
+        return wrapper
+    return decorator
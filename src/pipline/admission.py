@@ -0,0 +1,205 @@
+import asyncio
+import functools
+import math
+import time
+from typing import Callable, Dict, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+
+from src.entity.config_entity import AdmissionConfig
+from src.logger import logging
+from src.metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_DEPTH, ADMISSION_SHED, ADMISSION_WAIT
+from src.utils.http_utils import FastJSONResponse
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a request is shed instead of being queued.
+    """
+
+    def __init__(self, status_code: int, reason: str, message: str, retry_after: float):
+        super().__init__(message)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class SlotReleasingResponse(Response):
+    """
+    Sends a streaming response and then frees the admission slot its request holds, whether the
+    stream ends normally, fails or the client goes away.
+    """
+
+    def __init__(self, response: StreamingResponse, release: Callable[[], None]):
+        super().__init__(status_code=response.status_code)
+        self.raw_headers = response.raw_headers
+        self.response = response
+        self.release = release
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await self.response(scope, receive, send)
+        finally:
+            self.release()
+        if self.background is not None:
+            await self.background()
+
+
+class AdmissionController:
+    """
+    Bounds the number of prediction requests running at once and sheds the ones that cannot finish
+    within their deadline, instead of letting work pile up behind slow predict calls.
+
+    At most max_concurrent requests run at a time and at most max_queue wait for a slot.
+    A request is rejected right away:
+    - with 429 when max_queue requests are already waiting;
+    - with 503 when the queue ahead of it, at the recent per-request service time, would not let
+      it finish before its deadline.
+    A request whose slot does not free up before the deadline is rejected with 503 as well.
+    Once admitted, a request runs to completion (the executor cannot interrupt a running predict).
+
+    Routes that stream their response (file and NDJSON scoring) hold their slot until the response
+    has been sent; their time is kept out of the service time estimate, so for them the deadline
+    only bounds the wait for a slot.
+
+    Limits apply per server process. All state is only touched from the event loop.
+    """
+
+    # Weight of the latest request in the moving average of the service time
+    SERVICE_TIME_SMOOTHING = 0.2
+
+    def __init__(self, admission_config: AdmissionConfig = AdmissionConfig(), name: str = "predict"):
+        """
+        :param admission_config: Concurrency, queue and deadline limits
+        :param name: Pool label of the in-flight metric, for running several controllers
+        """
+        self.admission_config = admission_config
+        self.name = name
+        self.in_flight = 0
+        self.waiting = 0
+        self.waiting_by_route: Dict[str, int] = {}
+        self.service_time: float = 0.0
+        self.admitted = 0
+        self.shed: Dict[str, int] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def get_deadline(self, request: Request) -> float:
+        """
+        Returns the request's time budget in seconds: the configured deadline, or the shorter one
+        the client asked for in the deadline header.
+        """
+        deadline_ms = self.admission_config.deadline_ms
+        header = request.headers.get(self.admission_config.deadline_header)
+        if header:
+            try:
+                deadline_ms = min(deadline_ms, max(float(header), 0.0))
+            except ValueError:
+                logging.warning(f"Ignoring invalid {self.admission_config.deadline_header} header: {header}")
+        return deadline_ms / 1000
+
+    def estimate_wait(self) -> float:
+        """
+        Estimated time until a new request would get a slot, from the queue ahead of it.
+        """
+        if self._semaphore is None or not self._semaphore.locked():
+            return 0.0
+        return math.ceil((self.waiting + 1) / self.admission_config.max_concurrent) * self.service_time
+
+    async def acquire(self, deadline: float, route: str) -> None:
+        """
+        Takes a free concurrency slot, or waits for one if the request can still meet its deadline.
+        Raises AdmissionRejected otherwise.
+        :param deadline: Time budget of the request in seconds
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.admission_config.max_concurrent)
+        start = time.perf_counter()
+        if not self._semaphore.locked():
+            # A slot is free and nobody is queued: acquire() returns without suspending
+            await self._semaphore.acquire()
+        else:
+            if self.waiting >= self.admission_config.max_queue:
+                self._reject(429, "queue_full", route,
+                             f"Too many requests waiting ({self.waiting}), try again later")
+            if self.estimate_wait() + self.service_time > deadline:
+                self._reject(503, "deadline", route,
+                             f"Request cannot be served within its {deadline * 1000:.0f} ms deadline")
+            self._set_waiting(route, 1)
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=deadline)
+            except asyncio.TimeoutError:
+                self._reject(503, "timeout", route,
+                             f"No capacity to serve the request within its {deadline * 1000:.0f} ms deadline")
+            finally:
+                self._set_waiting(route, -1)
+        ADMISSION_WAIT.observe(time.perf_counter() - start, route=route)
+        self.in_flight += 1
+        self.admitted += 1
+        ADMISSION_IN_FLIGHT.set(self.in_flight, pool=self.name)
+
+    def _set_waiting(self, route: str, change: int) -> None:
+        self.waiting += change
+        self.waiting_by_route[route] = self.waiting_by_route.get(route, 0) + change
+        ADMISSION_QUEUE_DEPTH.set(self.waiting_by_route[route], route=route)
+
+    def release(self, service_time: Optional[float]) -> None:
+        """
+        Frees the slot of a finished request and updates the service time estimate.
+        :param service_time: Run time of the request, None to leave the estimate as it is
+        """
+        self.in_flight -= 1
+        ADMISSION_IN_FLIGHT.set(self.in_flight, pool=self.name)
+        if service_time is not None and self.service_time == 0.0:
+            self.service_time = service_time
+        elif service_time is not None:
+            self.service_time += self.SERVICE_TIME_SMOOTHING * (service_time - self.service_time)
+        self._semaphore.release()
+
+    def limit(self, route: str, streaming: bool = False) -> Callable:
+        """
+        Decorator for async FastAPI routes that take a `request: Request` argument: runs the route
+        only once it is admitted and answers 429/503 with a Retry-After header otherwise.
+        :param streaming: The route returns a StreamingResponse; its slot is held until the response
+                          has been sent, and its time is not counted as service time
+        """
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                try:
+                    await self.acquire(self.get_deadline(kwargs["request"]), route)
+                except AdmissionRejected as e:
+                    return FastJSONResponse({"status": False, "error": f"{e}"}, status_code=e.status_code,
+                                            headers={"Retry-After": str(math.ceil(e.retry_after))})
+                start = time.perf_counter()
+                try:
+                    response = await func(*args, **kwargs)
+                except BaseException:
+                    self.release(None if streaming else time.perf_counter() - start)
+                    raise
+                if streaming and isinstance(response, StreamingResponse):
+                    return SlotReleasingResponse(response, functools.partial(self.release, None))
+                self.release(None if streaming else time.perf_counter() - start)
+                return response
+            return wrapper
+        return decorator
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "pool": self.name,
+            "max_concurrent": self.admission_config.max_concurrent,
+            "max_queue": self.admission_config.max_queue,
+            "deadline_ms": self.admission_config.deadline_ms,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "waiting_by_route": {route: count for route, count in self.waiting_by_route.items() if count},
+            "service_time_ms": self.service_time * 1000,
+            "admitted": self.admitted,
+            "shed": dict(self.shed),
+        }
+
+    def _reject(self, status_code: int, reason: str, route: str, message: str) -> None:
+        self.shed[reason] = self.shed.get(reason, 0) + 1
+        ADMISSION_SHED.inc(route=route, reason=reason)
+        raise AdmissionRejected(status_code, reason, message,
+                                retry_after=max(self.estimate_wait(), self.service_time, 1.0))
@@ -0,0 +1,134 @@
+import itertools
+import json
+import os
+import sys
+from typing import BinaryIO, Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from src.constants import PREDICTION_CHUNK_SIZE
+from src.exception import MyException
+from src.logger import logging
+from src.pipline.prediction_pipeline import CreditCardDefaultPredictor
+
+SUPPORTED_INPUT_FORMATS = ("csv", "parquet")
+SUPPORTED_OUTPUT_FORMATS = ("csv", "ndjson")
+
+
+def detect_file_format(filename: str) -> str:
+    """
+    Infers the input format of an uploaded file from its extension.
+    """
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension in (".parquet", ".pq"):
+        return "parquet"
+    if extension in (".csv", ".txt", ""):
+        return "csv"
+    raise ValueError(f"Unsupported file extension '{extension}', expected one of {SUPPORTED_INPUT_FORMATS}")
+
+
+def iter_file_chunks(file_obj: BinaryIO, file_format: str, chunk_size: int = PREDICTION_CHUNK_SIZE) -> Iterator[DataFrame]:
+    """
+    Yields fixed-size DataFrame chunks from a CSV or Parquet file without reading the whole file.
+    Parquet support needs the optional pyarrow dependency.
+    """
+    try:
+        if file_format == "csv":
+            yield from pd.read_csv(file_obj, chunksize=chunk_size)
+        elif file_format == "parquet":
+            try:
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise ImportError("Scoring Parquet files requires pyarrow: pip install pyarrow") from e
+            parquet_file = pq.ParquetFile(file_obj)
+            for record_batch in parquet_file.iter_batches(batch_size=chunk_size):
+                yield record_batch.to_pandas()
+        else:
+            raise ValueError(f"Unsupported input format '{file_format}', expected one of {SUPPORTED_INPUT_FORMATS}")
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+class ChunkedFileScorer:
+    """
+    Scores a stream of DataFrame chunks through CreditCardDefaultPredictor and renders the
+    predictions chunk by chunk, so neither the input nor the output is held in memory at once.
+    """
+
+    def __init__(self, predictor: CreditCardDefaultPredictor = None):
+        self.predictor = predictor if predictor is not None else CreditCardDefaultPredictor()
+        self.feature_columns = self.predictor.get_feature_columns()
+        self.id_columns = [col for col in self.predictor._schema_config['drop_columns'] if col != "_id"]
+
+    def validate_columns(self, chunk: DataFrame) -> None:
+        missing_cols = [col for col in self.feature_columns if col not in chunk.columns]
+        if missing_cols:
+            raise ValueError(f"Input file is missing columns: {missing_cols}")
+
+    def peek(self, chunks: Iterator[DataFrame]) -> Iterator[DataFrame]:
+        """
+        Reads and validates the first chunk up front, so a malformed file is reported
+        before any of the streamed response has been sent.
+        """
+        try:
+            chunks = iter(chunks)
+            try:
+                first_chunk = next(chunks, None)
+                if first_chunk is None:
+                    return iter(())
+                self.validate_columns(first_chunk)
+            except Exception:
+                # Close the reader now; left to the garbage collector it fails on the closed upload
+                if hasattr(chunks, "close"):
+                    chunks.close()
+                raise
+            return itertools.chain([first_chunk], chunks)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def score_chunks(self, chunks: Iterator[DataFrame], row_offset: int = 0) -> Iterator[Tuple[DataFrame, np.ndarray]]:
+        """
+        Yields each chunk's identifier frame (row number plus any ID column) with its predictions.
+        :param row_offset: Row number of the first row of the first chunk
+        """
+        try:
+            for chunk in chunks:
+                self.validate_columns(chunk)
+                ids = pd.DataFrame({"row": np.arange(row_offset, row_offset + len(chunk))})
+                for col in self.id_columns:
+                    if col in chunk.columns:
+                        ids[col] = chunk[col].to_numpy()
+                predictions = self.predictor.predict(dataframe=chunk[self.feature_columns].copy())
+                row_offset += len(chunk)
+                logging.info(f"Scored {row_offset} rows so far")
+                yield ids, np.asarray(predictions).astype(int)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def iter_csv(self, chunks: Iterator[DataFrame]) -> Iterator[str]:
+        """
+        Renders scored chunks as CSV text, writing the header once.
+        """
+        header_written = False
+        for ids, predictions in self.score_chunks(chunks):
+            ids["prediction"] = predictions
+            yield ids.to_csv(index=False, header=not header_written)
+            header_written = True
+
+    def iter_ndjson(self, chunks: Iterator[DataFrame]) -> Iterator[str]:
+        """
+        Renders scored chunks as newline-delimited JSON, one object per input row.
+        """
+        for ids, predictions in self.score_chunks(chunks):
+            ids["prediction"] = predictions
+            records = ids.to_dict(orient="records")
+            yield "".join(json.dumps(record, default=int) + "\n" for record in records)
+
+    def iter_output(self, chunks: Iterator[DataFrame], output_format: str) -> Iterator[str]:
+        if output_format == "csv":
+            return self.iter_csv(chunks)
+        if output_format == "ndjson":
+            return self.iter_ndjson(chunks)
+        raise ValueError(f"Unsupported output format '{output_format}', expected one of {SUPPORTED_OUTPUT_FORMATS}")
@@ -0,0 +1,68 @@
+import asyncio
+import functools
+import multiprocessing
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from src.entity.config_entity import ExecutorConfig
+from src.exception import MyException
+from src.logger import logging
+
+
+class PipelineExecutor:
+    """
+    Runs blocking pipeline work off the asyncio event loop.
+
+    I/O-bound work such as file reads goes to a thread pool. Predictions use the thread pool too by
+    default, because the shared model, caches and metrics live in the serving process; set
+    PREDICTION_EXECUTOR=process to score in a process pool instead (each worker then keeps its own
+    copy of the model).
+    """
+
+    def __init__(self, executor_config: ExecutorConfig = ExecutorConfig()):
+        try:
+            if executor_config.prediction_executor not in ("thread", "process"):
+                raise ValueError(f"Unknown prediction executor '{executor_config.prediction_executor}', expected 'thread' or 'process'")
+            self.executor_config = executor_config
+            self.io_pool = ThreadPoolExecutor(max_workers=executor_config.io_workers, thread_name_prefix="pipeline-io")
+            self._cpu_pool: Optional[ProcessPoolExecutor] = None
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @property
+    def cpu_pool(self) -> ProcessPoolExecutor:
+        # Created lazily so importing the app does not spawn worker processes.
+        # 'spawn' avoids forking a process that already runs the model watcher and pool threads.
+        if self._cpu_pool is None:
+            self._cpu_pool = ProcessPoolExecutor(max_workers=self.executor_config.cpu_workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            logging.info(f"Started process pool with {self.executor_config.cpu_workers} workers")
+        return self._cpu_pool
+
+    @property
+    def prediction_pool(self) -> Executor:
+        return self.cpu_pool if self.executor_config.prediction_executor == "process" else self.io_pool
+
+    @staticmethod
+    async def _run(pool: Executor, func: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, functools.partial(func, *args, **kwargs))
+
+    async def run_io(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Runs an I/O-bound callable (S3 fetch, file read) on the thread pool.
+        """
+        return await self._run(self.io_pool, func, *args, **kwargs)
+
+    async def run_prediction(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Runs a prediction callable on the pool selected by PREDICTION_EXECUTOR. With the process
+        pool, func and its arguments must be picklable.
+        """
+        return await self._run(self.prediction_pool, func, *args, **kwargs)
+
+    def shutdown(self) -> None:
+        self.io_pool.shutdown(wait=False, cancel_futures=True)
+        if self._cpu_pool is not None:
+            self._cpu_pool.shutdown(wait=False, cancel_futures=True)
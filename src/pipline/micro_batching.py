@@ -0,0 +1,123 @@
+import asyncio
+import sys
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.entity.config_entity import MicroBatchConfig
+from src.exception import MyException
+from src.logger import logging
+from src.metrics import MICRO_BATCH_SIZE
+from src.pipline.executor import PipelineExecutor
+from src.pipline.prediction_pipeline import predict_records
+
+
+class BatchSizeStats:
+    """
+    Running statistics of the batch sizes achieved by the scheduler.
+    """
+
+    BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.rows = 0
+        self.max_batch_size = 0
+        self.bucket_counts = [0] * (len(self.BUCKETS) + 1)
+
+    def observe(self, batch_size: int) -> None:
+        with self._lock:
+            self.batches += 1
+            self.rows += batch_size
+            self.max_batch_size = max(self.max_batch_size, batch_size)
+            for index, bound in enumerate(self.BUCKETS):
+                if batch_size <= bound:
+                    self.bucket_counts[index] += 1
+                    break
+            else:
+                self.bucket_counts[-1] += 1
+
+    def as_dict(self) -> Dict[str, object]:
+        with self._lock:
+            labels = [f"<={bound}" for bound in self.BUCKETS] + [f">{self.BUCKETS[-1]}"]
+            return {
+                "batches": self.batches,
+                "rows": self.rows,
+                "mean_batch_size": self.rows / self.batches if self.batches else 0.0,
+                "max_batch_size": self.max_batch_size,
+                "batch_size_histogram": dict(zip(labels, self.bucket_counts)),
+            }
+
+
+class MicroBatchScheduler:
+    """
+    Coalesces concurrent single-record prediction requests into one matrix.
+
+    Requests are queued until max_batch_size records are waiting or max_wait_ms has passed since the
+    first one arrived. The batch is then scored with one predict call on the executor and each
+    caller gets back the predictions for its own rows.
+    """
+
+    def __init__(self, executor: PipelineExecutor, micro_batch_config: MicroBatchConfig = MicroBatchConfig(),
+                 predict_func: Callable[[List[dict]], object] = predict_records):
+        """
+        :param executor: Executor the batched predict call is run on
+        :param micro_batch_config: Batch size and wait time limits
+        :param predict_func: Picklable function that scores a list of records
+        """
+        self.executor = executor
+        self.micro_batch_config = micro_batch_config
+        self.predict_func = predict_func
+        self.stats = BatchSizeStats()
+        self._pending: List[Tuple[List[dict], asyncio.Future]] = []
+        self._pending_rows = 0
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._running_batches = set()
+
+    async def predict(self, records: List[dict]):
+        """
+        Scores records together with other concurrent requests.
+        :return: predictions for records, in order
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((records, future))
+        self._pending_rows += len(records)
+
+        if self._pending_rows >= self.micro_batch_config.max_batch_size or self.micro_batch_config.max_wait_ms <= 0:
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self.micro_batch_config.max_wait_ms / 1000, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self._pending:
+            return
+        batch, self._pending, self._pending_rows = self._pending, [], 0
+        task = asyncio.ensure_future(self._score_batch(batch))
+        # Keep a reference so the task is not garbage collected while it runs
+        self._running_batches.add(task)
+        task.add_done_callback(self._running_batches.discard)
+
+    async def _score_batch(self, batch: List[Tuple[List[dict], asyncio.Future]]) -> None:
+        try:
+            batch_records = [record for records, _ in batch for record in records]
+            predictions = await self.executor.run_prediction(self.predict_func, batch_records)
+            self.stats.observe(len(batch_records))
+            MICRO_BATCH_SIZE.observe(len(batch_records))
+        except Exception as e:
+            logging.error(f"Micro-batch of {len(batch)} requests failed: {e}")
+            error = e if isinstance(e, MyException) else MyException(e, sys)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        offset = 0
+        for records, future in batch:
+            if not future.done():
+                future.set_result(predictions[offset:offset + len(records)])
+            offset += len(records)
@@ -0,0 +1,213 @@
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, Optional, Tuple
+
+from pandas import DataFrame
+
+from src.entity.config_entity import CreditCardDefaultPredictorConfig, OfflineScoringConfig
+from src.entity.prediction_cache import PredictionCache
+from src.exception import MyException
+from src.logger import logging
+from src.pipline.batch_scoring import ChunkedFileScorer, detect_file_format, iter_file_chunks
+from src.pipline.prediction_pipeline import CreditCardDefaultPredictor
+
+OFFLINE_OUTPUT_FORMATS = ("csv", "parquet")
+
+# (chunk index, row number of its first row, records)
+IndexedChunk = Tuple[int, int, DataFrame]
+
+
+def iter_file_source(file_path: str, chunk_size: int, skip_chunks: int = 0) -> Iterator[IndexedChunk]:
+    """
+    Yields numbered chunks of a local CSV or Parquet file. Skipped chunks are still read, since
+    neither format can be sought to a row.
+    """
+    file_format = detect_file_format(file_path)
+    row_offset = 0
+    with open(file_path, "rb") as file:
+        for chunk_index, chunk in enumerate(iter_file_chunks(file, file_format=file_format, chunk_size=chunk_size)):
+            if chunk_index >= skip_chunks:
+                yield chunk_index, row_offset, chunk
+            row_offset += len(chunk)
+
+
+def iter_mongo_source(collection_name: str, chunk_size: int, skip_chunks: int = 0,
+                      database_name: Optional[str] = None) -> Iterator[IndexedChunk]:
+    """
+    Yields numbered chunks of a MongoDB collection in _id order, starting after skip_chunks chunks.
+    """
+    from src.data_access.proj1_data import Proj1Data
+
+    chunks = Proj1Data().iter_collection_chunks(collection_name=collection_name, chunk_size=chunk_size,
+                                                skip_rows=skip_chunks * chunk_size, database_name=database_name)
+    for chunk_index, chunk in enumerate(chunks, start=skip_chunks):
+        yield chunk_index, chunk_index * chunk_size, chunk
+
+
+_worker_scorer: Optional[ChunkedFileScorer] = None
+_worker_model_version: Optional[str] = None
+
+
+def init_scoring_worker() -> None:
+    """
+    Process pool initializer: loads the production model once per worker. The version watcher is
+    off, so a worker keeps the same model for the whole run.
+    """
+    global _worker_scorer, _worker_model_version
+    predictor = CreditCardDefaultPredictor(
+        prediction_pipeline_config=CreditCardDefaultPredictorConfig(model_reload_interval_seconds=0),
+        prediction_cache=PredictionCache(max_entries=0, ttl_seconds=0, max_batch_rows=0))
+    _worker_model_version = predictor.warm_up()
+    _worker_scorer = ChunkedFileScorer(predictor)
+
+
+def score_chunk_to_file(chunk_index: int, row_offset: int, chunk: DataFrame, output_path: str,
+                        output_format: str) -> Tuple[int, int, Optional[str]]:
+    """
+    Scores one chunk in a pool worker and writes row numbers, IDs and predictions to output_path.
+    The file is written under a temporary name and renamed, so it only exists once it is complete.
+    :return: chunk index, number of rows and the model version used
+    """
+    ids, predictions = next(_worker_scorer.score_chunks([chunk], row_offset=row_offset))
+    ids["prediction"] = predictions
+    temp_path = output_path + ".tmp"
+    if output_format == "parquet":
+        ids.to_parquet(temp_path, index=False)
+    else:
+        ids.to_csv(temp_path, index=False)
+    os.replace(temp_path, output_path)
+    return chunk_index, len(ids), _worker_model_version
+
+
+class OfflineBatchScorer:
+    """
+    Scores a large record source chunk by chunk on a pool of worker processes and writes one
+    prediction file per chunk (part-000000.csv, ...) to output_dir.
+
+    Every worker loads the model once, in the pool initializer. Only a few chunks per worker are
+    read ahead, so memory stays bounded however large the source is. After each chunk the manifest
+    in output_dir is rewritten with the chunks done so far; a rerun with the same source and chunk
+    size skips them and resumes after the last completed chunk.
+    """
+
+    def __init__(self, output_dir: str, offline_scoring_config: OfflineScoringConfig = OfflineScoringConfig()):
+        """
+        :param output_dir: Directory for the prediction files and the manifest
+        :param offline_scoring_config: Chunk size, worker count and output format
+        """
+        try:
+            if offline_scoring_config.output_format not in OFFLINE_OUTPUT_FORMATS:
+                raise ValueError(f"Unsupported output format '{offline_scoring_config.output_format}', "
+                                 f"expected one of {OFFLINE_OUTPUT_FORMATS}")
+            self.output_dir = output_dir
+            self.offline_scoring_config = offline_scoring_config
+            self.manifest_path = os.path.join(output_dir, offline_scoring_config.manifest_file_name)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def part_file_name(self, chunk_index: int) -> str:
+        return f"part-{chunk_index:06d}.{self.offline_scoring_config.output_format}"
+
+    def load_manifest(self, source: dict) -> dict:
+        """
+        Returns the manifest of a previous run on the same source, or a new one. Chunks whose
+        prediction file has gone missing are scored again.
+        """
+        try:
+            manifest = {"source": source, "chunk_size": self.offline_scoring_config.chunk_size,
+                        "output_format": self.offline_scoring_config.output_format,
+                        "chunks": {}, "completed": False}
+            if not os.path.exists(self.manifest_path):
+                return manifest
+            with open(self.manifest_path) as file:
+                previous = json.load(file)
+            for key in ("source", "chunk_size", "output_format"):
+                if previous.get(key) != manifest[key]:
+                    raise ValueError(f"{self.output_dir} holds a run with a different {key} "
+                                     f"({previous.get(key)} != {manifest[key]}), use a new output directory")
+            previous["chunks"] = {index: chunk for index, chunk in previous["chunks"].items()
+                                  if os.path.exists(os.path.join(self.output_dir, chunk["file"]))}
+            return previous
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @staticmethod
+    def completed_prefix(manifest: dict) -> int:
+        """
+        Number of leading chunks that are done, i.e. the chunks a source can skip without reading.
+        """
+        count = 0
+        while str(count) in manifest["chunks"]:
+            count += 1
+        return count
+
+    def run(self, chunks: Iterator[IndexedChunk], manifest: dict) -> dict:
+        """
+        Scores every chunk that is not in the manifest yet.
+        :return: the final manifest
+        """
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            config = self.offline_scoring_config
+            max_pending = max(1, config.workers * config.pending_chunks_per_worker)
+            pending: Dict[Future, Tuple[int, int]] = {}
+            progress = {"rows": 0, "started": time.perf_counter()}
+            logging.info(f"Scoring into {self.output_dir} with {config.workers} workers, "
+                         f"{len(manifest['chunks'])} chunks already done")
+
+            with ProcessPoolExecutor(max_workers=config.workers, initializer=init_scoring_worker,
+                                     mp_context=multiprocessing.get_context("spawn")) as pool:
+                try:
+                    for chunk_index, row_offset, chunk in chunks:
+                        if str(chunk_index) in manifest["chunks"]:
+                            continue
+                        while len(pending) >= max_pending:
+                            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                            self._record_done(done, pending, manifest, progress)
+                        future = pool.submit(score_chunk_to_file, chunk_index, row_offset, chunk,
+                                             os.path.join(self.output_dir, self.part_file_name(chunk_index)),
+                                             config.output_format)
+                        pending[future] = (chunk_index, row_offset)
+                    while pending:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        self._record_done(done, pending, manifest, progress)
+                except BaseException:
+                    # Keep the chunks that finished before the failure so a rerun does not redo them
+                    pool.shutdown(wait=True, cancel_futures=True)
+                    finished = [future for future in pending
+                                if future.done() and not future.cancelled() and future.exception() is None]
+                    self._record_done(finished, pending, manifest, progress)
+                    raise
+
+            manifest["completed"] = True
+            manifest["rows"] = sum(chunk["rows"] for chunk in manifest["chunks"].values())
+            manifest["model_versions"] = sorted({str(chunk["model_version"]) for chunk in manifest["chunks"].values()})
+            if len(manifest["model_versions"]) > 1:
+                logging.warning(f"Chunks were scored with different model versions: {manifest['model_versions']}")
+            self._save_manifest(manifest)
+            logging.info(f"Batch scoring completed: {manifest['rows']} rows in {len(manifest['chunks'])} chunks")
+            return manifest
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def _record_done(self, done, pending: Dict[Future, Tuple[int, int]], manifest: dict, progress: dict) -> None:
+        for future in done:
+            chunk_index, row_offset = pending.pop(future)
+            _, n_rows, model_version = future.result()
+            manifest["chunks"][str(chunk_index)] = {"file": self.part_file_name(chunk_index), "row_offset": row_offset,
+                                                    "rows": n_rows, "model_version": model_version}
+            progress["rows"] += n_rows
+            elapsed = time.perf_counter() - progress["started"]
+            self._save_manifest(manifest)
+            logging.info(f"Chunk {chunk_index} done, {progress['rows']} rows this run "
+                         f"({progress['rows'] / elapsed:.0f} rows/s)")
+
+    def _save_manifest(self, manifest: dict) -> None:
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(manifest, file, indent=2)
+        os.replace(temp_path, self.manifest_path)
@@ -1,10 +1,14 @@
 import sys
 from src.entity.config_entity import CreditCardDefaultPredictorConfig
-from src.entity.s3_estimator import Proj1Estimator
+from src.entity.model_holder import ModelSnapshot, get_model_holder
+from src.entity.prediction_cache import PredictionCache, get_prediction_cache
 from src.exception import MyException
 from src.logger import logging
-from src.constants import SCHEMA_FILE_PATH
+from src.metrics import STAGE_LATENCY
+from src.constants import SCHEMA_FILE_PATH, TARGET_COLUMN, WARMUP_RECORDS
+from typing import List, Optional
 from pandas import DataFrame
+import numpy as np
 import pandas as pd
 from src.utils.main_utils import load_numpy_array_data,load_object,read_yaml_file
 
@@ -102,13 +106,38 @@ class CreditCardDefaultData:
 
 
 class CreditCardDefaultPredictor:
-    def __init__(self,prediction_pipeline_config: CreditCardDefaultPredictorConfig = CreditCardDefaultPredictorConfig()) -> None:
+    def __init__(self,prediction_pipeline_config: CreditCardDefaultPredictorConfig = CreditCardDefaultPredictorConfig(),
+                 prediction_cache: Optional[PredictionCache] = None) -> None:
         try:
             self.prediction_pipeline_config = prediction_pipeline_config
             self._schema_config = read_yaml_file(file_path=SCHEMA_FILE_PATH)
+            self.prediction_cache: PredictionCache = prediction_cache if prediction_cache is not None else get_prediction_cache()
         except Exception as e:
             raise MyException(e, sys)
 
+    def get_feature_columns(self) -> List[str]:
+        """
+        Returns the raw input columns expected by the model, in schema order.
+        """
+        excluded = set(self._schema_config['drop_columns']) | {TARGET_COLUMN}
+        return [list(col.keys())[0] for col in self._schema_config['columns']
+                if list(col.keys())[0] not in excluded]
+
+    def get_records_data_frame(self, records: List[dict]) -> DataFrame:
+        """
+        Builds a single DataFrame out of a list of input records so they can be scored as one batch.
+        """
+        try:
+            with STAGE_LATENCY.time(stage="dataframe_build"):
+                feature_columns = self.get_feature_columns()
+                for index, record in enumerate(records):
+                    missing_cols = [col for col in feature_columns if col not in record]
+                    if missing_cols:
+                        raise ValueError(f"Record {index} is missing columns: {missing_cols}")
+                return DataFrame.from_records(records, columns=feature_columns)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
     def _replace_values_in_features(self, df):
         df.loc[:, 'PAY_0':'PAY_6'] = df.loc[:, 'PAY_0':'PAY_6'].replace(-1, 0)
         fil_ed = (df['EDUCATION'] == 0) | (df['EDUCATION'] == 5) | (df['EDUCATION'] == 6)
@@ -117,18 +146,6 @@ class CreditCardDefaultPredictor:
         df.loc[fil_mar, 'MARRIAGE'] = 3
         return df
 
-    def _create_dummy_columns(self, df, all_columns=None):
-        categorical_features = self._schema_config['categorical_columns']
-        df = pd.get_dummies(df, columns=categorical_features, drop_first=True)
-
-        if all_columns is not None:
-            missing_cols = set(all_columns) - set(df.columns)
-            for col in missing_cols:
-                df[col] = 0
-            df = df[all_columns]
-
-        return df
-
     def _drop_id_column(self, df):
         drop_col = self._schema_config['drop_columns']
         for col in drop_col:
@@ -136,35 +153,171 @@ class CreditCardDefaultPredictor:
                 df = df.drop(col, axis=1)
         return df
 
+    def _get_snapshot(self) -> ModelSnapshot:
+        return get_model_holder(
+            bucket_name=self.prediction_pipeline_config.model_bucket_name,
+            model_path=self.prediction_pipeline_config.model_file_path,
+            reload_interval_seconds=self.prediction_pipeline_config.model_reload_interval_seconds,
+            inference_engine=self.prediction_pipeline_config.inference_engine,
+            shared_model_dir=self.prediction_pipeline_config.shared_model_dir,
+            shared_model_sklearn_fallback=self.prediction_pipeline_config.shared_model_sklearn_fallback,
+            replace_values=self._replace_values_in_features,
+        ).get_snapshot()
+
     def predict(self, dataframe) -> str:
         try:
-            model = Proj1Estimator(
-                bucket_name=self.prediction_pipeline_config.model_bucket_name,
-                model_path=self.prediction_pipeline_config.model_file_path,
-            )
+            snapshot = self._get_snapshot()
             logging.info("Prediction data loaded and now transforming it for prediction...")
 
-            all_columns = ['LIMIT_BAL', 'AGE', 'BILL_AMT1', 'BILL_AMT2', 'BILL_AMT3',
-            'BILL_AMT4', 'BILL_AMT5', 'BILL_AMT6', 'PAY_AMT1', 'PAY_AMT2',
-            'PAY_AMT3', 'PAY_AMT4', 'PAY_AMT5', 'PAY_AMT6', 'SEX_2',
-            'EDUCATION_2', 'EDUCATION_3', 'EDUCATION_4', 'MARRIAGE_2',
-            'MARRIAGE_3', 'PAY_0_0', 'PAY_0_1', 'PAY_0_2', 'PAY_0_3',
-            'PAY_0_4', 'PAY_0_5', 'PAY_0_6', 'PAY_0_7', 'PAY_0_8', 'PAY_2_0',
-            'PAY_2_1', 'PAY_2_2', 'PAY_2_3', 'PAY_2_4', 'PAY_2_5', 'PAY_2_6',
-            'PAY_2_7', 'PAY_3_0', 'PAY_3_1', 'PAY_3_2', 'PAY_3_3', 'PAY_3_4',
-            'PAY_3_5', 'PAY_3_6', 'PAY_3_7', 'PAY_3_8', 'PAY_4_0', 'PAY_4_1',
-            'PAY_4_2', 'PAY_4_3', 'PAY_4_4', 'PAY_4_5', 'PAY_4_6', 'PAY_4_7',
-            'PAY_4_8', 'PAY_5_0', 'PAY_5_2', 'PAY_5_3', 'PAY_5_4', 'PAY_5_5',
-            'PAY_5_6', 'PAY_5_7', 'PAY_6_0', 'PAY_6_2', 'PAY_6_3', 'PAY_6_4',
-            'PAY_6_5', 'PAY_6_6', 'PAY_6_7', 'PAY_6_8']
-            all_columns = [str(col) for col in all_columns]
-
-            dataframe = self._drop_id_column(dataframe)
-            dataframe = self._replace_values_in_features(dataframe)
-            dataframe = self._create_dummy_columns(dataframe,all_columns=all_columns)
+            with STAGE_LATENCY.time(stage="drop_id_column"):
+                dataframe = self._drop_id_column(dataframe)
+            with STAGE_LATENCY.time(stage="replace_values"):
+                dataframe = self._replace_values_in_features(dataframe)
+            with STAGE_LATENCY.time(stage="one_hot_encode"):
+                features = snapshot.encoder.transform(dataframe)
+                dataframe = DataFrame(features, columns=snapshot.encoder.feature_columns, copy=False)
+            with STAGE_LATENCY.time(stage="preprocess"):
+                features = snapshot.model.preprocessing_object.transform(dataframe)
             logging.info("Tranformation completed!")
-            result = model.predict(dataframe)
+            result = self._predict_features(snapshot, features)
             logging.info("Prediction Done!")
             return result
         except Exception as e:
             raise MyException(e, sys)
+
+    def _predict_features(self, snapshot: ModelSnapshot, features):
+        """
+        Predicts on model input features (encoded and scaled), through the prediction cache when
+        the batch is small enough.
+        """
+        if self.prediction_cache.accepts(len(features)):
+            return self._predict_cached(snapshot, features)
+        with STAGE_LATENCY.time(stage="model"):
+            return snapshot.model.predict_features(features)
+
+    def _predict_cached(self, snapshot: ModelSnapshot, features):
+        """
+        Predicts on model input features, serving repeated rows from the prediction cache and
+        running the model only on the rows it has not seen.
+        """
+        with STAGE_LATENCY.time(stage="cache_lookup"):
+            keys = self.prediction_cache.make_keys(snapshot.version, features)
+            cached = self.prediction_cache.get_many(snapshot.version, keys)
+        missing = [row for row, value in enumerate(cached) if value is None]
+        if not missing:
+            return np.asarray(cached)
+        with STAGE_LATENCY.time(stage="model"):
+            predictions = snapshot.model.predict_features(features[missing])
+        self.prediction_cache.put_many(snapshot.version, [keys[row] for row in missing], predictions)
+        if len(missing) == len(cached):
+            return predictions
+        result = np.empty(len(cached), dtype=predictions.dtype)
+        for row, value in enumerate(cached):
+            if value is not None:
+                result[row] = value
+        result[missing] = predictions
+        return result
+
+
+    def predict_records(self, records: List[dict]):
+        """
+        Scores raw records (form fields or JSON objects) without building a DataFrame, using the
+        model's FeatureVectorizer. Falls back to the pandas path if the model has no fast path.
+        """
+        try:
+            if not records:
+                return np.empty(0, dtype=np.int64)
+            snapshot = self._get_snapshot()
+            if snapshot.vectorizer is None:
+                return self.predict(dataframe=self.get_records_data_frame(records))
+            with STAGE_LATENCY.time(stage="vectorize"):
+                features = snapshot.vectorizer.transform_records(records)
+            return self._predict_features(snapshot, features)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def predict_proba_records(self, records: List[dict]) -> np.ndarray:
+        """
+        Returns the probability of default (class 1) for each raw record.
+        """
+        try:
+            if not records:
+                return np.empty(0, dtype=np.float64)
+            snapshot = self._get_snapshot()
+            if snapshot.vectorizer is None:
+                dataframe = self._replace_values_in_features(self._drop_id_column(self.get_records_data_frame(records)))
+                dataframe = DataFrame(snapshot.encoder.transform(dataframe),
+                                      columns=snapshot.encoder.feature_columns, copy=False)
+                proba = snapshot.model.predict_proba(dataframe)
+            else:
+                proba = snapshot.model.predict_proba_features(snapshot.vectorizer.transform_records(records))
+            return proba[:, list(snapshot.model.classes).index(1)]
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def warm_up(self, n_records: int = WARMUP_RECORDS) -> Optional[str]:
+        """
+        Loads the production model and scores a few synthetic records through the fast path and
+        the pandas path, so the first real request does not pay for the S3 download, unpickling
+        and first-call overheads. Synthetic records bypass the prediction cache.
+        :return: version of the loaded model
+        """
+        try:
+            snapshot = self._get_snapshot()
+            if snapshot.vectorizer is None:
+                logging.info("Model has no fast path, skipping synthetic warm-up predictions")
+                return snapshot.version
+            records = snapshot.vectorizer.sample_records(n_records)
+            snapshot.model.predict_features(snapshot.vectorizer.transform_records(records[:1]))
+            snapshot.model.predict_proba_features(snapshot.vectorizer.transform_records(records))
+            dataframe = self._replace_values_in_features(self.get_records_data_frame(records))
+            snapshot.model.predict(DataFrame(snapshot.encoder.transform(dataframe),
+                                             columns=snapshot.encoder.feature_columns, copy=False))
+            logging.info(f"Warmed up model version {snapshot.version} with {n_records} synthetic records")
+            return snapshot.version
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    @staticmethod
+    def get_decisions(probabilities: np.ndarray, thresholds: List[float]) -> np.ndarray:
+        """
+        Applies every threshold to every probability at once.
+        :param thresholds: Values between 0 and 1, range-checked by ProbaRequest
+        :return: (n_records, n_thresholds) array of 0/1 decisions, 1 where probability >= threshold
+        """
+        thresholds = np.asarray(thresholds, dtype=np.float64)
+        return (np.asarray(probabilities)[:, np.newaxis] >= thresholds[np.newaxis, :]).astype(np.int8)
+
+_default_predictor: CreditCardDefaultPredictor = None
+
+
+def predict_records(records: List[dict]):
+    """
+    Module-level entry point for the pandas-free record path, so it can be submitted to a thread
+    or process pool. The predictor (and with it the shared model) is created once per process.
+    """
+    global _default_predictor
+    if _default_predictor is None:
+        _default_predictor = CreditCardDefaultPredictor()
+    return _default_predictor.predict_records(records)
+
+
+def score_records(records: List[dict], thresholds: List[float]):
+    """
+    Module-level entry point returning (probabilities, decisions) for records, see predict_records.
+    """
+    global _default_predictor
+    if _default_predictor is None:
+        _default_predictor = CreditCardDefaultPredictor()
+    probabilities = _default_predictor.predict_proba_records(records)
+    return probabilities, _default_predictor.get_decisions(probabilities, thresholds)
+
+
+def warm_up() -> Optional[str]:
+    """
+    Module-level entry point for CreditCardDefaultPredictor.warm_up, see predict_records.
+    """
+    global _default_predictor
+    if _default_predictor is None:
+        _default_predictor = CreditCardDefaultPredictor()
+    return _default_predictor.warm_up()
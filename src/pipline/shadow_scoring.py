@@ -0,0 +1,190 @@
+import queue
+import sys
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.entity.config_entity import CreditCardDefaultPredictorConfig, ShadowScoringConfig
+from src.entity.prediction_cache import PredictionCache
+from src.exception import MyException
+from src.logger import logging
+from src.metrics import SHADOW_LATENCY, SHADOW_QUEUE_DEPTH, SHADOW_RECORDS
+from src.pipline.prediction_pipeline import CreditCardDefaultPredictor
+
+# (records, production predictions) waiting for the candidate model
+ShadowItem = Tuple[List[dict], np.ndarray]
+
+_STOP = None
+
+
+class ShadowStats:
+    """
+    Running agreement statistics between the production and the candidate model.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.records = 0
+        self.agreed = 0
+        self.dropped_requests = 0
+        self.dropped_records = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.candidate_version: Optional[str] = None
+        # (production label, candidate label) -> count
+        self.confusion: Dict[Tuple[int, int], int] = {}
+
+    def observe(self, production: np.ndarray, candidate: np.ndarray, candidate_version: Optional[str]) -> int:
+        """
+        Records one scored request and returns how many of its records the two models agreed on.
+        """
+        agreed = int(np.count_nonzero(production == candidate))
+        pairs, counts = np.unique(np.stack([production, candidate], axis=1), axis=0, return_counts=True)
+        with self._lock:
+            self.requests += 1
+            self.records += len(production)
+            self.agreed += agreed
+            self.candidate_version = candidate_version
+            for (production_label, candidate_label), count in zip(pairs.tolist(), counts.tolist()):
+                key = (production_label, candidate_label)
+                self.confusion[key] = self.confusion.get(key, 0) + count
+        return agreed
+
+    def observe_dropped(self, n_records: int) -> None:
+        with self._lock:
+            self.dropped_requests += 1
+            self.dropped_records += n_records
+
+    def observe_error(self, error: Exception) -> int:
+        with self._lock:
+            self.errors += 1
+            self.last_error = f"{error}"
+            return self.errors
+
+    def as_dict(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "candidate_version": self.candidate_version,
+                "requests": self.requests,
+                "records": self.records,
+                "agreed": self.agreed,
+                "agreement_rate": self.agreed / self.records if self.records else None,
+                "dropped_requests": self.dropped_requests,
+                "dropped_records": self.dropped_records,
+                "errors": self.errors,
+                "last_error": self.last_error,
+                "confusion": {f"production={production}/candidate={candidate}": count
+                              for (production, candidate), count in sorted(self.confusion.items())},
+            }
+
+
+class ShadowScorer:
+    """
+    Scores live requests with a candidate model in the background and compares its labels with
+    the ones production already returned.
+
+    submit() never blocks: it puts the request on a bounded queue, or drops it (and counts the
+    drop) when the queue is full, so the candidate can fall behind without slowing production
+    down. A single daemon thread loads the candidate from its own S3 key through a separate
+    ModelHolder (hot-swapped like the production model) and scores the queued requests one by one.
+    The candidate bypasses the shared prediction cache so it cannot evict production entries.
+    """
+
+    def __init__(self, shadow_scoring_config: ShadowScoringConfig = ShadowScoringConfig(),
+                 predictor: Optional[CreditCardDefaultPredictor] = None):
+        """
+        :param shadow_scoring_config: Candidate model location and queue size
+        :param predictor: Predictor for the candidate model, built from the config when not given
+        """
+        self.shadow_scoring_config = shadow_scoring_config
+        self.enabled = predictor is not None or bool(shadow_scoring_config.model_file_path)
+        self.stats = ShadowStats()
+        self._predictor = predictor
+        self._queue: "queue.Queue[Optional[ShadowItem]]" = queue.Queue(maxsize=shadow_scoring_config.max_queue_size)
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+    def submit(self, records: List[dict], production_predictions) -> bool:
+        """
+        Queues records and the labels production returned for them.
+        :return: False if shadow scoring is off or the request was dropped
+        """
+        if not self.enabled or not records:
+            return False
+        self._start_worker()
+        try:
+            self._queue.put_nowait((records, np.asarray(production_predictions).astype(np.int64)))
+        except queue.Full:
+            self.stats.observe_dropped(len(records))
+            SHADOW_RECORDS.inc(len(records), outcome="dropped")
+            return False
+        SHADOW_QUEUE_DEPTH.set(self._queue.qsize())
+        return True
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the worker after the request it is scoring; queued requests are discarded.
+        """
+        with self._worker_lock:
+            self.enabled = False
+            if self._worker is None:
+                return
+            worker, self._worker = self._worker, None
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        self._queue.put(_STOP)
+        worker.join(timeout)
+
+    def _get_predictor(self) -> CreditCardDefaultPredictor:
+        if self._predictor is None:
+            try:
+                config = self.shadow_scoring_config
+                self._predictor = CreditCardDefaultPredictor(
+                    prediction_pipeline_config=CreditCardDefaultPredictorConfig(
+                        model_file_path=config.model_file_path,
+                        model_bucket_name=config.model_bucket_name,
+                        model_reload_interval_seconds=config.model_reload_interval_seconds,
+                        shared_model_dir=None),
+                    prediction_cache=PredictionCache(max_entries=0, ttl_seconds=0, max_batch_rows=0))
+            except Exception as e:
+                raise MyException(e, sys) from e
+        return self._predictor
+
+    def _start_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None and self.enabled:
+                self._worker = threading.Thread(target=self._run, name="shadow-scorer", daemon=True)
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            SHADOW_QUEUE_DEPTH.set(self._queue.qsize())
+            if item is _STOP:
+                return
+            records, production = item
+            try:
+                self._score(records, production)
+            except Exception as e:
+                errors = self.stats.observe_error(e)
+                SHADOW_RECORDS.inc(len(records), outcome="error")
+                # A broken candidate fails every request, keep the log readable
+                if errors == 1 or errors % 1000 == 0:
+                    logging.error(f"Shadow scoring failed ({errors} errors so far): {e}")
+
+    def _score(self, records: List[dict], production: np.ndarray) -> None:
+        predictor = self._get_predictor()
+        with SHADOW_LATENCY.time():
+            candidate = np.asarray(predictor.predict_records(records)).astype(np.int64)
+        if len(candidate) != len(production):
+            raise ValueError(f"Candidate returned {len(candidate)} predictions for {len(production)} records")
+        agreed = self.stats.observe(production, candidate, predictor._get_snapshot().version)
+        SHADOW_RECORDS.inc(agreed, outcome="agree")
+        SHADOW_RECORDS.inc(len(records) - agreed, outcome="disagree")
@@ -0,0 +1,188 @@
+import asyncio
+import json
+from typing import AsyncIterator, Callable, List, Optional, Tuple
+
+from pydantic import ValidationError
+from starlette.responses import StreamingResponse
+
+from src.entity.config_entity import StreamScoringConfig
+from src.logger import logging
+from src.pipline.executor import PipelineExecutor
+from src.entity.request_schema import format_validation_error, parse_record_json
+from src.pipline.prediction_pipeline import predict_records
+
+# (line number, record, error) as produced by the reader
+StreamItem = Tuple[int, Optional[dict], Optional[str]]
+
+_END_OF_STREAM = None
+
+
+class RequestBodyStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for endpoints that keep reading the request body while they respond.
+
+    The stock StreamingResponse calls receive() in the background to watch for a disconnect, which
+    takes body chunks away from request.stream(). Here a client disconnect surfaces through
+    request.stream() (ClientDisconnect) instead.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+class NDJSONStreamScorer:
+    """
+    Scores a newline-delimited JSON request body as it arrives and streams one result line per
+    input line back.
+
+    A reader task parses lines into a bounded queue; the response generator takes rolling
+    micro-batches off the queue (max_batch_size records, or whatever arrived within max_wait_ms),
+    scores each batch with one predict call on the executor and yields the results in input order.
+    When the client reads results slower than it sends records, the queue fills up, the reader
+    stops pulling the request body and the transport pushes back on the sender, so memory stays
+    bounded by max_pending_records + max_batch_size records however long the stream runs.
+
+    Malformed lines and records that cannot be scored get an error line instead of ending the stream.
+    """
+
+    def __init__(self, executor: PipelineExecutor, stream_scoring_config: StreamScoringConfig = StreamScoringConfig(),
+                 predict_func: Callable[[List[dict]], object] = predict_records):
+        """
+        :param executor: Executor the batched predict calls are run on
+        :param stream_scoring_config: Batch, queue and line size limits
+        :param predict_func: Picklable function that scores a list of records
+        """
+        self.executor = executor
+        self.stream_scoring_config = stream_scoring_config
+        self.predict_func = predict_func
+
+    async def score(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """
+        Consumes the raw body chunks and yields NDJSON result lines.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.stream_scoring_config.max_pending_records)
+        reader = asyncio.ensure_future(self._read_items(chunks, queue))
+        scored = 0
+        try:
+            finished = False
+            while not finished:
+                batch, finished = await self._next_batch(queue)
+                if batch:
+                    yield await self._score_batch(batch)
+                    scored += len(batch)
+            await reader
+        except Exception as e:
+            logging.error(f"Stream scoring stopped after {scored} lines: {e}")
+            yield (json.dumps({"error": "Stream scoring stopped, the rest of the input was not scored"}) + "\n").encode()
+        finally:
+            reader.cancel()
+
+    async def _next_batch(self, queue: asyncio.Queue) -> Tuple[List[StreamItem], bool]:
+        """
+        Waits for the first item, then collects more until the batch is full or max_wait_ms passed.
+        :return: the batch and whether the end of the stream was reached
+        """
+        item = await queue.get()
+        if item is _END_OF_STREAM:
+            return [], True
+        batch = [item]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.stream_scoring_config.max_wait_ms / 1000
+        while len(batch) < self.stream_scoring_config.max_batch_size:
+            # Take whatever is already queued without waiting
+            if not queue.empty():
+                item = queue.get_nowait()
+            else:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if item is _END_OF_STREAM:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _read_items(self, chunks: AsyncIterator[bytes], queue: asyncio.Queue) -> None:
+        max_line_bytes = self.stream_scoring_config.max_line_bytes
+        buffer = bytearray()
+        line_number = 0
+        skipping = False
+        try:
+            async for chunk in chunks:
+                buffer.extend(chunk)
+                while True:
+                    newline = buffer.find(b"\n")
+                    if newline < 0:
+                        break
+                    line = bytes(buffer[:newline])
+                    del buffer[:newline + 1]
+                    if skipping:
+                        # Tail of an oversized line that has already been reported
+                        skipping = False
+                        continue
+                    line_number += 1
+                    item = self._parse_line(line_number, line)
+                    if item is not None:
+                        await queue.put(item)
+                if len(buffer) > max_line_bytes and not skipping:
+                    line_number += 1
+                    await queue.put((line_number, None, f"Line is longer than {max_line_bytes} bytes"))
+                    skipping = True
+                if skipping:
+                    buffer.clear()
+            if buffer and not skipping:
+                item = self._parse_line(line_number + 1, bytes(buffer))
+                if item is not None:
+                    await queue.put(item)
+        except asyncio.CancelledError:
+            # The response generator is gone, nobody waits for the end marker
+            raise
+        except Exception:
+            # Let the generator drain what was read; it re-raises this error when it awaits the reader
+            await queue.put(_END_OF_STREAM)
+            raise
+        await queue.put(_END_OF_STREAM)
+
+    def _parse_line(self, line_number: int, line: bytes) -> Optional[StreamItem]:
+        if not line.strip():
+            return None
+        try:
+            record = parse_record_json(line)
+        except ValidationError as e:
+            return line_number, None, f"Invalid record: {format_validation_error(e, limit=5)}"
+        return line_number, record, None
+
+    async def _score_batch(self, batch: List[StreamItem]) -> bytes:
+        valid = [(line_number, record) for line_number, record, error in batch if error is None]
+        results = {}
+        if valid:
+            try:
+                predictions = await self.executor.run_prediction(self.predict_func, [record for _, record in valid])
+                results = {line_number: int(prediction) for (line_number, _), prediction in zip(valid, predictions)}
+            except Exception:
+                # Score one by one so a single bad value only fails its own line
+                for line_number, record in valid:
+                    try:
+                        results[line_number] = int((await self.executor.run_prediction(self.predict_func, [record]))[0])
+                    except Exception as e:
+                        # The client gets a generic message, the details go to the log
+                        logging.error(f"Scoring line {line_number} failed: {e}")
+                        results[line_number] = "Prediction failed"
+
+        lines = []
+        for line_number, record, error in batch:
+            output = {"line": line_number}
+            if record is not None and "ID" in record:
+                output["ID"] = record["ID"]
+            result = results.get(line_number, error)
+            if isinstance(result, int):
+                output["prediction"] = result
+            else:
+                output["error"] = f"{result}"
+            lines.append(json.dumps(output))
+        return ("\n".join(lines) + "\n").encode()
@@ -0,0 +1,164 @@
+import multiprocessing
+import queue
+import sys
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Optional, Tuple
+
+from src.exception import MyException
+from src.logger import logging
+from src.pipline.training_pipeline import TrainPipeline
+
+
+def run_training_job(job_id: str, events) -> None:
+    """
+    Entry point of the training worker process. Runs the full pipeline and reports stage changes,
+    stage artifacts and the outcome on the events queue.
+    """
+    def report(stage: str, artifact: object) -> None:
+        events.put(("stage", stage, asdict(artifact) if artifact is not None else None))
+
+    try:
+        logging.info(f"Training job {job_id} started")
+        TrainPipeline().run_pipeline(progress_callback=report)
+        events.put(("succeeded", None, None))
+    except Exception as e:
+        logging.error(f"Training job {job_id} failed: {e}")
+        events.put(("failed", None, str(e)))
+
+
+@dataclass
+class TrainingJob:
+    job_id: str
+    status: str = "queued"
+    stage: Optional[str] = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    artifacts: Dict[str, dict] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def as_dict(self) -> Dict[str, object]:
+        end = self.finished_at or time.time()
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "stage": self.stage,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "elapsed_seconds": end - self.started_at if self.started_at else 0.0,
+            "artifacts": self.artifacts,
+            "error": self.error,
+        }
+
+
+class TrainingJobManager:
+    """
+    Runs training pipeline jobs in the background, one at a time.
+
+    Every job gets its own spawned worker process, so training never competes with the web
+    server's event loop or GIL, the artifact directory timestamp is fresh per run, and the memory
+    used by SMOTEENN and the forest is returned when the job ends. Submitting while a job is queued
+    or running returns that job instead of starting a duplicate run.
+    """
+
+    def __init__(self, target: Callable[[str, object], None] = run_training_job):
+        """
+        :param target: Picklable function run in the worker process as target(job_id, events)
+        """
+        self.target = target
+        self._context = multiprocessing.get_context("spawn")
+        self._jobs: Dict[str, TrainingJob] = {}
+        self._pending: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._active_job_id: Optional[str] = None
+        self._dispatcher: Optional[threading.Thread] = None
+        self._process = None
+
+    def submit(self) -> Tuple[TrainingJob, bool]:
+        """
+        Queues a training run.
+        :return: the job, and True if an already active job was returned instead of a new one
+        """
+        try:
+            with self._lock:
+                active = self._jobs.get(self._active_job_id) if self._active_job_id else None
+                if active is not None and active.active:
+                    return active, True
+                job = TrainingJob(job_id=uuid.uuid4().hex)
+                self._jobs[job.job_id] = job
+                self._active_job_id = job.job_id
+                self._start_dispatcher()
+            self._pending.put(job.job_id)
+            logging.info(f"Queued training job {job.job_id}")
+            return job, False
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def get(self, job_id: str) -> Optional[TrainingJob]:
+        return self._jobs.get(job_id)
+
+    def shutdown(self) -> None:
+        """
+        Stops the dispatcher and terminates a running training process.
+        """
+        self._pending.put(None)
+        process = self._process
+        if process is not None and process.is_alive():
+            process.terminate()
+
+    def _start_dispatcher(self) -> None:
+        # Called with the lock held
+        if self._dispatcher is None or not self._dispatcher.is_alive():
+            self._dispatcher = threading.Thread(target=self._dispatch, name="training-jobs", daemon=True)
+            self._dispatcher.start()
+
+    def _dispatch(self) -> None:
+        while True:
+            job_id = self._pending.get()
+            if job_id is None:
+                return
+            job = self._jobs[job_id]
+            try:
+                self._run_job(job)
+            except Exception as e:
+                logging.error(f"Training job {job_id} could not be run: {e}")
+                job.status, job.error = "failed", str(e)
+            finally:
+                job.finished_at = job.finished_at or time.time()
+
+    def _run_job(self, job: TrainingJob) -> None:
+        events = self._context.Queue()
+        process = self._context.Process(target=self.target, args=(job.job_id, events),
+                                        name=f"training-{job.job_id}", daemon=True)
+        job.status, job.started_at = "running", time.time()
+        process.start()
+        self._process = process
+
+        while job.active:
+            try:
+                kind, stage, payload = events.get(timeout=1.0)
+            except queue.Empty:
+                if not process.is_alive():
+                    job.status = "failed"
+                    job.error = f"Training process exited with code {process.exitcode}"
+                continue
+            if kind == "stage":
+                job.stage = stage
+                if payload is not None:
+                    job.artifacts[stage] = payload
+            elif kind == "succeeded":
+                job.status = "succeeded"
+            elif kind == "failed":
+                job.status, job.error = "failed", payload
+        job.finished_at = time.time()
+        process.join()
+        self._process = None
+        logging.info(f"Training job {job.job_id} {job.status} after {job.finished_at - job.started_at:.1f}s")
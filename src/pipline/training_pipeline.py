@@ -1,4 +1,5 @@
 import sys
+from typing import Callable, Optional
 from src.exception import MyException
 from src.logger import logging
 
@@ -114,35 +115,56 @@ class TrainPipeline:
         except Exception as e:
             raise MyException(e, sys)
 
-    def start_model_pusher(self, model_evaluation_artifact: ModelEvaluationArtifact) -> ModelPusherArtifact:
+    def start_model_pusher(self, model_evaluation_artifact: ModelEvaluationArtifact,
+                           data_transformation_artifact: Optional[DataTransformationArtifact] = None,
+                           model_trainer_artifact: Optional[ModelTrainerArtifact] = None) -> ModelPusherArtifact:
         """
         This method of TrainPipeline class is responsible for starting model pushing
         """
         try:
             model_pusher = ModelPusher(model_evaluation_artifact=model_evaluation_artifact,
-                                       model_pusher_config=self.model_pusher_config
+                                       model_pusher_config=self.model_pusher_config,
+                                       data_transformation_artifact=data_transformation_artifact,
+                                       model_trainer_artifact=model_trainer_artifact
                                        )
             model_pusher_artifact = model_pusher.initiate_model_pusher()
             return model_pusher_artifact
         except Exception as e:
             raise MyException(e, sys)       
-    def run_pipeline(self, ) -> None:
+    def run_pipeline(self, progress_callback: Optional[Callable[[str, object], None]] = None) -> None:
         """
         This method of TrainPipeline class is responsible for running complete pipeline
+        :param progress_callback: Optional callable invoked as (stage, artifact) when a stage starts
+                                  (artifact None) and when it finishes (artifact of the stage)
         """
+        report = progress_callback or (lambda stage, artifact: None)
         try:
+            report("data_ingestion", None)
             data_ingestion_artifact = self.start_data_ingestion()
+            report("data_ingestion", data_ingestion_artifact)
+            report("data_validation", None)
             data_validation_artifact = self.start_data_validation(data_ingestion_artifact=data_ingestion_artifact)
+            report("data_validation", data_validation_artifact)
+            report("data_transformation", None)
             data_transformation_artifact = self.start_data_transformation(
                 data_ingestion_artifact=data_ingestion_artifact, data_validation_artifact=data_validation_artifact)
+            report("data_transformation", data_transformation_artifact)
+            report("model_trainer", None)
             model_trainer_artifact = self.start_model_trainer(data_transformation_artifact=data_transformation_artifact)
+            report("model_trainer", model_trainer_artifact)
+            report("model_evaluation", None)
             model_evaluation_artifact = self.start_model_evaluation(data_ingestion_artifact=data_ingestion_artifact,
                                                                     model_trainer_artifact=model_trainer_artifact,
                                                                     data_tranformation_artifact=data_transformation_artifact)
+            report("model_evaluation", model_evaluation_artifact)
             if not model_evaluation_artifact.is_model_accepted:
                 logging.info(f"Model not accepted.")
                 return None
-            model_pusher_artifact = self.start_model_pusher(model_evaluation_artifact=model_evaluation_artifact)
+            report("model_pusher", None)
+            model_pusher_artifact = self.start_model_pusher(model_evaluation_artifact=model_evaluation_artifact,
+                                                            data_transformation_artifact=data_transformation_artifact,
+                                                            model_trainer_artifact=model_trainer_artifact)
+            report("model_pusher", model_pusher_artifact)
             
         except Exception as e:
-            raise MyException(e, sys)
\ No newline at end of file
+            raise MyException(e, sys)
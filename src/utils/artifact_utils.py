@@ -0,0 +1,233 @@
+import json
+import lzma
+import mmap
+import pickle
+import struct
+import sys
+import zlib
+from typing import BinaryIO, List, Optional
+
+import numpy as np
+
+from src.exception import MyException
+
+try:
+    import lz4.frame
+except ImportError:  # lz4 is optional, the fast codec falls back to zlib
+    lz4 = None
+try:
+    import zstandard
+except ImportError:  # zstandard is optional, the high-ratio codec falls back to lzma
+    zstandard = None
+
+# File layout of a model artifact:
+#   ARTIFACT_MAGIC | uint32 header length | JSON header | body
+# The body is a pickle (protocol 5) holding everything except the contents of contiguous NumPy
+# arrays, which are stored out-of-band after it, each starting at a multiple of BUFFER_ALIGNMENT.
+# With the "none" codec the body is stored as is, so the arrays can be memory-mapped; otherwise the
+# whole body is compressed as one stream and the header names the codec.
+ARTIFACT_MAGIC = b"PROJ1ART"
+ARTIFACT_FORMAT_VERSION = 2
+BUFFER_ALIGNMENT = 64
+MMAP_MODES = ("r", "c")
+STREAM_BLOCK_SIZE = 1024 * 1024
+
+# Codec names accepted by dump_artifact; "fast" and "high" resolve to the best installed library
+ARTIFACT_CODECS = ("none", "fast", "high")
+FAST_CODEC_LEVELS = {"lz4": 0, "zlib": 1}
+HIGH_CODEC_LEVELS = {"zstd": 19, "lzma": 6}
+
+
+def resolve_codec(codec: str) -> str:
+    """
+    Returns the compression library a codec name stands for in this environment: "none", "lz4"
+    or "zlib" for "fast", "zstd" or "lzma" for "high". Library names are accepted as well.
+    """
+    if codec == "fast":
+        return "lz4" if lz4 is not None else "zlib"
+    if codec == "high":
+        return "zstd" if zstandard is not None else "lzma"
+    if codec in ("none", "lz4", "zlib", "zstd", "lzma"):
+        return codec
+    raise ValueError(f"Unknown artifact codec '{codec}', expected one of {ARTIFACT_CODECS}")
+
+
+class _LZ4Compressor:
+    # LZ4FrameCompressor needs begin() before the first block
+    def __init__(self):
+        self._compressor = lz4.frame.LZ4FrameCompressor()
+        self._started = False
+
+    def compress(self, data) -> bytes:
+        prefix = b""
+        if not self._started:
+            prefix, self._started = self._compressor.begin(), True
+        return prefix + self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        prefix = b"" if self._started else self._compressor.begin()
+        return prefix + self._compressor.flush()
+
+
+def _require(module, codec: str, package: str) -> None:
+    if module is None:
+        raise ImportError(f"The {codec} artifact codec requires {package}: pip install {package}")
+
+
+def _compressor(codec: str):
+    if codec == "lz4":
+        _require(lz4, codec, "lz4")
+        return _LZ4Compressor()
+    if codec == "zlib":
+        return zlib.compressobj(FAST_CODEC_LEVELS["zlib"])
+    if codec == "zstd":
+        _require(zstandard, codec, "zstandard")
+        return zstandard.ZstdCompressor(level=HIGH_CODEC_LEVELS["zstd"]).compressobj()
+    if codec == "lzma":
+        return lzma.LZMACompressor(preset=HIGH_CODEC_LEVELS["lzma"])
+    raise ValueError(f"Unknown artifact codec '{codec}'")
+
+
+def _decompressor(codec: str):
+    if codec == "lz4":
+        _require(lz4, codec, "lz4")
+        return lz4.frame.LZ4FrameDecompressor()
+    if codec == "zlib":
+        return zlib.decompressobj()
+    if codec == "zstd":
+        _require(zstandard, codec, "zstandard")
+        return zstandard.ZstdDecompressor().decompressobj()
+    if codec == "lzma":
+        return lzma.LZMADecompressor()
+    raise ValueError(f"Unknown artifact codec '{codec}'")
+
+
+def is_artifact(file_path: str) -> bool:
+    """
+    True if the file was written by dump_artifact (as opposed to a plain dill/pickle file).
+    """
+    with open(file_path, "rb") as file:
+        return file.read(len(ARTIFACT_MAGIC)) == ARTIFACT_MAGIC
+
+
+def _padding(position: int) -> int:
+    return -position % BUFFER_ALIGNMENT
+
+
+def _aligned_empty(size: int) -> np.ndarray:
+    # np.empty only guarantees 16-byte alignment
+    raw = np.empty(size + BUFFER_ALIGNMENT, dtype=np.uint8)
+    start = _padding(raw.ctypes.data)
+    return raw[start:start + size]
+
+
+def dump_artifact(obj: object, file_obj: BinaryIO, codec: str = "none") -> None:
+    """
+    Writes obj so that its large NumPy arrays can be memory-mapped by load_artifact instead of
+    being copied out of the pickle. The arrays are written straight from their memory, so saving
+    does not need a second in-memory copy of them either.
+    :param codec: "none" (memory-mappable), "fast" (lz4, else zlib) or "high" (zstd, else lzma)
+    """
+    try:
+        codec = resolve_codec(codec)
+        buffers: List[pickle.PickleBuffer] = []
+        payload = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+        views = [buffer.raw() for buffer in buffers]
+
+        # Offsets are relative to the start of the body
+        offsets, position = [], len(payload)
+        for view in views:
+            position += _padding(position)
+            offsets.append([position, view.nbytes])
+            position += view.nbytes
+        header = {"format_version": 1, "payload_size": len(payload), "buffers": offsets}
+        if codec != "none":
+            # Readers from before compression was added reject version 2 instead of misreading it
+            header.update(format_version=ARTIFACT_FORMAT_VERSION, codec=codec, body_size=position)
+        header = json.dumps(header).encode()
+        prefix = ARTIFACT_MAGIC + struct.pack("<I", len(header)) + header
+        prefix += b" " * _padding(len(prefix))
+        file_obj.write(prefix)
+
+        compressor = _compressor(codec) if codec != "none" else None
+
+        def write(data) -> None:
+            file_obj.write(compressor.compress(data) if compressor is not None else data)
+
+        write(payload)
+        position = len(payload)
+        for view, (offset, _) in zip(views, offsets):
+            write(b"\0" * (offset - position))
+            write(view)
+            position = offset + view.nbytes
+        if compressor is not None:
+            file_obj.write(compressor.flush())
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def _read_compressed_body(file: BinaryIO, codec: str, body_size: int) -> np.ndarray:
+    body = _aligned_empty(body_size)
+    decompressor = _decompressor(codec)
+    position = 0
+    blocks = iter(lambda: file.read(STREAM_BLOCK_SIZE), b"")
+    for data in (decompressor.decompress(block) for block in blocks):
+        body[position:position + len(data)] = np.frombuffer(data, dtype=np.uint8)
+        position += len(data)
+    # zlib keeps the end of the stream until flush(); the other decompressors return everything
+    data = decompressor.flush() if hasattr(decompressor, "flush") else b""
+    body[position:position + len(data)] = np.frombuffer(data, dtype=np.uint8)
+    position += len(data)
+    if position != body_size:
+        raise ValueError(f"Compressed artifact body is {position} bytes, expected {body_size}")
+    return body
+
+
+def load_artifact(file_path: str, mmap_mode: Optional[str] = None) -> object:
+    """
+    Loads a file written by dump_artifact.
+    :param mmap_mode: None to read the arrays into memory, "r" to memory-map them read-only or
+                      "c" copy-on-write. Memory-mapped arrays keep the file open until they are
+                      garbage collected; objects that copy their arrays on unpickling (sklearn
+                      trees) do not keep the mapping. Compressed artifacts are always read into
+                      memory.
+    """
+    try:
+        if mmap_mode is not None and mmap_mode not in MMAP_MODES:
+            raise ValueError(f"Unsupported mmap_mode '{mmap_mode}', expected one of {MMAP_MODES} or None")
+        with open(file_path, "rb") as file:
+            if file.read(len(ARTIFACT_MAGIC)) != ARTIFACT_MAGIC:
+                raise ValueError(f"{file_path} is not a model artifact")
+            (header_length,) = struct.unpack("<I", file.read(4))
+            header = json.loads(file.read(header_length))
+            if header["format_version"] > ARTIFACT_FORMAT_VERSION:
+                raise ValueError(f"{file_path} has artifact format version {header['format_version']}, "
+                                 f"this code reads up to {ARTIFACT_FORMAT_VERSION}")
+            start = len(ARTIFACT_MAGIC) + 4 + header_length
+            start += _padding(start)
+            file.seek(start)
+            codec = header.get("codec", "none")
+
+            if codec != "none":
+                body = _read_compressed_body(file, codec, header["body_size"])
+                payload = body[:header["payload_size"]]
+                buffers = [body[offset:offset + size] for offset, size in header["buffers"]]
+                return pickle.loads(payload, buffers=buffers)
+
+            payload = file.read(header["payload_size"])
+            if mmap_mode is None:
+                buffers = []
+                for offset, size in header["buffers"]:
+                    file.seek(start + offset)
+                    buffer = bytearray(size)
+                    file.readinto(buffer)
+                    buffers.append(buffer)
+            elif header["buffers"]:
+                access = mmap.ACCESS_READ if mmap_mode == "r" else mmap.ACCESS_COPY
+                mapped = np.frombuffer(mmap.mmap(file.fileno(), 0, access=access), dtype=np.uint8)
+                buffers = [mapped[start + offset:start + offset + size] for offset, size in header["buffers"]]
+            else:
+                buffers = []
+        return pickle.loads(payload, buffers=buffers)
+    except Exception as e:
+        raise MyException(e, sys) from e
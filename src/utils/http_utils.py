@@ -0,0 +1,35 @@
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
+
+
+def dumps_json(content: Any) -> bytes:
+    """
+    Serializes content to JSON bytes with orjson when it is installed (including NumPy arrays and
+    scalars), otherwise with the json module.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY, default=_to_builtin)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_to_builtin).encode("utf-8")
+
+
+def _to_builtin(value: Any) -> Any:
+    # NumPy arrays and scalars for the json fallback, and non-contiguous arrays orjson rejects
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with dumps_json, used as the app's default response class.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
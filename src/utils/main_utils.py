@@ -1,5 +1,6 @@
 import os
 import sys
+from typing import Optional
 
 import numpy as np
 import dill
@@ -8,6 +9,9 @@ from pandas import DataFrame
 
 from src.exception import MyException
 from src.logger import logging
+from src.utils.artifact_utils import dump_artifact, is_artifact, load_artifact
+
+ARTIFACT_FORMATS = ("dill", "mmap")
 
 
 def read_yaml_file(file_path: str) -> dict:
@@ -31,13 +35,17 @@ def write_yaml_file(file_path: str, content: object, replace: bool = False) -> N
         raise MyException(e, sys) from e
 
 
-def load_object(file_path: str) -> object:
+def load_object(file_path: str, mmap_mode: Optional[str] = None) -> object:
     """
     Returns model/object from project directory.
     file_path: str location of file to load
+    mmap_mode: for files saved with artifact_format="mmap", "r" (read-only) or "c" (copy-on-write)
+               memory-maps the NumPy arrays instead of reading them into memory
     return: Model/Obj
     """
     try:
+        if is_artifact(file_path):
+            return load_artifact(file_path, mmap_mode=mmap_mode)
         with open(file_path, "rb") as file_obj:
             obj = dill.load(file_obj)
         return obj
@@ -72,13 +80,27 @@ def load_numpy_array_data(file_path: str) -> np.array:
         raise MyException(e, sys) from e
 
 
-def save_object(file_path: str, obj: object) -> None:
+def save_object(file_path: str, obj: object, artifact_format: str = "dill", codec: str = "none") -> None:
+    """
+    Saves obj to file_path.
+    artifact_format: "dill" for a plain dill pickle, "mmap" for a file whose NumPy arrays
+                     load_object can memory-map (standard pickle protocol 5, see artifact_utils)
+    codec: compression of "mmap" files, recorded in their header so load_object needs no argument:
+           "none" (stays memory-mappable), "fast" (lz4, else zlib) or "high" (zstd, else lzma)
+    """
     logging.info("Entered the save_object method of utils")
 
     try:
+        if artifact_format not in ARTIFACT_FORMATS:
+            raise ValueError(f"Unknown artifact format '{artifact_format}', expected one of {ARTIFACT_FORMATS}")
+        if artifact_format == "dill" and codec != "none":
+            raise ValueError(f"The '{codec}' codec requires artifact_format='mmap'")
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
         with open(file_path, "wb") as file_obj:
-            dill.dump(obj, file_obj)
+            if artifact_format == "mmap":
+                dump_artifact(obj, file_obj, codec=codec)
+            else:
+                dill.dump(obj, file_obj)
 
         logging.info("Exited the save_object method of utils")
 
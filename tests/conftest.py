@@ -0,0 +1,50 @@
+"""
+Shared fixtures. A small stand-in model is trained once per session on synthetic data through
+the real DataTransformation and ModelTrainer components (see benchmarks/synthetic.py), so the
+tests need neither MongoDB nor S3. Run from the repository root: python -m pytest
+"""
+import pytest
+
+from benchmarks.local_storage import LocalModelStorage
+from benchmarks.synthetic import make_synthetic_data, train_standin_model
+from src.entity.config_entity import CreditCardDefaultPredictorConfig
+from src.entity.estimator import MyModel
+from src.entity.model_holder import get_model_holder
+from src.entity.prediction_cache import PredictionCache
+from src.pipline.prediction_pipeline import CreditCardDefaultPredictor
+
+TEST_BUCKET_NAME = "test-model-bucket"
+TEST_MODEL_KEY = "model.pkl"
+
+
+@pytest.fixture(scope="session")
+def standin_model(tmp_path_factory) -> MyModel:
+    return train_standin_model(n_rows=3000, n_estimators=20, max_depth=12,
+                               work_dir=str(tmp_path_factory.mktemp("standin_model")))
+
+
+@pytest.fixture(scope="session")
+def raw_dataframe():
+    """
+    Raw records as a request or an uploaded file would carry them (ID column, no target).
+    """
+    return make_synthetic_data(500, seed=1, with_target=False)
+
+
+@pytest.fixture(scope="session")
+def predictor(standin_model, tmp_path_factory) -> CreditCardDefaultPredictor:
+    """
+    CreditCardDefaultPredictor serving standin_model from local storage, without a prediction cache.
+    """
+    storage = LocalModelStorage(str(tmp_path_factory.mktemp("storage")))
+    storage.put_model(standin_model, TEST_BUCKET_NAME, TEST_MODEL_KEY)
+    config = CreditCardDefaultPredictorConfig(model_file_path=TEST_MODEL_KEY, model_bucket_name=TEST_BUCKET_NAME,
+                                              model_reload_interval_seconds=0, inference_engine=None,
+                                              shared_model_dir=None)
+    predictor = CreditCardDefaultPredictor(prediction_pipeline_config=config,
+                                           prediction_cache=PredictionCache(max_entries=0, ttl_seconds=0,
+                                                                            max_batch_rows=0))
+    # Register the holder before first use, so it loads from local storage instead of S3
+    get_model_holder(bucket_name=TEST_BUCKET_NAME, model_path=TEST_MODEL_KEY, reload_interval_seconds=0,
+                     replace_values=predictor._replace_values_in_features, storage=storage)
+    return predictor
@@ -0,0 +1,151 @@
+import json
+import struct
+
+import dill
+import numpy as np
+import pytest
+
+from src.exception import MyException
+from src.utils.artifact_utils import (ARTIFACT_FORMAT_VERSION, ARTIFACT_MAGIC, BUFFER_ALIGNMENT, dump_artifact,
+                                     is_artifact, load_artifact, resolve_codec)
+from src.utils.main_utils import load_object, save_object
+
+
+def make_object() -> dict:
+    rng = np.random.default_rng(0)
+    return {
+        "weights": rng.normal(size=(300, 40)),
+        "indices": np.arange(1000, dtype=np.int32),
+        "empty": np.empty(0),
+        "name": "stand-in",
+        "nested": [rng.integers(0, 10, size=17).astype(np.int8), {"scale": 2.5}],
+    }
+
+
+def assert_same_object(actual: dict, expected: dict) -> None:
+    assert actual.keys() == expected.keys()
+    for key in ("weights", "indices", "empty"):
+        np.testing.assert_array_equal(actual[key], expected[key])
+        assert actual[key].dtype == expected[key].dtype
+    assert actual["name"] == expected["name"]
+    np.testing.assert_array_equal(actual["nested"][0], expected["nested"][0])
+    assert actual["nested"][1] == expected["nested"][1]
+
+
+def read_header(file_path: str) -> dict:
+    with open(file_path, "rb") as file:
+        assert file.read(len(ARTIFACT_MAGIC)) == ARTIFACT_MAGIC
+        (header_length,) = struct.unpack("<I", file.read(4))
+        return json.loads(file.read(header_length))
+
+
+@pytest.fixture
+def artifact_path(tmp_path):
+    file_path = str(tmp_path / "object.pkl")
+    with open(file_path, "wb") as file:
+        dump_artifact(make_object(), file)
+    return file_path
+
+
+def test_round_trip(artifact_path):
+    assert is_artifact(artifact_path)
+    assert read_header(artifact_path)["format_version"] == 1
+    assert_same_object(load_artifact(artifact_path), make_object())
+
+
+def test_read_only_memory_map(artifact_path):
+    obj = load_artifact(artifact_path, mmap_mode="r")
+    assert_same_object(obj, make_object())
+    assert not obj["weights"].flags.writeable
+    assert obj["weights"].ctypes.data % BUFFER_ALIGNMENT == 0
+    with pytest.raises(ValueError):
+        obj["weights"][0, 0] = 1.0
+
+
+def test_copy_on_write_memory_map(artifact_path):
+    obj = load_artifact(artifact_path, mmap_mode="c")
+    obj["weights"][0, 0] = 123.0
+    del obj
+    assert_same_object(load_artifact(artifact_path), make_object())
+
+
+def test_unsupported_mmap_mode(artifact_path):
+    with pytest.raises(MyException):
+        load_artifact(artifact_path, mmap_mode="w+")
+
+
+def test_load_object_reads_both_formats(tmp_path):
+    dill_path, artifact_path = str(tmp_path / "dill" / "object.pkl"), str(tmp_path / "mmap" / "object.pkl")
+    save_object(dill_path, make_object())
+    save_object(artifact_path, make_object(), artifact_format="mmap")
+
+    assert not is_artifact(dill_path)
+    with open(dill_path, "rb") as file:
+        assert_same_object(dill.load(file), make_object())
+    assert_same_object(load_object(dill_path), make_object())
+    assert_same_object(load_object(artifact_path, mmap_mode="r"), make_object())
+
+
+def test_saved_model_predicts_the_same(standin_model, predictor, raw_dataframe, tmp_path):
+    features = predictor._get_snapshot().vectorizer.transform_records(raw_dataframe.to_dict(orient="records"))
+    file_path = str(tmp_path / "model.pkl")
+    save_object(file_path, standin_model, artifact_format="mmap")
+    model = load_object(file_path, mmap_mode="r")
+    np.testing.assert_array_equal(model.predict_proba_features(features),
+                                  standin_model.predict_proba_features(features))
+
+
+def test_unknown_artifact_format(tmp_path):
+    with pytest.raises(MyException):
+        save_object(str(tmp_path / "object.pkl"), make_object(), artifact_format="parquet")
+
+
+@pytest.mark.parametrize("codec", ["fast", "high"])
+def test_compressed_round_trip(codec, tmp_path):
+    file_path = str(tmp_path / "object.pkl")
+    save_object(file_path, make_object(), artifact_format="mmap", codec=codec)
+
+    header = read_header(file_path)
+    assert header["format_version"] == ARTIFACT_FORMAT_VERSION
+    # The header names the library actually used, so readers need no codec argument
+    assert header["codec"] == resolve_codec(codec)
+    assert_same_object(load_object(file_path), make_object())
+    # Compressed bodies cannot be mapped and are read into memory instead
+    obj = load_object(file_path, mmap_mode="r")
+    assert_same_object(obj, make_object())
+    assert obj["weights"].ctypes.data % BUFFER_ALIGNMENT == 0
+
+
+@pytest.mark.parametrize("codec, library", [("zlib", "zlib"), ("lzma", "lzma"), ("none", "none")])
+def test_resolve_codec(codec, library):
+    assert resolve_codec(codec) == library
+
+
+def test_unknown_codec(tmp_path):
+    with pytest.raises(ValueError):
+        resolve_codec("snappy")
+    with pytest.raises(MyException):
+        save_object(str(tmp_path / "object.pkl"), make_object(), codec="fast")
+
+
+def test_truncated_compressed_body(tmp_path):
+    file_path = str(tmp_path / "object.pkl")
+    save_object(file_path, make_object(), artifact_format="mmap", codec="zlib")
+    with open(file_path, "r+b") as file:
+        file.truncate(file.seek(0, 2) - 100)
+    with pytest.raises(MyException):
+        load_object(file_path)
+
+
+def test_newer_format_version_is_rejected(artifact_path):
+    with open(artifact_path, "rb") as file:
+        data = file.read()
+    header = read_header(artifact_path)
+    newer = json.dumps(dict(header, format_version=ARTIFACT_FORMAT_VERSION + 1)).encode().ljust(
+        len(json.dumps(header)))
+    old = json.dumps(header).encode()
+    assert len(newer) == len(old)
+    with open(artifact_path, "wb") as file:
+        file.write(data.replace(old, newer, 1))
+    with pytest.raises(MyException):
+        load_artifact(artifact_path)
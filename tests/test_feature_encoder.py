@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from src.entity.feature_encoder import FeatureVectorizer, OneHotFeatureEncoder
+
+
+def prepare_frame(predictor, raw_dataframe) -> DataFrame:
+    return predictor._replace_values_in_features(predictor._drop_id_column(raw_dataframe.copy()))
+
+
+def test_encoder_matches_get_dummies(predictor, raw_dataframe):
+    encoder = predictor._get_snapshot().encoder
+    frame = prepare_frame(predictor, raw_dataframe)
+    # Unseen codes must leave the row at zero, as reindexing does
+    frame.loc[0, "EDUCATION"] = 9
+    frame.loc[1, "PAY_0"] = 12
+
+    expected = pd.get_dummies(frame, columns=encoder.categorical_columns, drop_first=True)
+    expected = expected.reindex(columns=encoder.feature_columns, fill_value=0)
+    np.testing.assert_array_equal(encoder.transform(frame), expected.to_numpy(dtype=np.float64))
+
+
+def test_encoder_ignores_non_integer_codes():
+    encoder = OneHotFeatureEncoder(feature_columns=["LIMIT_BAL", "SEX_2"], categorical_columns=["SEX"])
+    features = encoder.transform(DataFrame({"LIMIT_BAL": [1000.0, 2000.0, 3000.0], "SEX": [2, 2.5, 1]}))
+    np.testing.assert_array_equal(features, [[1000.0, 1.0], [2000.0, 0.0], [3000.0, 0.0]])
+
+
+def test_vectorizer_matches_pandas_path(predictor, raw_dataframe):
+    snapshot = predictor._get_snapshot()
+    frame = prepare_frame(predictor, raw_dataframe)
+    encoded = DataFrame(snapshot.encoder.transform(frame), columns=snapshot.encoder.feature_columns)
+    expected = np.asarray(snapshot.model.preprocessing_object.transform(encoded), dtype=np.float64)
+
+    actual = snapshot.vectorizer.transform_records(raw_dataframe.to_dict(orient="records"))
+    assert actual.tobytes() == expected.tobytes()
+
+
+def test_vectorizer_accepts_numeric_strings(predictor, raw_dataframe):
+    vectorizer = predictor._get_snapshot().vectorizer
+    records = raw_dataframe.head(20).to_dict(orient="records")
+    string_records = [{col: str(value) for col, value in record.items()} for record in records]
+    assert vectorizer.transform_records(string_records).tobytes() == vectorizer.transform_records(records).tobytes()
+
+
+def test_derived_value_replacements(predictor):
+    replacements = predictor._get_snapshot().vectorizer.value_replacements
+    assert replacements["EDUCATION"] == {0: 4, 5: 4, 6: 4}
+    assert replacements["MARRIAGE"] == {0: 3}
+    for col in ("PAY_0", "PAY_2", "PAY_3", "PAY_4", "PAY_5", "PAY_6"):
+        assert replacements[col] == {-1: 0}
+
+
+def test_verify_passes_on_sample_records(predictor, standin_model):
+    vectorizer = predictor._get_snapshot().vectorizer
+    assert vectorizer.verify(standin_model.preprocessing_object, vectorizer.sample_records())
+
+
+def test_verify_detects_stale_replacements(predictor, standin_model):
+    encoder = predictor._get_snapshot().encoder
+    vectorizer = FeatureVectorizer(preprocessing_object=standin_model.preprocessing_object, encoder=encoder,
+                                   replace_values=lambda df: df)
+    assert vectorizer.value_replacements == {}
+    # The pandas path changes its rules after the table was derived
+    vectorizer.replace_values = predictor._replace_values_in_features
+    assert not vectorizer.verify(standin_model.preprocessing_object, vectorizer.sample_records())
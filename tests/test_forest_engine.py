@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from src.entity.estimator import MyModel
+from src.entity.forest_engine import PACKED_FOREST_MAX_BATCH_ROWS, PackedForest
+from src.exception import MyException
+
+
+@pytest.fixture(scope="module")
+def forest(standin_model):
+    return standin_model.trained_model_object
+
+
+@pytest.fixture(scope="module")
+def features(predictor, raw_dataframe):
+    return predictor._get_snapshot().vectorizer.transform_records(raw_dataframe.to_dict(orient="records"))
+
+
+def test_packed_forest_matches_sklearn(forest, features):
+    packed = PackedForest.from_sklearn(forest)
+    np.testing.assert_array_equal(packed.predict_proba(features), forest.predict_proba(features))
+    np.testing.assert_array_equal(packed.predict(features), forest.predict(features))
+
+
+def test_chunk_size_does_not_change_results(forest, features):
+    packed = PackedForest.from_sklearn(forest)
+    np.testing.assert_array_equal(packed.predict_proba(features, chunk_size=7), packed.predict_proba(features))
+
+
+def test_missing_values_follow_sklearn(forest, features):
+    features = features.copy()
+    features[::3, 0] = np.nan
+    features[1::5, -1] = np.nan
+    packed = PackedForest.from_sklearn(forest)
+    np.testing.assert_array_equal(packed.predict_proba(features), forest.predict_proba(features))
+
+
+def test_save_and_memory_mapped_load(forest, features, tmp_path):
+    PackedForest.from_sklearn(forest).save(str(tmp_path))
+    loaded = PackedForest.load(str(tmp_path), mmap_mode="r")
+    assert isinstance(loaded.threshold, np.memmap)
+    np.testing.assert_array_equal(loaded.predict_proba(features), forest.predict_proba(features))
+
+
+def test_packed_engine_on_my_model(standin_model, forest, features):
+    model = MyModel(preprocessing_object=standin_model.preprocessing_object, trained_model_object=forest,
+                    feature_columns=standin_model.get_feature_columns(), inference_engine="packed")
+    small, large = features[:PACKED_FOREST_MAX_BATCH_ROWS], features
+    assert model._use_packed_forest(len(small)) and not model._use_packed_forest(len(large))
+    np.testing.assert_array_equal(model.predict_features(small), forest.predict(small))
+    np.testing.assert_array_equal(model.predict_proba_features(large), forest.predict_proba(large))
+
+
+def test_unknown_inference_engine(standin_model):
+    with pytest.raises(MyException):
+        MyModel(preprocessing_object=standin_model.preprocessing_object,
+                trained_model_object=standin_model.trained_model_object, inference_engine="gpu")
@@ -0,0 +1,59 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.entity.config_entity import ExecutorConfig, MicroBatchConfig
+from src.exception import MyException
+from src.pipline.executor import PipelineExecutor
+from src.pipline.micro_batching import MicroBatchScheduler
+
+
+@pytest.fixture
+def executor():
+    executor = PipelineExecutor(ExecutorConfig(io_workers=2, cpu_workers=1, prediction_executor="thread"))
+    yield executor
+    executor.shutdown()
+
+
+async def predict_concurrently(scheduler: MicroBatchScheduler, requests):
+    return await asyncio.gather(*(scheduler.predict(records) for records in requests))
+
+
+def test_callers_get_their_own_rows(executor, predictor, raw_dataframe):
+    records = raw_dataframe.to_dict(orient="records")
+    requests = [records[start:start + size] for start, size in ((0, 1), (1, 5), (6, 1), (7, 40), (47, 3))]
+    scheduler = MicroBatchScheduler(executor, MicroBatchConfig(max_batch_size=1000, max_wait_ms=50),
+                                    predict_func=predictor.predict_records)
+
+    results = asyncio.run(predict_concurrently(scheduler, requests))
+
+    assert scheduler.stats.batches == 1
+    for request, result in zip(requests, results):
+        np.testing.assert_array_equal(result, predictor.predict_records(request))
+
+
+def test_batch_is_flushed_at_max_batch_size(executor, predictor, raw_dataframe):
+    records = raw_dataframe.to_dict(orient="records")
+    requests = [[record] for record in records[:8]]
+    scheduler = MicroBatchScheduler(executor, MicroBatchConfig(max_batch_size=4, max_wait_ms=10000),
+                                    predict_func=predictor.predict_records)
+
+    results = asyncio.run(asyncio.wait_for(predict_concurrently(scheduler, requests), timeout=30))
+
+    assert scheduler.stats.as_dict()["max_batch_size"] == 4
+    np.testing.assert_array_equal(np.concatenate(results), predictor.predict_records(records[:8]))
+
+
+def test_failure_reaches_every_caller(executor):
+    def failing_predict(records):
+        raise ValueError("model unavailable")
+
+    scheduler = MicroBatchScheduler(executor, MicroBatchConfig(max_batch_size=1000, max_wait_ms=20),
+                                    predict_func=failing_predict)
+
+    async def run():
+        return await asyncio.gather(*(scheduler.predict([{}]) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, MyException) for result in results)
@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.entity import prediction_cache as prediction_cache_module
+from src.entity.prediction_cache import PredictionCache
+from src.pipline.prediction_pipeline import CreditCardDefaultPredictor
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(prediction_cache_module, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+def test_keys_are_canonical():
+    features = np.array([[0.0, 1.5], [-0.0, 1.5], [0.0, 2.5]])
+    keys = PredictionCache.make_keys("v1", features)
+    assert keys[0] == keys[1]
+    assert keys[0] != keys[2]
+    assert PredictionCache.make_keys("v2", features)[0] != keys[0]
+    assert PredictionCache.make_keys("v1", features.astype(np.float32)) == keys
+
+
+def test_hits_and_misses(clock):
+    cache = PredictionCache(max_entries=10, ttl_seconds=60, max_batch_rows=100)
+    keys = PredictionCache.make_keys("v1", np.arange(6.0).reshape(3, 2))
+    cache.put_many("v1", keys[:2], [0, 1])
+    assert cache.get_many("v1", keys) == [0, 1, None]
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_new_model_version_invalidates(clock):
+    cache = PredictionCache(max_entries=10, ttl_seconds=60, max_batch_rows=100)
+    keys = PredictionCache.make_keys("v1", np.zeros((1, 2)))
+    cache.put_many("v1", keys, [1])
+    assert cache.get_many("v2", keys) == [None]
+    assert cache.invalidations == 1
+    assert cache.get_many("v1", keys) == [None]
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = PredictionCache(max_entries=10, ttl_seconds=60, max_batch_rows=100)
+    keys = PredictionCache.make_keys("v1", np.zeros((1, 2)))
+    cache.put_many("v1", keys, [1])
+    clock.now += 60
+    assert cache.get_many("v1", keys) == [1]
+    clock.now += 1
+    assert cache.get_many("v1", keys) == [None]
+    assert cache.expirations == 1
+
+
+def test_least_recently_used_is_evicted(clock):
+    cache = PredictionCache(max_entries=2, ttl_seconds=60, max_batch_rows=100)
+    keys = PredictionCache.make_keys("v1", np.arange(3.0).reshape(3, 1))
+    cache.put_many("v1", keys[:2], [0, 1])
+    cache.get_many("v1", keys[:1])
+    cache.put_many("v1", keys[2:], [2])
+    assert cache.get_many("v1", keys) == [0, None, 2]
+    assert cache.evictions == 1
+
+
+@pytest.mark.parametrize("max_entries, n_rows, accepted", [(10, 1, True), (10, 100, True), (10, 101, False),
+                                                           (10, 0, False), (0, 1, False)])
+def test_accepts(max_entries, n_rows, accepted):
+    assert PredictionCache(max_entries=max_entries, ttl_seconds=60, max_batch_rows=100).accepts(n_rows) is accepted
+
+
+def test_cached_predictions_match_uncached(predictor, raw_dataframe):
+    cache = PredictionCache(max_entries=1000, ttl_seconds=60, max_batch_rows=256)
+    cached_predictor = CreditCardDefaultPredictor(prediction_pipeline_config=predictor.prediction_pipeline_config,
+                                                  prediction_cache=cache)
+    records = raw_dataframe.to_dict(orient="records")
+    expected = predictor.predict_records(records[:200])
+
+    np.testing.assert_array_equal(cached_predictor.predict_records(records[:100]), expected[:100])
+    np.testing.assert_array_equal(cached_predictor.predict_records(records[:200]), expected)
+    assert cache.hits == 100
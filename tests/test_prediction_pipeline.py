@@ -0,0 +1,45 @@
+import asyncio
+
+import numpy as np
+from pandas import DataFrame
+
+from src.entity.config_entity import ExecutorConfig
+from src.pipline.executor import PipelineExecutor
+from src.pipline.prediction_pipeline import CreditCardDefaultPredictor
+
+
+def test_record_path_matches_pandas_path(predictor, raw_dataframe):
+    records = raw_dataframe.to_dict(orient="records")
+    assert predictor._get_snapshot().vectorizer is not None
+    expected = predictor.predict(dataframe=raw_dataframe.copy())
+    np.testing.assert_array_equal(predictor.predict_records(records), expected)
+
+
+def test_probabilities_match_pandas_path(predictor, raw_dataframe):
+    snapshot = predictor._get_snapshot()
+    records = raw_dataframe.to_dict(orient="records")
+    dataframe = predictor._replace_values_in_features(predictor._drop_id_column(raw_dataframe.copy()))
+    dataframe = DataFrame(snapshot.encoder.transform(dataframe), columns=snapshot.encoder.feature_columns)
+    expected = snapshot.model.predict_proba(dataframe)
+    expected = expected[:, list(snapshot.model.classes).index(1)]
+    np.testing.assert_array_equal(predictor.predict_proba_records(records), expected)
+
+
+def test_empty_records(predictor):
+    assert len(predictor.predict_records([])) == 0
+    assert len(predictor.predict_proba_records([])) == 0
+
+
+def test_decisions_apply_every_threshold():
+    decisions = CreditCardDefaultPredictor.get_decisions([0.2, 0.5, 0.9], [0.3, 0.5])
+    np.testing.assert_array_equal(decisions, [[0, 0], [1, 1], [1, 1]])
+
+
+def test_executor_prediction_matches_direct_call(predictor, raw_dataframe):
+    records = raw_dataframe.to_dict(orient="records")
+    executor = PipelineExecutor(ExecutorConfig(io_workers=2, cpu_workers=1, prediction_executor="thread"))
+    try:
+        predictions = asyncio.run(executor.run_prediction(predictor.predict_records, records))
+    finally:
+        executor.shutdown()
+    np.testing.assert_array_equal(predictions, predictor.predict_records(records))